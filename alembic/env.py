@@ -7,7 +7,9 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from src.app.database import Base
-from src.app.models import Customer, Product, Order, OrderItem  # noqa: F401
+from src.app.models import (  # noqa: F401
+    Customer, CustomerStats, Product, Order, OrderItem, OrderNumberCounter, CatalogVersion, SalesRollup
+)
 
 config = context.config
 
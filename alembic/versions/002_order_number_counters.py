@@ -0,0 +1,39 @@
+"""order number counters
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-02-01 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_number_counters",
+        sa.Column("period", sa.String(6), nullable=False),
+        sa.Column("last_value", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("period"),
+    )
+
+    # Continue numbering after the highest existing ST-ORD-YYYYMM-NNNN of each month.
+    op.execute(
+        """
+        INSERT INTO order_number_counters (period, last_value)
+        SELECT substr(order_number, 8, 6), max(CAST(substr(order_number, 15) AS INTEGER))
+        FROM orders
+        WHERE order_number LIKE 'ST-ORD-______-%'
+        GROUP BY substr(order_number, 8, 6)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("order_number_counters")
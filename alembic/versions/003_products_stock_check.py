@@ -0,0 +1,31 @@
+"""non-negative product stock, orders that reserved stock
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-02-15 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_check_constraint("ck_products_stock_quantity_non_negative", "products", "stock_quantity >= 0")
+
+    # Existing orders were created without taking stock, so cancelling them must not return any;
+    # orders created from here on reserve it.
+    op.add_column(
+        "orders", sa.Column("stock_reserved", sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+    op.alter_column("orders", "stock_reserved", server_default=sa.true())
+
+
+def downgrade() -> None:
+    op.drop_column("orders", "stock_reserved")
+    op.drop_constraint("ck_products_stock_quantity_non_negative", "products", type_="check")
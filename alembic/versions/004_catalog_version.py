@@ -0,0 +1,29 @@
+"""catalog version stamp
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-02-22 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_version")
@@ -0,0 +1,40 @@
+"""product search indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-03-01 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # The 'simple' configuration does not stem, so part numbers keep their exact tokens and a
+    # prefix query like 'stm32f4:*' matches 'stm32f407vg'.
+    op.execute(
+        """
+        ALTER TABLE products ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(part_number, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(name, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED
+        """
+    )
+    op.execute("CREATE INDEX ix_products_search_vector ON products USING gin (search_vector)")
+    # Trigram indexes serve substring matches inside part numbers and typo-tolerant name matches.
+    op.execute("CREATE INDEX ix_products_part_number_trgm ON products USING gin (part_number gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_products_name_trgm ON products USING gin (name gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_name_trgm", table_name="products")
+    op.drop_index("ix_products_part_number_trgm", table_name="products")
+    op.drop_index("ix_products_search_vector", table_name="products")
+    op.drop_column("products", "search_vector")
@@ -0,0 +1,130 @@
+"""customer lookup indexes and ISO country codes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-03-08 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ISO 3166-1 alpha-2 codes, English short names and aliases as of this revision (a copy of
+# src/app/countries.py, so later edits there do not change what this migration backfills).
+_NAMES = {
+    "AD": "Andorra", "AE": "United Arab Emirates", "AF": "Afghanistan", "AG": "Antigua and Barbuda",
+    "AI": "Anguilla", "AL": "Albania", "AM": "Armenia", "AO": "Angola", "AQ": "Antarctica",
+    "AR": "Argentina", "AS": "American Samoa", "AT": "Austria", "AU": "Australia", "AW": "Aruba",
+    "AX": "Åland Islands", "AZ": "Azerbaijan", "BA": "Bosnia and Herzegovina", "BB": "Barbados",
+    "BD": "Bangladesh", "BE": "Belgium", "BF": "Burkina Faso", "BG": "Bulgaria", "BH": "Bahrain",
+    "BI": "Burundi", "BJ": "Benin", "BL": "Saint Barthélemy", "BM": "Bermuda", "BN": "Brunei",
+    "BO": "Bolivia", "BQ": "Caribbean Netherlands", "BR": "Brazil", "BS": "Bahamas", "BT": "Bhutan",
+    "BV": "Bouvet Island", "BW": "Botswana", "BY": "Belarus", "BZ": "Belize", "CA": "Canada",
+    "CC": "Cocos (Keeling) Islands", "CD": "Democratic Republic of the Congo",
+    "CF": "Central African Republic", "CG": "Republic of the Congo", "CH": "Switzerland",
+    "CI": "Côte d'Ivoire", "CK": "Cook Islands", "CL": "Chile", "CM": "Cameroon", "CN": "China",
+    "CO": "Colombia", "CR": "Costa Rica", "CU": "Cuba", "CV": "Cabo Verde", "CW": "Curaçao",
+    "CX": "Christmas Island", "CY": "Cyprus", "CZ": "Czechia", "DE": "Germany", "DJ": "Djibouti",
+    "DK": "Denmark", "DM": "Dominica", "DO": "Dominican Republic", "DZ": "Algeria", "EC": "Ecuador",
+    "EE": "Estonia", "EG": "Egypt", "EH": "Western Sahara", "ER": "Eritrea", "ES": "Spain",
+    "ET": "Ethiopia", "FI": "Finland", "FJ": "Fiji", "FK": "Falkland Islands", "FM": "Micronesia",
+    "FO": "Faroe Islands", "FR": "France", "GA": "Gabon", "GB": "United Kingdom", "GD": "Grenada",
+    "GE": "Georgia", "GF": "French Guiana", "GG": "Guernsey", "GH": "Ghana", "GI": "Gibraltar",
+    "GL": "Greenland", "GM": "Gambia", "GN": "Guinea", "GP": "Guadeloupe", "GQ": "Equatorial Guinea",
+    "GR": "Greece", "GS": "South Georgia and the South Sandwich Islands", "GT": "Guatemala",
+    "GU": "Guam", "GW": "Guinea-Bissau", "GY": "Guyana", "HK": "Hong Kong",
+    "HM": "Heard Island and McDonald Islands", "HN": "Honduras", "HR": "Croatia", "HT": "Haiti",
+    "HU": "Hungary", "ID": "Indonesia", "IE": "Ireland", "IL": "Israel", "IM": "Isle of Man",
+    "IN": "India", "IO": "British Indian Ocean Territory", "IQ": "Iraq", "IR": "Iran", "IS": "Iceland",
+    "IT": "Italy", "JE": "Jersey", "JM": "Jamaica", "JO": "Jordan", "JP": "Japan", "KE": "Kenya",
+    "KG": "Kyrgyzstan", "KH": "Cambodia", "KI": "Kiribati", "KM": "Comoros",
+    "KN": "Saint Kitts and Nevis", "KP": "North Korea", "KR": "South Korea", "KW": "Kuwait",
+    "KY": "Cayman Islands", "KZ": "Kazakhstan", "LA": "Laos", "LB": "Lebanon", "LC": "Saint Lucia",
+    "LI": "Liechtenstein", "LK": "Sri Lanka", "LR": "Liberia", "LS": "Lesotho", "LT": "Lithuania",
+    "LU": "Luxembourg", "LV": "Latvia", "LY": "Libya", "MA": "Morocco", "MC": "Monaco",
+    "MD": "Moldova", "ME": "Montenegro", "MF": "Saint Martin", "MG": "Madagascar",
+    "MH": "Marshall Islands", "MK": "North Macedonia", "ML": "Mali", "MM": "Myanmar",
+    "MN": "Mongolia", "MO": "Macao", "MP": "Northern Mariana Islands", "MQ": "Martinique",
+    "MR": "Mauritania", "MS": "Montserrat", "MT": "Malta", "MU": "Mauritius", "MV": "Maldives",
+    "MW": "Malawi", "MX": "Mexico", "MY": "Malaysia", "MZ": "Mozambique", "NA": "Namibia",
+    "NC": "New Caledonia", "NE": "Niger", "NF": "Norfolk Island", "NG": "Nigeria", "NI": "Nicaragua",
+    "NL": "Netherlands", "NO": "Norway", "NP": "Nepal", "NR": "Nauru", "NU": "Niue",
+    "NZ": "New Zealand", "OM": "Oman", "PA": "Panama", "PE": "Peru", "PF": "French Polynesia",
+    "PG": "Papua New Guinea", "PH": "Philippines", "PK": "Pakistan", "PL": "Poland",
+    "PM": "Saint Pierre and Miquelon", "PN": "Pitcairn", "PR": "Puerto Rico", "PS": "Palestine",
+    "PT": "Portugal", "PW": "Palau", "PY": "Paraguay", "QA": "Qatar", "RE": "Réunion",
+    "RO": "Romania", "RS": "Serbia", "RU": "Russia", "RW": "Rwanda", "SA": "Saudi Arabia",
+    "SB": "Solomon Islands", "SC": "Seychelles", "SD": "Sudan", "SE": "Sweden", "SG": "Singapore",
+    "SH": "Saint Helena", "SI": "Slovenia", "SJ": "Svalbard and Jan Mayen", "SK": "Slovakia",
+    "SL": "Sierra Leone", "SM": "San Marino", "SN": "Senegal", "SO": "Somalia", "SR": "Suriname",
+    "SS": "South Sudan", "ST": "Sao Tome and Principe", "SV": "El Salvador", "SX": "Sint Maarten",
+    "SY": "Syria", "SZ": "Eswatini", "TC": "Turks and Caicos Islands", "TD": "Chad",
+    "TF": "French Southern Territories", "TG": "Togo", "TH": "Thailand", "TJ": "Tajikistan",
+    "TK": "Tokelau", "TL": "Timor-Leste", "TM": "Turkmenistan", "TN": "Tunisia", "TO": "Tonga",
+    "TR": "Türkiye", "TT": "Trinidad and Tobago", "TV": "Tuvalu", "TW": "Taiwan", "TZ": "Tanzania",
+    "UA": "Ukraine", "UG": "Uganda", "UM": "United States Minor Outlying Islands",
+    "US": "United States", "UY": "Uruguay", "UZ": "Uzbekistan", "VA": "Holy See",
+    "VC": "Saint Vincent and the Grenadines", "VE": "Venezuela", "VG": "British Virgin Islands",
+    "VI": "U.S. Virgin Islands", "VN": "Vietnam", "VU": "Vanuatu", "WF": "Wallis and Futuna",
+    "WS": "Samoa", "YE": "Yemen", "YT": "Mayotte", "ZA": "South Africa", "ZM": "Zambia",
+    "ZW": "Zimbabwe",
+}
+
+_ALIASES = {
+    "USA": "US", "U.S.": "US", "U.S.A.": "US", "United States of America": "US", "America": "US",
+    "UK": "GB", "U.K.": "GB", "Great Britain": "GB", "Britain": "GB", "England": "GB",
+    "Scotland": "GB", "Wales": "GB", "Northern Ireland": "GB",
+    "Korea": "KR", "Republic of Korea": "KR", "Korea, Republic of": "KR",
+    "People's Republic of China": "CN", "PRC": "CN", "Mainland China": "CN",
+    "Russian Federation": "RU", "Czech Republic": "CZ", "Turkey": "TR", "Holland": "NL",
+    "The Netherlands": "NL", "Deutschland": "DE", "UAE": "AE", "Viet Nam": "VN",
+    "Republic of China": "TW", "Ivory Coast": "CI", "Cape Verde": "CV", "Swaziland": "SZ",
+    "Macedonia": "MK", "Burma": "MM", "Vatican City": "VA", "East Timor": "TL",
+    "Brunei Darussalam": "BN", "Lao PDR": "LA", "DR Congo": "CD", "DRC": "CD",
+}
+
+_CODES = {name.casefold(): code for code, name in _NAMES.items()}
+_CODES.update((alias.casefold(), code) for alias, code in _ALIASES.items())
+
+
+def _country_code(country: str | None) -> str | None:
+    if not country:
+        return None
+    value = country.strip()
+    if len(value) == 2 and value.upper() in _NAMES:
+        return value.upper()
+    return _CODES.get(value.casefold())
+
+
+def upgrade() -> None:
+    op.add_column("customers", sa.Column("country_code", sa.String(2), nullable=True))
+    customers = sa.table("customers", sa.column("country", sa.String), sa.column("country_code", sa.String))
+    bind = op.get_bind()
+    # One UPDATE per distinct spelling; names that are not recognised keep a NULL code.
+    for (country,) in bind.execute(sa.select(customers.c.country).distinct()):
+        code = _country_code(country)
+        if code:
+            bind.execute(customers.update().where(customers.c.country == country).values(country_code=code))
+
+    op.create_index("ix_customers_company_name_id", "customers", ["company_name", "id"])
+    op.create_index("ix_customers_country_code_company_name_id", "customers", ["country_code", "company_name", "id"])
+    op.create_index("ix_customers_contact_email_lower", "customers", [sa.text("lower(contact_email)")])
+    op.create_index("ix_customers_country_lower", "customers", [sa.text("lower(country)")])
+    # Substring search on names (ILIKE '%term%'); pg_trgm is enabled by migration 005.
+    op.execute("CREATE INDEX ix_customers_company_name_trgm ON customers USING gin (company_name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_customers_contact_name_trgm ON customers USING gin (contact_name gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_customers_contact_name_trgm", table_name="customers")
+    op.drop_index("ix_customers_company_name_trgm", table_name="customers")
+    op.drop_index("ix_customers_country_lower", table_name="customers")
+    op.drop_index("ix_customers_contact_email_lower", table_name="customers")
+    op.drop_index("ix_customers_country_code_company_name_id", table_name="customers")
+    op.drop_index("ix_customers_company_name_id", table_name="customers")
+    op.drop_column("customers", "country_code")
@@ -0,0 +1,72 @@
+"""indexes for the order, order item and catalog access paths
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-03-15 00:00:00.000000
+
+The indexes are built with CREATE INDEX CONCURRENTLY, outside the migration transaction, so
+writes to these tables continue while they build. A concurrent build that fails (e.g. on a
+deadlock or a cancelled deploy) leaves an INVALID index behind; rerunning the upgrade drops
+such leftovers and builds them again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.text("is_active IS true")
+
+INDEXES = [
+    # List orders newest first: unfiltered, by customer and by status (keyset on ordered_at, id).
+    ("ix_orders_ordered_at_id", "orders", [sa.text("ordered_at DESC"), sa.text("id DESC")], None),
+    (
+        "ix_orders_customer_id_ordered_at_id",
+        "orders",
+        ["customer_id", sa.text("ordered_at DESC"), sa.text("id DESC")],
+        None,
+    ),
+    ("ix_orders_status_ordered_at_id", "orders", ["status", sa.text("ordered_at DESC"), sa.text("id DESC")], None),
+    # Line items of a page of orders; stock release and per-product lookups.
+    ("ix_order_items_order_id", "order_items", ["order_id"], None),
+    ("ix_order_items_product_id", "order_items", ["product_id"], None),
+    # Catalog browsing by category and/or family (ILIKE '%value%'), active products only; pg_trgm
+    # is enabled by migration 005.
+    ("ix_products_active_category_trgm", "products", [sa.text("category gin_trgm_ops")], ACTIVE),
+    ("ix_products_active_family_trgm", "products", [sa.text("family gin_trgm_ops")], ACTIVE),
+]
+TRIGRAM_INDEXES = {"ix_products_active_category_trgm", "ix_products_active_family_trgm"}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            valid = bind.scalar(
+                sa.text(
+                    "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+                    " WHERE c.relname = :name"
+                ),
+                {"name": name},
+            )
+            if valid is False:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=where,
+                postgresql_using="gin" if name in TRIGRAM_INDEXES else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,50 @@
+"""indexes for the order list filters and sorts
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-03-22 00:00:00.000000
+
+Built concurrently, like those of revision 007; rerunning the upgrade replaces INVALID leftovers
+of a failed build.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # min_total/max_total and sort=total_amount (keyset on total_amount, id).
+    ("ix_orders_total_amount_id", ["total_amount", "id"], {}),
+    # shipped_from/to and delivered_from/to.
+    ("ix_orders_shipped_at", ["shipped_at"], {}),
+    ("ix_orders_delivered_at", ["delivered_at"], {}),
+    # order_number prefix (LIKE 'ST-ORD-2025%'), which the unique index only serves under the C collation.
+    ("ix_orders_order_number_pattern", ["order_number"], {"postgresql_ops": {"order_number": "varchar_pattern_ops"}}),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        for name, columns, options in INDEXES:
+            valid = bind.scalar(
+                sa.text(
+                    "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+                    " WHERE c.relname = :name"
+                ),
+                {"name": name},
+            )
+            if valid is False:
+                op.drop_index(name, table_name="orders", postgresql_concurrently=True)
+            op.create_index(name, "orders", columns, postgresql_concurrently=True, if_not_exists=True, **options)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="orders", postgresql_concurrently=True, if_exists=True)
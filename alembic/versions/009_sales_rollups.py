@@ -0,0 +1,71 @@
+"""sales rollups
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-04-01 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Analytics report by the family, category and country an order had when it was placed, so
+    # they are stored with it. Existing orders can only take the current values.
+    op.add_column("order_items", sa.Column("category", sa.String(100), nullable=True))
+    op.add_column("order_items", sa.Column("family", sa.String(100), nullable=True))
+    op.add_column("orders", sa.Column("country_code", sa.String(2), nullable=True))
+    op.execute(
+        "UPDATE order_items i SET category = p.category, family = p.family FROM products p WHERE p.id = i.product_id"
+    )
+    op.execute("UPDATE orders o SET country_code = c.country_code FROM customers c WHERE c.id = o.customer_id")
+
+    op.create_table(
+        "sales_rollups",
+        sa.Column("dimension", sa.String(16), nullable=False),
+        sa.Column("month", sa.String(7), nullable=False),
+        sa.Column("key", sa.String(100), nullable=False),
+        sa.Column("quantity", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.Numeric(16, 2), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("dimension", "month", "key"),
+    )
+
+    # Backfill from the non-cancelled orders; from here on the order service keeps them current.
+    op.execute(
+        """
+        WITH lines AS (
+            SELECT to_char(o.ordered_at AT TIME ZONE 'UTC', 'YYYY-MM') AS month,
+                   i.product_id::text AS product, coalesce(i.family, '') AS family,
+                   coalesce(i.category, '') AS category, o.customer_id::text AS customer,
+                   coalesce(o.country_code, '') AS country, i.quantity, i.line_total
+            FROM order_items i
+            JOIN orders o ON o.id = i.order_id
+            WHERE o.status <> 'cancelled'
+        )
+        INSERT INTO sales_rollups (dimension, month, key, quantity, revenue)
+        SELECT 'product', month, product, sum(quantity), sum(line_total) FROM lines GROUP BY month, product
+        UNION ALL
+        SELECT 'family', month, family, sum(quantity), sum(line_total) FROM lines GROUP BY month, family
+        UNION ALL
+        SELECT 'category', month, category, sum(quantity), sum(line_total) FROM lines GROUP BY month, category
+        UNION ALL
+        SELECT 'customer', month, customer, sum(quantity), sum(line_total) FROM lines GROUP BY month, customer
+        UNION ALL
+        SELECT 'country', month, country, sum(quantity), sum(line_total) FROM lines GROUP BY month, country
+        UNION ALL
+        SELECT 'month', month, '', sum(quantity), sum(line_total) FROM lines GROUP BY month
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sales_rollups")
+    op.drop_column("orders", "country_code")
+    op.drop_column("order_items", "family")
+    op.drop_column("order_items", "category")
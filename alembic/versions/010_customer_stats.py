@@ -0,0 +1,54 @@
+"""customer stats
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-04-08 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "customer_stats",
+        sa.Column("customer_id", sa.Uuid(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("open_order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("lifetime_value", sa.Numeric(16, 2), nullable=False, server_default="0"),
+        sa.Column("ytd_year", sa.Integer(), nullable=False),
+        sa.Column("ytd_value", sa.Numeric(16, 2), nullable=False, server_default="0"),
+        sa.Column("last_ordered_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["customer_id"], ["customers.id"]),
+        sa.PrimaryKeyConstraint("customer_id"),
+    )
+
+    # Backfill from all orders; from here on the order service keeps them current.
+    op.execute(
+        """
+        INSERT INTO customer_stats
+            (customer_id, order_count, open_order_count, lifetime_value, ytd_year, ytd_value, last_ordered_at)
+        SELECT customer_id,
+               count(*) FILTER (WHERE status <> 'cancelled'),
+               count(*) FILTER (WHERE status NOT IN ('delivered', 'cancelled')),
+               coalesce(sum(total_amount) FILTER (WHERE status <> 'cancelled'), 0),
+               extract(year FROM now() AT TIME ZONE 'UTC'),
+               coalesce(sum(total_amount) FILTER (
+                   WHERE status <> 'cancelled'
+                   AND ordered_at >= date_trunc('year', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+               ), 0),
+               max(ordered_at)
+        FROM orders
+        GROUP BY customer_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("customer_stats")
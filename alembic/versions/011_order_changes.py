@@ -0,0 +1,44 @@
+"""order changes
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-04-15 00:00:00.000000
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_changes",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("txid", sa.BigInteger(), nullable=False),
+        sa.Column("order_id", sa.Uuid(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["order_id"], ["orders.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_order_changes_txid_id", "order_changes", ["txid", "id"])
+
+    # One change per existing order, so a feed read from the start returns every order; from
+    # here on the order service logs its writes.
+    op.execute(
+        """
+        INSERT INTO order_changes (txid, order_id)
+        SELECT pg_current_xact_id()::text::bigint, id
+        FROM orders
+        ORDER BY updated_at, id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_changes_txid_id", table_name="order_changes")
+    op.drop_table("order_changes")
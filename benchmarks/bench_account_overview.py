@@ -0,0 +1,115 @@
+"""Calls and latency of an agent's account lookup: the chained reads against GET .../overview.
+
+The chain is what an MCP client did before the overview existed: get the customer, list their
+recent orders, then get each order and each distinct product. Both run in-process through the
+ASGI app; ``--hop-ms`` adds the per-call gateway round trip (APIM to the container app) that
+in-process calls do not pay, ``--rtt-ms`` a database round trip per statement.
+
+    python -m benchmarks.bench_account_overview
+    python -m benchmarks.bench_account_overview --orders 20 --hop-ms 40 --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.database import Base, get_db
+from src.app.main import app
+from src.app.models import Customer, Product
+
+
+async def _seed(client: AsyncClient, session_factory, orders: int) -> str:
+    async with session_factory() as db:
+        customer = Customer(company_name="Bench GmbH", contact_name="Bench", contact_email="bench@example.com")
+        products = [
+            Product(
+                part_number=f"BENCH-{i:05d}", name=f"Bench part {i}", category="Bench",
+                unit_price=Decimal("1.25"), stock_quantity=10_000_000,
+            )
+            for i in range(30)
+        ]
+        db.add_all([customer, *products])
+        await db.commit()
+        customer_id, product_ids = str(customer.id), [str(p.id) for p in products]
+    rng = random.Random(42)
+    payloads = [
+        {
+            "customer_id": customer_id,
+            "items": [{"product_id": pid, "quantity": rng.randint(1, 100)} for pid in rng.sample(product_ids, 4)],
+        }
+        for _ in range(orders)
+    ]
+    (await client.post("/api/v1/orders:batch", json={"orders": payloads})).raise_for_status()
+    return customer_id
+
+
+async def _chain(client: AsyncClient, customer_id: str, orders: int, hop: float) -> int:
+    calls = 0
+
+    async def get(path: str, params: dict | None = None):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(hop)
+        response = await client.get(path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    await get(f"/api/v1/customers/{customer_id}")
+    page = await get("/api/v1/orders", {"customer_id": customer_id, "limit": orders, "include": ""})
+    product_ids = set()
+    for order in page:
+        product_ids.update(item["product_id"] for item in (await get(f"/api/v1/orders/{order['id']}"))["items"])
+    for product_id in product_ids:
+        await get(f"/api/v1/products/{product_id}")
+    return calls
+
+
+async def _overview(client: AsyncClient, customer_id: str, orders: int, hop: float) -> int:
+    await asyncio.sleep(hop)
+    response = await client.get(f"/api/v1/customers/{customer_id}/overview", params={"orders": orders})
+    response.raise_for_status()
+    return 1
+
+
+async def main(database_url: str, orders: int, hop_ms: float, rtt_ms: float, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    if rtt_ms:
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: time.sleep(rtt_ms / 1000))
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        customer_id = await _seed(client, session_factory, orders)
+        print(f"{'path':<10} {'calls':>6} {'median ms':>10}")
+        for name, fn in [("chain", _chain), ("overview", _overview)]:
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                calls = await fn(client, customer_id, orders, hop_ms / 1000)
+                samples.append(time.perf_counter() - start)
+            print(f"{name:<10} {calls:>6} {statistics.median(samples) * 1000:>10.1f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--orders", type=int, default=10)
+    parser.add_argument("--hop-ms", type=float, default=20.0)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.orders, args.hop_ms, args.rtt_ms, args.repeat))
@@ -0,0 +1,94 @@
+"""Throughput of POST /api/v1/orders:batch against one POST /api/v1/orders per order.
+
+Both paths run in-process through the ASGI app, so the difference is the per-order HTTP
+handling, queries and commits that the batch endpoint folds into a fixed number of statements.
+
+    python -m benchmarks.bench_batch_orders
+    python -m benchmarks.bench_batch_orders --orders 500 --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import random
+import time
+from decimal import Decimal
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.database import Base, get_db
+from src.app.main import app
+from src.app.models import Customer, Product
+
+
+async def _seed(session_factory) -> tuple[list[str], list[str]]:
+    async with session_factory() as db:
+        customers = [
+            Customer(company_name=f"Bench {i}", contact_name="Bench", contact_email=f"bench{i}@example.com")
+            for i in range(20)
+        ]
+        products = [
+            Product(
+                part_number=f"BENCH-{i:05d}", name=f"Bench part {i}", category="Bench",
+                unit_price=Decimal("1.25"), stock_quantity=10_000_000,
+            )
+            for i in range(50)
+        ]
+        db.add_all(customers + products)
+        await db.commit()
+        return [str(c.id) for c in customers], [str(p.id) for p in products]
+
+
+def _payloads(count: int, customer_ids: list[str], product_ids: list[str]) -> list[dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "customer_id": rng.choice(customer_ids),
+            "items": [{"product_id": pid, "quantity": rng.randint(1, 100)} for pid in rng.sample(product_ids, 5)],
+        }
+        for _ in range(count)
+    ]
+
+
+async def main(database_url: str, orders: int, rtt_ms: float) -> None:
+    engine = create_async_engine(database_url)
+    if rtt_ms:
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: time.sleep(rtt_ms / 1000))
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    customer_ids, product_ids = await _seed(session_factory)
+    payloads = _payloads(orders, customer_ids, product_ids)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        for payload in payloads:
+            (await client.post("/api/v1/orders", json=payload)).raise_for_status()
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = await client.post("/api/v1/orders:batch", json={"orders": payloads})
+        response.raise_for_status()
+        batch = time.perf_counter() - start
+        assert response.json()["created"] == orders
+
+    print(f"{'path':<10} {'seconds':>8} {'orders/s':>10}")
+    print(f"{'single':<10} {single:>8.2f} {orders / single:>10.0f}")
+    print(f"{'batch':<10} {batch:>8.2f} {orders / batch:>10.0f}")
+    print(f"speedup: {single / batch:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.orders, args.rtt_ms))
@@ -0,0 +1,101 @@
+"""Time to move N orders through fulfilment with POST /api/v1/orders/status against one PUT per order.
+
+The bulk path ships every order by ID, then delivers them all by filter, one UPDATE each. The
+per-order path is timed on a sample (``--single``) and reported per order, since PUTting every
+order one at a time would dominate the run. Both run in-process through the ASGI app;
+``--rtt-ms`` adds a database round trip per statement.
+
+    python -m benchmarks.bench_bulk_status
+    python -m benchmarks.bench_bulk_status --orders 10000 --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.database import Base, get_db
+from src.app.main import app
+from src.app.models import Customer, Order
+from src.app.models.order import OrderStatus
+from src.app.services.customer_stats_service import rebuild_customer_stats
+
+
+async def _seed(session_factory, orders: int) -> list[str]:
+    async with session_factory() as db:
+        customers = [
+            Customer(company_name=f"Bench {i}", contact_name="Bench", contact_email=f"bench{i}@example.com")
+            for i in range(20)
+        ]
+        db.add_all(customers)
+        await db.commit()
+        start = datetime.now(timezone.utc) - timedelta(days=30)
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "order_number": f"ST-BENCH-{i:07d}",
+                "customer_id": customers[i % len(customers)].id,
+                "status": OrderStatus.confirmed,
+                "total_amount": Decimal("125.00"),
+                "ordered_at": start + timedelta(seconds=i),
+            }
+            for i in range(orders)
+        ]
+        await db.execute(insert(Order), rows)
+        await db.commit()
+        await rebuild_customer_stats(db)
+        return [str(row["id"]) for row in rows]
+
+
+async def main(database_url: str, orders: int, single: int, rtt_ms: float) -> None:
+    engine = create_async_engine(database_url)
+    if rtt_ms:
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: time.sleep(rtt_ms / 1000))
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    order_ids = await _seed(session_factory, orders + single)
+    bulk_ids, single_ids = order_ids[:orders], order_ids[orders:]
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        print(f"{'path':<22} {'orders':>7} {'ms':>9} {'ms/order':>9}")
+
+        async def bulk(name: str, body: dict) -> None:
+            start = time.perf_counter()
+            response = await client.post("/api/v1/orders/status", json=body)
+            elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            moved = response.json()["updated"]
+            print(f"{name:<22} {moved:>7} {elapsed * 1000:>9.1f} {elapsed * 1000 / max(moved, 1):>9.3f}")
+
+        await bulk("bulk ship (ids)", {"status": "shipped", "order_ids": bulk_ids})
+        await bulk("bulk deliver (filter)", {"status": "delivered", "filter": {"status": "shipped"}})
+
+        start = time.perf_counter()
+        for order_id in single_ids:
+            (await client.put(f"/api/v1/orders/{order_id}", json={"status": "shipped"})).raise_for_status()
+        elapsed = time.perf_counter() - start
+        print(f"{'PUT per order (ship)':<22} {len(single_ids):>7} {elapsed * 1000:>9.1f} "
+              f"{elapsed * 1000 / max(len(single_ids), 1):>9.3f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--single", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.orders, args.single, args.rtt_ms))
@@ -0,0 +1,96 @@
+"""Latency of product resolution in create_order against the number of line items.
+
+Compares the previous per-line ``db.get(Product, id)`` loop with a single ``IN (...)`` query,
+as ``order_service.create_order`` issues on a catalog cache miss, plus the full ``create_order``
+call (which after the first repetition reads products from the cache).
+
+    python -m benchmarks.bench_create_order
+    python -m benchmarks.bench_create_order --database-url postgresql+asyncpg://... --rtt-ms 0
+
+``--rtt-ms`` adds a fixed delay per statement to approximate the network round trip to a
+managed PostgreSQL server when running against in-memory SQLite.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.database import Base
+from src.app.models import Customer, Product
+from src.app.schemas.order import OrderCreate, OrderItemCreate
+from src.app.services import order_service
+
+LINE_COUNTS = [1, 5, 10, 25, 50, 100]
+
+
+async def _seed(session_factory, count: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    async with session_factory() as db:
+        customer = Customer(company_name="Bench Corp", contact_name="Bench", contact_email="bench@example.com")
+        products = [
+            Product(
+                part_number=f"BENCH-{i:05d}", name=f"Bench part {i}", category="Bench",
+                unit_price=Decimal("1.25"), stock_quantity=1_000_000,
+            )
+            for i in range(count)
+        ]
+        db.add(customer)
+        db.add_all(products)
+        await db.commit()
+        return customer.id, [p.id for p in products]
+
+
+async def _per_item(db: AsyncSession, product_ids: list[uuid.UUID]) -> None:
+    for product_id in product_ids:
+        await db.get(Product, product_id)
+
+
+async def _batched(db: AsyncSession, product_ids: list[uuid.UUID]) -> None:
+    await db.execute(select(Product).where(Product.id.in_(product_ids)))
+
+
+async def _time(session_factory, fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await fn(db)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main(database_url: str, rtt_ms: float, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    if rtt_ms:
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: time.sleep(rtt_ms / 1000))
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    customer_id, product_ids = await _seed(session_factory, max(LINE_COUNTS))
+
+    print(f"{'lines':>6} {'per-item ms':>12} {'batched ms':>11} {'speedup':>8} {'create_order ms':>16}")
+    for lines in LINE_COUNTS:
+        ids = product_ids[:lines]
+        before = await _time(session_factory, lambda db: _per_item(db, ids), repeat)
+        after = await _time(session_factory, lambda db: _batched(db, ids), repeat)
+        data = OrderCreate(
+            customer_id=customer_id, items=[OrderItemCreate(product_id=pid, quantity=1) for pid in ids]
+        )
+        create = await _time(session_factory, lambda db: order_service.create_order(db, data), repeat)
+        print(f"{lines:>6} {before:>12.2f} {after:>11.2f} {before / after:>7.1f}x {create:>16.2f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.rtt_ms, args.repeat))
@@ -0,0 +1,111 @@
+"""Memory and time of one GET /api/v1/orders page: ORM loading vs the Core projection.
+
+The ORM path is what ``list_orders`` did before: ``select(Order)`` with ``selectinload(Order.items)``,
+building tracked instances in the session's identity map. The projection path is the current
+``order_service.list_orders``: Core rows mapped straight into dicts, items fetched with one IN
+query. Both are measured up to the point the page is ready to render, with the session still
+open (as it is during a request).
+
+    python -m benchmarks.bench_list_projection
+    python -m benchmarks.bench_list_projection --orders 100 --items 5 --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from src.app.database import Base
+from src.app.models import Customer, Order, OrderItem, OrderStatus, Product
+from src.app.services import order_service
+
+
+async def _seed(session_factory, orders: int, items: int) -> None:
+    async with session_factory() as db:
+        customer = Customer(company_name="Bench Corp", contact_name="Bench", contact_email="bench@example.com")
+        products = [
+            Product(part_number=f"BENCH-{i:05d}", name=f"Bench part {i}", category="Bench", unit_price=Decimal("1.25"))
+            for i in range(items)
+        ]
+        db.add(customer)
+        db.add_all(products)
+        await db.flush()
+        for n in range(orders):
+            lines = [
+                OrderItem(product_id=p.id, quantity=10, unit_price=p.unit_price, line_total=p.unit_price * 10)
+                for p in products
+            ]
+            db.add(
+                Order(
+                    id=uuid.uuid4(), order_number=f"ST-ORD-202501-{n:04d}", customer_id=customer.id,
+                    status=OrderStatus.pending, total_amount=sum(line.line_total for line in lines),
+                    shipping_address="Munich, Germany", items=lines,
+                )
+            )
+        await db.commit()
+
+
+async def _orm_page(db: AsyncSession, limit: int):
+    query = (
+        select(Order)
+        .options(selectinload(Order.items))
+        .order_by(Order.ordered_at.desc(), Order.id.desc())
+        .limit(limit)
+    )
+    return list((await db.execute(query)).scalars())
+
+
+async def _projection_page(db: AsyncSession, limit: int):
+    return await order_service.list_orders(db, limit=limit)
+
+
+async def _measure(session_factory, load, limit: int, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        async with session_factory() as db:
+            start = time.perf_counter()
+            await load(db, limit)
+            samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    async with session_factory() as db:
+        page = await load(db, limit)
+        retained, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+        del page
+    tracemalloc.stop()
+    return {"ms": statistics.median(samples) * 1000, "peak": peak, "retained": retained, "blocks": blocks}
+
+
+async def main(database_url: str, orders: int, items: int, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await _seed(session_factory, orders, items)
+
+    print(f"page of {orders} orders x {items} items")
+    print(f"{'path':<11} {'ms':>7} {'peak KiB':>9} {'retained KiB':>13} {'live blocks':>12}")
+    for name, load in [("orm", _orm_page), ("projection", _projection_page)]:
+        m = await _measure(session_factory, load, orders, repeat)
+        print(f"{name:<11} {m['ms']:>7.2f} {m['peak'] / 1024:>9.0f} {m['retained'] / 1024:>13.0f} {m['blocks']:>12}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.orders, args.items, args.repeat))
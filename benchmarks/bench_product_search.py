@@ -0,0 +1,128 @@
+"""Latency of ranked product search (GET /api/v1/products?search=) on a large synthetic catalog.
+
+Seeds ``--parts`` products (1M by default) with part numbers, names and descriptions shaped like
+the real catalog, then times one page of ``product_service.list_products`` per query with the
+catalog cache cleared each time, so every search reaches the database.
+
+    python -m benchmarks.bench_product_search --database-url postgresql+asyncpg://...
+    python -m benchmarks.bench_product_search --parts 100000
+
+On PostgreSQL the search indexes from migration 005 are created after the bulk load (faster than
+maintaining them row by row). The SQLite default has no such indexes and scans the table, which is
+what the previous ``ILIKE '%term%'`` search did everywhere.
+"""
+import argparse
+import asyncio
+import importlib.util
+import random
+import statistics
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from src.app.database import Base
+from src.app.models import Product
+from src.app.services import product_service
+from src.app.services.catalog_cache import catalog_cache
+
+MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "005_product_search.py"
+
+FAMILIES = {
+    "STM32F4": "Microcontrollers", "STM32L0": "Microcontrollers", "STM32H7": "Microcontrollers",
+    "STM8S": "Microcontrollers", "LIS3DH": "Sensors", "LSM6DS": "Sensors", "VL53L": "Sensors",
+    "L298": "Motor Drivers", "L6470": "Motor Drivers", "LD1117": "Power Management",
+    "VIPER": "Power Management", "STGAP": "Gate Drivers", "M24C": "Memories", "TSV91": "Amplifiers",
+}
+KINDS = ["microcontroller", "accelerometer", "driver", "regulator", "EEPROM", "op amp", "sensor"]
+PACKAGES = ["LQFP", "QFN", "TSSOP", "SO", "BGA", "DFN"]
+
+QUERIES = [
+    ("exact part number", "STM32F40000420T6"),
+    ("part number prefix", "STM32F400004"),
+    ("inner part number", "F40000420"),
+    ("name word", "accelerometer"),
+    ("two words", "LIS3DH QFN"),
+    ("misspelled name", "acelerometer LIS3DH"),
+    ("no match", "XYZZY"),
+]
+
+
+def _rows(start: int, count: int, rng: random.Random):
+    families = list(FAMILIES)
+    for n in range(start, start + count):
+        family = families[n % len(families)]
+        package = rng.choice(PACKAGES)
+        yield {
+            "part_number": f"{family}{n:07d}T6",
+            "name": f"{family} {rng.choice(KINDS)} {package}{rng.randint(8, 144)}",
+            "description": f"{FAMILIES[family]} device in {package} package, grade {rng.randint(1, 9)}",
+            "category": FAMILIES[family],
+            "family": family,
+            "unit_price": Decimal(rng.randint(10, 2000)) / 100,
+            "currency": "USD",
+            "stock_quantity": rng.randint(0, 10_000),
+            "is_active": True,
+        }
+
+
+def _create_search_indexes(connection) -> None:
+    spec = importlib.util.spec_from_file_location("product_search_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with Operations.context(MigrationContext.configure(connection)):
+        migration.upgrade()
+
+
+async def _seed(engine, parts: int, batch: int) -> None:
+    rng = random.Random(42)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    for start in range(0, parts, batch):
+        async with engine.begin() as conn:
+            await conn.execute(insert(Product), list(_rows(start, min(batch, parts - start), rng)))
+    if engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            await conn.run_sync(_create_search_indexes)
+            await conn.exec_driver_sql("ANALYZE products")
+
+
+async def _time(session_factory, search: str, limit: int, repeat: int) -> tuple[float, int]:
+    samples = []
+    for _ in range(repeat):
+        catalog_cache.clear()
+        async with session_factory() as db:
+            start = time.perf_counter()
+            page = await product_service.list_products(db, search=search, limit=limit)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, len(page)
+
+
+async def main(database_url: str, parts: int, batch: int, limit: int, repeat: int) -> None:
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    start = time.perf_counter()
+    await _seed(engine, parts, batch)
+    print(f"{parts} parts on {engine.dialect.name}, seeded in {time.perf_counter() - start:.0f}s")
+
+    print(f"{'query':<20} {'term':<22} {'ms':>8} {'rows':>5}")
+    for label, search in QUERIES:
+        ms, rows = await _time(session_factory, search, limit, repeat)
+        print(f"{label:<20} {search:<22} {ms:>8.2f} {rows:>5}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--parts", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.parts, args.batch, args.limit, args.repeat))
@@ -0,0 +1,77 @@
+"""Build time, memory and lookup latency of the part-number autocomplete index, no database.
+
+Loads ``--parts`` synthetic active products into a ``PrefixIndex`` through ``load``, the step a
+rebuild from the database runs, then times ``suggest`` for prefixes of different selectivity and
+``apply`` for a single product write.
+
+    python -m benchmarks.bench_product_suggest
+    python -m benchmarks.bench_product_suggest --parts 500000 --limit 20
+"""
+import argparse
+import asyncio
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+
+from src.app.services.suggest_index import PrefixIndex
+
+FAMILIES = ["STM32F4", "STM32G0", "STM32H7", "STM32L0", "STM8S", "LIS3DH", "LSM6DS", "VL53L", "L6470", "VIPER"]
+WORDS = ["MCU", "accelerometer", "IMU", "driver", "regulator", "EEPROM", "sensor", "value", "line", "automotive"]
+
+PREFIXES = ["S", "STM32", "STM32G0", "STM32G0000123", "LSM6", "acc", "value line", "XYZ"]
+
+
+def _rows(parts: int):
+    rng = random.Random(42)
+    for n in range(parts):
+        family = FAMILIES[n % len(FAMILIES)]
+        yield uuid.uuid4(), f"{family}{n:07d}T6", f"{family} {' '.join(rng.sample(WORDS, 3))}"
+
+
+def _median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1_000_000
+
+
+def main(parts: int, limit: int, repeat: int) -> None:
+    rows = list(_rows(parts))
+    index = PrefixIndex(version_check_seconds=1.0)
+    start = time.perf_counter()
+    asyncio.run(index.load(rows, 0))
+    build_s = time.perf_counter() - start
+
+    # Measured on a second build: tracemalloc slows allocation down too much to time the first.
+    gc.collect()
+    tracemalloc.start()
+    measured = PrefixIndex(version_check_seconds=1.0)
+    asyncio.run(measured.load(rows, 0))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del measured
+    print(f"{parts} parts: built in {build_s:.2f}s, {index.stats()['entries']} entries, {memory / 2**20:.0f} MiB")
+
+    print(f"{'prefix':<16} {'µs':>8} {'rows':>5}")
+    for prefix in PREFIXES:
+        us = _median_us(lambda: index.suggest(prefix, limit), repeat)
+        print(f"{prefix:<16} {us:>8.1f} {len(index.suggest(prefix, limit)):>5}")
+
+    product_id, part_number, name = rows[parts // 2]
+    product = SimpleNamespace(id=product_id, part_number=part_number, name=f"{name} rev B", is_active=True)
+    print(f"apply one write  {_median_us(lambda: index.apply(product, 0), repeat):>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parts", type=int, default=300_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.parts, args.limit, args.repeat)
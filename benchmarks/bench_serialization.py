@@ -0,0 +1,89 @@
+"""Rendering a page of 100 orders with 5 items each: FastAPI's response_model path vs fast JSON.
+
+The default path is what a route with ``response_model=list[OrderResponse]`` does: validate every
+ORM object against the schema (``from_attributes``), dump it to JSON-compatible data and encode it
+with the stdlib ``json`` module. The fast path is ``src.app.serialization.render`` with
+``FAST_JSON=true``. No database is involved; the orders are built in memory.
+
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --orders 100 --items 5 --repeat 200
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.app.config import settings
+from src.app.models import Order, OrderItem, OrderStatus
+from src.app.schemas.order import OrderResponse
+from src.app.serialization import render
+
+
+def _orders(count: int, items: int) -> list[Order]:
+    now = datetime.now(timezone.utc)
+    orders = []
+    for i in range(count):
+        lines = [
+            OrderItem(
+                id=uuid.uuid4(), product_id=uuid.uuid4(), quantity=10 + n,
+                unit_price=Decimal("8.5200"), line_total=Decimal("8.52") * (10 + n),
+            )
+            for n in range(items)
+        ]
+        orders.append(
+            Order(
+                id=uuid.uuid4(), order_number=f"ST-ORD-202501-{i:04d}", customer_id=uuid.uuid4(),
+                status=OrderStatus.shipped, total_amount=sum(line.line_total for line in lines), currency="USD",
+                shipping_address="Munich, Germany", notes=None, ordered_at=now - timedelta(days=3),
+                shipped_at=now - timedelta(days=1), delivered_at=None, created_at=now, updated_at=now, items=lines,
+            )
+        )
+    return orders
+
+
+async def _default(field, orders: list[Order]) -> bytes:
+    content = await serialize_response(field=field, response_content=orders)
+    return JSONResponse(content).body
+
+
+def _fast(orders: list[Order]) -> bytes:
+    return render(Response(), orders, OrderResponse).body
+
+
+async def main(count: int, items: int, repeat: int) -> None:
+    orders = _orders(count, items)
+    field = create_model_field("response", list[OrderResponse], mode="serialization")
+    settings.fast_json = True
+    assert _fast(orders) and await _default(field, orders)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await _default(field, orders)
+    default = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        _fast(orders)
+    fast = (time.perf_counter() - start) / repeat
+
+    print(f"{count} orders x {items} items, mean of {repeat} renders")
+    print(f"{'path':<14} {'ms/page':>8}")
+    print(f"{'response_model':<14} {default * 1000:>8.2f}")
+    print(f"{'fast json':<14} {fast * 1000:>8.2f}")
+    print(f"speedup: {default / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.items, args.repeat))
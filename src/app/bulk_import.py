@@ -0,0 +1,46 @@
+"""Bulk-load products or customers from a CSV or NDJSON file.
+
+    python -m src.app.bulk_import products catalog.csv
+    python -m src.app.bulk_import customers customers.ndjson
+"""
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from src.app.database import async_session
+from src.app.services import import_service
+
+READ_SIZE = 64 * 1024
+EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+async def _read(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(READ_SIZE):
+            yield chunk
+
+
+async def run_import(entity: str, path: Path, fmt: str) -> None:
+    importer = import_service.import_products if entity == "products" else import_service.import_customers
+    async with async_session() as db:
+        result = await importer(db, import_service.parse_records(_read(path), fmt))
+    print(f"Imported {entity}: {result.inserted} inserted, {result.updated} updated, {result.rejected} rejected.")
+    for error in result.errors:
+        print(f"  line {error.line}: {error.error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load products or customers from CSV or NDJSON.")
+    parser.add_argument("entity", choices=["products", "customers"])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    args = parser.parse_args()
+    fmt = args.format or EXTENSIONS.get(args.path.suffix.lower())
+    if fmt is None:
+        parser.error("cannot tell the format from the file extension, pass --format")
+    asyncio.run(run_import(args.entity, args.path, fmt))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,12 @@ class Settings(BaseSettings):
     environment: str = "dev"
     log_level: str = "info"
     api_base_url: str = "http://localhost:8000"
+    fast_json: bool = False
+    catalog_cache_max_entries: int = 1024
+    catalog_cache_ttl_seconds: float = 60.0
+    catalog_cache_version_check_seconds: float = 1.0
+    # Reads of one POST /api/v1/batch run at most this many at a time, each holding a pooled connection.
+    batch_max_concurrency: int = 4
 
     model_config = {"env_file": ".env", "extra": "ignore"}
 
@@ -1,5 +1,8 @@
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.sql import functions
 
 from src.app.config import settings
 
@@ -11,6 +14,24 @@ class Base(DeclarativeBase):
     pass
 
 
+@compiles(functions.now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP has second precision and a different text format from the one
+    # SQLAlchemy binds datetimes with, so keyset comparisons against it would misorder rows.
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+def dialect_insert(db: AsyncSession, entity):
+    """INSERT construct for the session's dialect, so callers can use ON CONFLICT upserts."""
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    return dialect.insert(entity)
+
+
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """For work that outlives the request handler (e.g. streamed responses), which must open its own session."""
+    return async_session
@@ -0,0 +1,33 @@
+"""Strong ETags for conditional GETs.
+
+A representation is identified by the ``(id, updated_at)`` of every row in it, in order, so
+a list page's tag changes when a row in it changes, enters or leaves the page. Services can
+select just those two columns to answer a matching ``If-None-Match`` without loading rows.
+"""
+import hashlib
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+
+from fastapi import Response
+
+RowVersion = tuple[uuid.UUID, datetime]
+
+
+def compute_etag(versions: Iterable[RowVersion]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for id_, updated_at in versions:
+        digest.update(f"{id_}@{updated_at.isoformat()};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag`` (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
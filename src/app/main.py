@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 
-from src.app.routers import health, customers, products, orders
+from src.app.routers import health, customers, products, orders, analytics, batch
 
 app = FastAPI(
     title="Microelectronics Semiconductor Orders API",
@@ -12,3 +12,5 @@ app.include_router(health.router)
 app.include_router(customers.router)
 app.include_router(products.router)
 app.include_router(orders.router)
+app.include_router(analytics.router)
+app.include_router(batch.router)
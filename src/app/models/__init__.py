@@ -1,6 +1,24 @@
+from src.app.models.catalog_version import CatalogVersion
 from src.app.models.customer import Customer
-from src.app.models.product import Product
-from src.app.models.order import Order, OrderStatus
+from src.app.models.customer_stats import CustomerStats
+from src.app.models.order import ORDER_STATUS_TRANSITIONS, Order, OrderStatus
+from src.app.models.order_change import OrderChange
 from src.app.models.order_item import OrderItem
+from src.app.models.order_number_counter import OrderNumberCounter
+from src.app.models.product import Product
+from src.app.models.sales_rollup import SalesDimension, SalesRollup
 
-__all__ = ["Customer", "Product", "Order", "OrderStatus", "OrderItem"]
+__all__ = [
+    "Customer",
+    "Product",
+    "Order",
+    "OrderStatus",
+    "ORDER_STATUS_TRANSITIONS",
+    "OrderItem",
+    "OrderNumberCounter",
+    "CatalogVersion",
+    "SalesDimension",
+    "SalesRollup",
+    "CustomerStats",
+    "OrderChange",
+]
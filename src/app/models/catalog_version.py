@@ -0,0 +1,13 @@
+from sqlalchemy import BigInteger, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.database import Base
+
+
+class CatalogVersion(Base):
+    """Single row bumped by every product catalog write, so each process can tell its cache is stale."""
+
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
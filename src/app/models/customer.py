@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.database import Base
@@ -9,6 +9,12 @@ from src.app.database import Base
 
 class Customer(Base):
     __tablename__ = "customers"
+    __table_args__ = (
+        # Lists are ordered by company name; filtering by country uses the same order.
+        Index("ix_customers_company_name_id", "company_name", "id"),
+        Index("ix_customers_country_code_company_name_id", "country_code", "company_name", "id"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     company_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -18,7 +24,15 @@ class Customer(Base):
     address: Mapped[str | None] = mapped_column(String(500))
     city: Mapped[str | None] = mapped_column(String(100))
     country: Mapped[str | None] = mapped_column(String(100))
+    # ISO 3166-1 alpha-2, derived from ``country`` on every write (see src.app.countries).
+    country_code: Mapped[str | None] = mapped_column(String(2))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     orders: Mapped[list["Order"]] = relationship(back_populates="customer")  # noqa: F821
+
+
+# Lookups by email (and the customer import, which upserts on it) compare case-insensitively.
+Index("ix_customers_contact_email_lower", func.lower(Customer.contact_email))
+# So does the country filter, for names that do not resolve to a country code.
+Index("ix_customers_country_lower", func.lower(Customer.country))
@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.database import Base
+
+
+class CustomerStats(Base):
+    """Running order totals of one customer, kept current by the order service.
+
+    Counts and values cover non-cancelled orders; ``ytd_value`` is the value of those placed in
+    ``ytd_year`` (UTC) and reads as zero once that year is over. ``last_ordered_at`` includes
+    cancelled orders. Customers without orders have no row.
+    """
+
+    __tablename__ = "customer_stats"
+
+    customer_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("customers.id"), primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    open_order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    lifetime_value: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=Decimal("0.00"))
+    ytd_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    ytd_value: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=Decimal("0.00"))
+    last_ordered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
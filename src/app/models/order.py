@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import String, Numeric, DateTime, Enum, ForeignKey, func
+from sqlalchemy import Boolean, String, Numeric, DateTime, Enum, ForeignKey, Index, func, true
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.database import Base
@@ -18,8 +18,23 @@ class OrderStatus(str, enum.Enum):
     cancelled = "cancelled"
 
 
+# Statuses each status may move to. Fulfilment only moves forward (skipping steps is allowed),
+# and an order can only be cancelled before it ships, so its reserved stock is returned once.
+ORDER_STATUS_TRANSITIONS: dict[OrderStatus, frozenset[OrderStatus]] = {
+    OrderStatus.pending: frozenset(
+        {OrderStatus.confirmed, OrderStatus.processing, OrderStatus.shipped, OrderStatus.cancelled}
+    ),
+    OrderStatus.confirmed: frozenset({OrderStatus.processing, OrderStatus.shipped, OrderStatus.cancelled}),
+    OrderStatus.processing: frozenset({OrderStatus.shipped, OrderStatus.cancelled}),
+    OrderStatus.shipped: frozenset({OrderStatus.delivered}),
+    OrderStatus.delivered: frozenset(),
+    OrderStatus.cancelled: frozenset(),
+}
+
+
 class Order(Base):
     __tablename__ = "orders"
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     order_number: Mapped[str] = mapped_column(String(20), unique=True, nullable=False)
@@ -32,8 +47,28 @@ class Order(Base):
     ordered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     shipped_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     delivered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # The customer's country when the order was placed, which sales analytics report by.
+    country_code: Mapped[str | None] = mapped_column(String(2))
+    # False for orders placed before stock was reserved on create; cancelling them returns none.
+    stock_reserved: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True, server_default=true())
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     customer: Mapped["Customer"] = relationship(back_populates="orders")  # noqa: F821
     items: Mapped[list["OrderItem"]] = relationship(back_populates="order", cascade="all, delete-orphan")  # noqa: F821
+
+
+# Order lists page newest first by (ordered_at, id), optionally filtered to one customer or status.
+Index("ix_orders_ordered_at_id", Order.ordered_at.desc(), Order.id.desc())
+Index("ix_orders_customer_id_ordered_at_id", Order.customer_id, Order.ordered_at.desc(), Order.id.desc())
+Index("ix_orders_status_ordered_at_id", Order.status, Order.ordered_at.desc(), Order.id.desc())
+# Range filters and the other sorts of the order list.
+Index("ix_orders_total_amount_id", Order.total_amount, Order.id)
+Index("ix_orders_shipped_at", Order.shipped_at)
+Index("ix_orders_delivered_at", Order.delivered_at)
+# Order-number prefix searches (LIKE 'ST-ORD-2025%'). The unique index cannot serve them on
+# PostgreSQL unless the database uses the C collation, nor on SQLite, where LIKE ignores case.
+Index(
+    "ix_orders_order_number_pattern", Order.order_number, postgresql_ops={"order_number": "varchar_pattern_ops"}
+).ddl_if(dialect="postgresql")
+Index("ix_orders_order_number_nocase", Order.order_number.collate("NOCASE")).ddl_if(dialect="sqlite")
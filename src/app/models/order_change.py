@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.database import Base
+
+
+class OrderChange(Base):
+    """One row per order created or updated, appended by the order service in the same transaction.
+
+    ``txid`` is the writing transaction's ID on PostgreSQL (0 on SQLite). The change feed reads
+    in ``(txid, id)`` order and only up to the oldest transaction still running, so a change
+    committed late by a long transaction is not skipped by readers that already moved past
+    later ``id`` values.
+    """
+
+    __tablename__ = "order_changes"
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    txid: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    order_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("orders.id"), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+Index("ix_order_changes_txid_id", OrderChange.txid, OrderChange.id)
@@ -0,0 +1,11 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.database import Base
+
+
+class OrderNumberCounter(Base):
+    __tablename__ = "order_number_counters"
+
+    period: Mapped[str] = mapped_column(String(6), primary_key=True)
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import String, Numeric, Integer, Boolean, DateTime, func
+from sqlalchemy import String, Numeric, Integer, Boolean, DateTime, CheckConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.app.database import Base
@@ -10,6 +10,9 @@ from src.app.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (CheckConstraint("stock_quantity >= 0", name="ck_products_stock_quantity_non_negative"),)
+    # Fetch server-generated timestamps with RETURNING on flush instead of a refresh afterwards.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     part_number: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -24,3 +27,8 @@ class Product(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Catalog browsing by category and/or family matches substrings (ILIKE '%value%'). On PostgreSQL,
+# migration 007 serves it with pg_trgm GIN indexes over active products; like the search indexes
+# of migration 005 they need the extension, so they are not declared here.
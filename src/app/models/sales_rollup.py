@@ -0,0 +1,33 @@
+import enum
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.database import Base
+
+
+class SalesDimension(str, enum.Enum):
+    product = "product"
+    family = "family"
+    category = "category"
+    customer = "customer"
+    country = "country"
+    month = "month"
+
+
+class SalesRollup(Base):
+    """Quantity and revenue of the non-cancelled order lines of one month, per value of a dimension.
+
+    ``key`` is the product or customer ID, the family, category or country code ("" when unset),
+    or "" for the month's total. Family, category and country are those at the time of the order,
+    as stored on the order and its lines.
+    """
+
+    __tablename__ = "sales_rollups"
+
+    dimension: Mapped[str] = mapped_column(String(16), primary_key=True)
+    month: Mapped[str] = mapped_column(String(7), primary_key=True)
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+    quantity: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=Decimal("0.00"))
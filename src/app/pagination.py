@@ -0,0 +1,64 @@
+"""Opaque keyset cursors for the list endpoints.
+
+A cursor encodes the sort-key values of the last row of a page. The next page is then a range
+scan starting right after that row, instead of an OFFSET that re-reads every skipped row and
+shifts when rows are inserted concurrently.
+"""
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _load(type_: type, value):
+    if type_ is datetime:
+        return datetime.fromisoformat(value)
+    if type_ is uuid.UUID:
+        return uuid.UUID(value)
+    if type_ is Decimal:
+        return Decimal(value)
+    if not isinstance(value, type_):
+        raise ValueError(f"expected {type_.__name__}")
+    return value
+
+
+def encode_cursor(values: Sequence) -> str:
+    payload = json.dumps([_dump(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(types):
+            raise ValueError("wrong number of keys")
+        return [_load(t, v) for t, v in zip(types, raw)]
+    except (ValueError, TypeError, InvalidOperation, binascii.Error) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def keyset_after(columns: Sequence[ColumnElement], values: Sequence, descending: bool = False) -> ColumnElement:
+    """Rows strictly after ``values`` when ordered by ``columns`` (all in the same direction)."""
+    key = tuple_(*columns)
+    bound = tuple_(*values)
+    return key < bound if descending else key > bound
@@ -0,0 +1,74 @@
+"""Read-only row projections for the list endpoints.
+
+The columns a response schema needs are selected with Core and each row is mapped straight into
+a dict, so reads build no ORM instances and involve no identity map, change tracking or
+relationship loaders. Child rows (order items) are fetched for a whole page with one IN query
+and grouped in Python.
+"""
+from collections import defaultdict
+from collections.abc import Collection, Mapping, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+def response_fields(schema: type[BaseModel], fields: str | None, embeds: Mapping[str, bool] = {}) -> list[str] | None:
+    """The fields to render for a comma-separated ``fields`` parameter (all when empty), with the
+    embedded relations in ``embeds`` switched on or off. None when that is the whole schema."""
+    names = [name for name in schema.model_fields if name not in embeds]
+    if fields:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - set(names)
+        if unknown:
+            raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        names = [name for name in names if name in requested]
+    names += [name for name, embedded in embeds.items() if embedded]
+    return None if names == list(schema.model_fields) else names
+
+
+def schema_columns(model, schema: type[BaseModel]) -> list[ColumnElement]:
+    """The table columns of ``model`` that ``schema`` renders, in schema order."""
+    columns = model.__table__.c
+    return [columns[name] for name in schema.model_fields if name in columns]
+
+
+def pick_columns(
+    columns: Sequence[ColumnElement], fields: Collection[str] | None, required: Collection[str] = ()
+) -> list[ColumnElement]:
+    """``columns`` narrowed to ``fields`` (all when None) plus the ``required`` keys the caller
+    needs for paging and ETags."""
+    if fields is None:
+        return list(columns)
+    wanted = {*fields, *required}
+    return [column for column in columns if column.key in wanted]
+
+
+async def fetch_dicts(db: AsyncSession, query: Select) -> list[dict]:
+    result = await db.execute(query)
+    return [dict(row) for row in result.mappings()]
+
+
+async def attach_children(
+    db: AsyncSession,
+    parents: list[dict],
+    name: str,
+    columns: Sequence[ColumnElement],
+    foreign_key: ColumnElement,
+) -> list[dict]:
+    """Set ``parent[name]`` to the list of child rows whose ``foreign_key`` is the parent's id."""
+    children = defaultdict(list)
+    if parents:
+        query = select(foreign_key.label("_parent_id"), *columns).where(
+            foreign_key.in_([parent["id"] for parent in parents])
+        )
+        for row in await fetch_dicts(db, query):
+            children[row.pop("_parent_id")].append(row)
+    for parent in parents:
+        parent[name] = children[parent["id"]]
+    return parents
@@ -0,0 +1,27 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database import get_db
+from src.app.models.sales_rollup import SalesDimension
+from src.app.schemas.analytics import SalesTotal
+from src.app.services import analytics_service
+
+router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+@router.get("/sales/{dimension}", response_model=list[SalesTotal])
+async def sales_by(
+    dimension: SalesDimension,
+    from_month: str | None = Query(None, pattern=MONTH_PATTERN, description="First month (YYYY-MM), inclusive"),
+    to_month: str | None = Query(None, pattern=MONTH_PATTERN, description="Last month (YYYY-MM), inclusive"),
+    order_by: Literal["revenue", "quantity"] = Query("revenue", description="Ignored for months, which are in order"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """Quantity and revenue of non-cancelled orders per product, family, category, customer,
+    country or month, from rollups kept up to date by every order write."""
+    return await analytics_service.sales_by(db, dimension, from_month, to_month, order_by, limit)
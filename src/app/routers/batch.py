@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request
+
+from src.app.config import settings
+from src.app.schemas.batch import BatchRequest, BatchResponse
+from src.app.services import batch_service
+
+router = APIRouter(prefix="/api/v1", tags=["batch"])
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(data: BatchRequest, request: Request):
+    """Run up to 50 API requests in one call and return each one's status, ETag
+    and X-Next-Cursor headers, and body, in request order.
+
+    Consecutive GETs run concurrently, each with its own database session; a POST, PUT or
+    DELETE runs after the requests before it have finished and before those after it start.
+    Every sub-request succeeds or fails on its own. Only product, customer, order and sales
+    reads and single-order writes may be called; anything else gets a 400 result.
+    """
+    results = await batch_service.run_batch(request.app, data.requests, settings.batch_max_concurrency)
+    return BatchResponse(results=results)
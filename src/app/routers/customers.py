@@ -1,32 +1,99 @@
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.database import get_db
-from src.app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
-from src.app.services import customer_service
+from src.app.etag import compute_etag, etag_matches, not_modified
+from src.app.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from src.app.projection import InvalidFieldsError, response_fields
+from src.app.serialization import render
+from src.app.schemas.account import AccountOverview
+from src.app.schemas.bulk_import import ImportResult
+from src.app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse, CustomerSummary
+from src.app.services import account_service, customer_service, customer_stats_service, import_service
 
 router = APIRouter(prefix="/api/v1/customers", tags=["customers"])
 
 
 @router.get("", response_model=list[CustomerResponse])
 async def list_customers(
+    request: Request,
+    response: Response,
     search: str | None = Query(None),
-    country: str | None = Query(None),
+    country: str | None = Query(None, description="Country name or ISO 3166-1 alpha-2 code"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: str | None = Query(None, description=f"Value of a previous page's {NEXT_CURSOR_HEADER} header"),
+    fields: str | None = Query(None, description="Comma-separated fields to return; all by default"),
     db: AsyncSession = Depends(get_db),
 ):
-    return await customer_service.list_customers(db, search=search, country=country, skip=skip, limit=limit)
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="skip and cursor cannot be combined")
+    filters = dict(search=search, country=country, skip=skip, limit=limit, cursor=cursor)
+    if_none_match = request.headers.get("if-none-match")
+    try:
+        selected = response_fields(CustomerResponse, fields)
+        if if_none_match:
+            etag = compute_etag(await customer_service.list_customer_versions(db, **filters))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        customers = await customer_service.list_customers(db, fields=selected, **filters)
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers["ETag"] = compute_etag((customer["id"], customer["updated_at"]) for customer in customers)
+    if len(customers) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = customer_service.customer_cursor(customers[-1])
+    return render(response, customers, CustomerResponse, fields=selected)
+
+
+@router.get("/by-email", response_model=list[CustomerResponse])
+async def get_customers_by_email(
+    email: str = Query(..., min_length=3, max_length=255), db: AsyncSession = Depends(get_db)
+):
+    """Customers whose contact email matches, ignoring case (normally at most one)."""
+    return await customer_service.get_customers_by_email(db, email)
 
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
-async def get_customer(customer_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def get_customer(
+    customer_id: uuid.UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await customer_service.get_customer_version(db, customer_id)
+        if version and etag_matches(if_none_match, etag := compute_etag([version])):
+            return not_modified(etag)
     customer = await customer_service.get_customer(db, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
-    return customer
+    response.headers["ETag"] = compute_etag([(customer.id, customer.updated_at)])
+    return render(response, customer, CustomerResponse)
+
+
+@router.get("/{customer_id}/summary", response_model=CustomerSummary)
+async def get_customer_summary(customer_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    """Order count, lifetime and year-to-date value, last order time and open orders, kept up to
+    date by every order write, so this is a single-row read."""
+    summary = await customer_stats_service.get_customer_summary(db, customer_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return summary
+
+
+@router.get("/{customer_id}/overview", response_model=AccountOverview)
+async def get_account_overview(
+    customer_id: uuid.UUID,
+    orders: int = Query(10, ge=1, le=50, description="Number of most recent orders to include"),
+    db: AsyncSession = Depends(get_db),
+):
+    """The customer, their order summary, most recent orders with items, and the referenced
+    products, in one response read with a fixed number of queries."""
+    overview = await account_service.get_account_overview(db, customer_id, orders)
+    if not overview:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return overview
 
 
 @router.post("", response_model=CustomerResponse, status_code=201)
@@ -34,6 +101,18 @@ async def create_customer(data: CustomerCreate, db: AsyncSession = Depends(get_d
     return await customer_service.create_customer(db, data)
 
 
+@router.post("/import", response_model=ImportResult)
+async def import_customers(
+    request: Request,
+    fmt: Literal["csv", "ndjson"] | None = Query(None, alias="format"),
+    db: AsyncSession = Depends(get_db),
+):
+    fmt = fmt or import_service.format_for_content_type(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass format=")
+    return await import_service.import_customers(db, import_service.parse_records(request.stream(), fmt))
+
+
 @router.put("/{customer_id}", response_model=CustomerResponse)
 async def update_customer(customer_id: uuid.UUID, data: CustomerUpdate, db: AsyncSession = Depends(get_db)):
     customer = await customer_service.update_customer(db, customer_id, data)
@@ -3,6 +3,8 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.database import get_db
+from src.app.services.catalog_cache import catalog_cache
+from src.app.services.suggest_index import suggest_index
 
 router = APIRouter(tags=["health"])
 
@@ -19,3 +21,8 @@ async def db_health_check(db: AsyncSession = Depends(get_db)):
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": str(e)}
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    return {"catalog": catalog_cache.stats(), "suggest": suggest_index.stats()}
@@ -1,33 +1,186 @@
 import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.app.database import get_db
+from src.app.database import get_db, get_session_factory
+from src.app.etag import compute_etag, etag_matches, not_modified
+from src.app.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from src.app.projection import InvalidFieldsError, response_fields
+from src.app.serialization import render
 from src.app.models.order import OrderStatus
-from src.app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
-from src.app.services import order_service
+from src.app.schemas.order import (
+    OrderBatchCreate,
+    OrderBatchResponse,
+    OrderBatchResult,
+    OrderChanges,
+    OrderCreate,
+    OrderExpandedResponse,
+    OrderResponse,
+    OrderStatusBulkResult,
+    OrderStatusBulkUpdate,
+    OrderUpdate,
+)
+from src.app.services import export_service, order_service
 
 router = APIRouter(prefix="/api/v1/orders", tags=["orders"])
 
+EXPAND_DESCRIPTION = (
+    "Comma-separated related entities to embed: items.product, customer (see OrderExpandedResponse)"
+)
+SORT_DESCRIPTION = "ordered_at, total_amount or order_number; prefix with - for descending (default -ordered_at)"
+
+
+def _selected_fields(fields: str | None, include_items: bool, expansions: set[str]) -> list[str] | None:
+    if not expansions:
+        return response_fields(OrderResponse, fields, embeds={"items": include_items})
+    # Expanded orders do not match OrderResponse, so always name the fields to render them directly.
+    embeds = {"items": include_items, "customer": "customer" in expansions}
+    return response_fields(OrderExpandedResponse, fields, embeds=embeds) or list(OrderExpandedResponse.model_fields)
+
 
 @router.get("", response_model=list[OrderResponse])
 async def list_orders(
+    request: Request,
+    response: Response,
     status: OrderStatus | None = Query(None),
     customer_id: uuid.UUID | None = Query(None),
+    ordered_from: datetime | None = Query(None),
+    ordered_to: datetime | None = Query(None, description="Exclusive"),
+    min_total: Decimal | None = Query(None, ge=0),
+    max_total: Decimal | None = Query(None, ge=0),
+    order_number: str | None = Query(None, max_length=20, description="Order number prefix, e.g. ST-ORD-202503"),
+    shipped_from: datetime | None = Query(None),
+    shipped_to: datetime | None = Query(None, description="Exclusive"),
+    delivered_from: datetime | None = Query(None),
+    delivered_to: datetime | None = Query(None, description="Exclusive"),
+    sort: order_service.OrderSort = Query(order_service.DEFAULT_ORDER_SORT, description=SORT_DESCRIPTION),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: str | None = Query(None, description=f"Value of a previous page's {NEXT_CURSOR_HEADER} header"),
+    fields: str | None = Query(None, description="Comma-separated fields to return; all by default"),
+    include: str | None = Query(None, description="'items' to embed line items (the default), empty for none"),
+    expand: str | None = Query(None, description=EXPAND_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+):
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="skip and cursor cannot be combined")
+    filters = dict(
+        status=status,
+        customer_id=customer_id,
+        ordered_from=ordered_from,
+        ordered_to=ordered_to,
+        min_total=min_total,
+        max_total=max_total,
+        order_number=order_number,
+        shipped_from=shipped_from,
+        shipped_to=shipped_to,
+        delivered_from=delivered_from,
+        delivered_to=delivered_to,
+        sort=sort,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+    if_none_match = request.headers.get("if-none-match")
+    try:
+        expansions = order_service.parse_expand(expand)
+        include_items = include is None or "items" in include.split(",") or "items.product" in expansions
+        selected = _selected_fields(fields, include_items, expansions)
+        # The narrow version query only covers the orders themselves, not embedded entities.
+        if if_none_match and not expansions:
+            etag = compute_etag(await order_service.list_order_versions(db, **filters))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        orders = await order_service.list_orders(db, fields=selected, expand=expansions, **filters)
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = compute_etag(order_service.expanded_versions(orders))
+    if expansions and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if len(orders) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = order_service.order_cursor(orders[-1], sort)
+    return render(response, orders, OrderResponse, fields=selected)
+
+
+@router.get("/export")
+async def export_orders(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    status: OrderStatus | None = Query(None),
+    customer_id: uuid.UUID | None = Query(None),
+    ordered_from: datetime | None = Query(None),
+    ordered_to: datetime | None = Query(None),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+):
+    """Stream all matching orders, oldest first. NDJSON has one order per line with its items;
+    CSV has one row per item, repeating the order columns."""
+    # The body is sent after the dependencies have been torn down, so the export opens its own session.
+    body = export_service.export_orders(
+        session_factory,
+        fmt,
+        status=status,
+        customer_id=customer_id,
+        ordered_from=ordered_from,
+        ordered_to=ordered_to,
+    )
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="orders.{fmt}"'}
+    )
+
+
+@router.get("/changes", response_model=OrderChanges)
+async def list_order_changes(
+    since: str | None = Query(None, description="next_since of a previous call; omit to start from the first order"),
+    limit: int = Query(100, ge=1, le=1000),
     db: AsyncSession = Depends(get_db),
 ):
-    return await order_service.list_orders(db, status=status, customer_id=customer_id, skip=skip, limit=limit)
+    """Orders created or updated (including cancelled) after ``since``, each in its current state
+    and in the order they last changed. Changes are never skipped, also when writes commit
+    concurrently; an order changed again later comes again."""
+    try:
+        orders, next_since, has_more = await order_service.list_order_changes(db, since, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return OrderChanges(orders=orders, next_since=next_since, has_more=has_more)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-async def get_order(order_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def get_order(
+    order_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    expand: str | None = Query(None, description=EXPAND_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+):
+    if_none_match = request.headers.get("if-none-match")
+    if expand:
+        try:
+            expansions = order_service.parse_expand(expand)
+        except InvalidFieldsError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        order = await order_service.get_order_expanded(db, order_id, expansions)
+        if not order:
+            raise HTTPException(status_code=404, detail="Order not found")
+        etag = compute_etag(order_service.expanded_versions([order]))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        return render(response, order, OrderExpandedResponse, fields=_selected_fields(None, True, expansions))
+    if if_none_match:
+        version = await order_service.get_order_version(db, order_id)
+        if version and etag_matches(if_none_match, etag := compute_etag([version])):
+            return not_modified(etag)
     order = await order_service.get_order(db, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    response.headers["ETag"] = compute_etag([(order.id, order.updated_at)])
+    return render(response, order, OrderResponse)
 
 
 @router.post("", response_model=OrderResponse, status_code=201)
@@ -38,9 +191,38 @@ async def create_order(data: OrderCreate, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(":batch", response_model=OrderBatchResponse)
+async def create_orders_batch(data: OrderBatchCreate, db: AsyncSession = Depends(get_db)):
+    try:
+        outcomes = await order_service.create_orders(db, data.orders)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    results = [
+        OrderBatchResult(index=i, error=outcome)
+        if isinstance(outcome, str)
+        else OrderBatchResult(index=i, order=OrderResponse.model_validate(outcome))
+        for i, outcome in enumerate(outcomes)
+    ]
+    failed = sum(1 for result in results if result.error)
+    return OrderBatchResponse(created=len(results) - failed, failed=failed, results=results)
+
+
+@router.post("/status", response_model=OrderStatusBulkResult)
+async def update_orders_status(data: OrderStatusBulkUpdate, db: AsyncSession = Depends(get_db)):
+    """Move many orders to one status in a single UPDATE. Orders whose current status does not
+    allow the move (or that are already there) are left alone; only the IDs moved are returned.
+    A filter moves at most 10,000 orders per call, oldest first: repeat it until fewer come back."""
+    filters = data.filter.model_dump(exclude_none=True) if data.filter else None
+    order_ids = await order_service.update_orders_status(db, data.status, data.order_ids, filters)
+    return OrderStatusBulkResult(status=data.status, updated=len(order_ids), order_ids=order_ids)
+
+
 @router.put("/{order_id}", response_model=OrderResponse)
 async def update_order(order_id: uuid.UUID, data: OrderUpdate, db: AsyncSession = Depends(get_db)):
-    order = await order_service.update_order(db, order_id, data)
+    try:
+        order = await order_service.update_order(db, order_id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -48,7 +230,10 @@ async def update_order(order_id: uuid.UUID, data: OrderUpdate, db: AsyncSession
 
 @router.delete("/{order_id}", response_model=OrderResponse)
 async def cancel_order(order_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    order = await order_service.cancel_order(db, order_id)
+    try:
+        order = await order_service.cancel_order(db, order_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -1,33 +1,80 @@
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.database import get_db
-from src.app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from src.app.services import product_service
+from src.app.etag import compute_etag, etag_matches, not_modified
+from src.app.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
+from src.app.projection import InvalidFieldsError, response_fields
+from src.app.serialization import render
+from src.app.schemas.bulk_import import ImportResult
+from src.app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductSuggestion
+from src.app.services import product_service, import_service
 
 router = APIRouter(prefix="/api/v1/products", tags=["products"])
 
 
 @router.get("", response_model=list[ProductResponse])
 async def list_products(
+    request: Request,
+    response: Response,
     category: str | None = Query(None),
     family: str | None = Query(None),
     search: str | None = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: str | None = Query(None, description=f"Value of a previous page's {NEXT_CURSOR_HEADER} header"),
+    fields: str | None = Query(None, description="Comma-separated fields to return; all by default"),
     db: AsyncSession = Depends(get_db),
 ):
-    return await product_service.list_products(db, category=category, family=family, search=search, skip=skip, limit=limit)
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="skip and cursor cannot be combined")
+    try:
+        selected = response_fields(ProductResponse, fields)
+        products = await product_service.list_products(
+            db,
+            category=category,
+            family=family,
+            search=search,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            fields=selected,
+        )
+    except (InvalidCursorError, InvalidFieldsError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Usually served from the catalog cache, so the tag costs no extra query.
+    etag = compute_etag((product["id"], product["updated_at"]) for product in products)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if len(products) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = product_service.product_cursor(products[-1])
+    return render(response, products, ProductResponse, fields=selected)
+
+
+@router.get("/suggest", response_model=list[ProductSuggestion])
+async def suggest_products(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Start of a part number or of a name word"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """Autocomplete for active products: part-number matches first, then name matches."""
+    return await product_service.suggest_products(db, prefix, limit)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+async def get_product(product_id: uuid.UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     product = await product_service.get_product(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    etag = compute_etag([(product.id, product.updated_at)])
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return render(response, product, ProductResponse)
 
 
 @router.post("", response_model=ProductResponse, status_code=201)
@@ -35,6 +82,18 @@ async def create_product(data: ProductCreate, db: AsyncSession = Depends(get_db)
     return await product_service.create_product(db, data)
 
 
+@router.post("/import", response_model=ImportResult)
+async def import_products(
+    request: Request,
+    fmt: Literal["csv", "ndjson"] | None = Query(None, alias="format"),
+    db: AsyncSession = Depends(get_db),
+):
+    fmt = fmt or import_service.format_for_content_type(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass format=")
+    return await import_service.import_products(db, import_service.parse_records(request.stream(), fmt))
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
 async def update_product(product_id: uuid.UUID, data: ProductUpdate, db: AsyncSession = Depends(get_db)):
     product = await product_service.update_product(db, product_id, data)
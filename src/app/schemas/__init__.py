@@ -1,9 +1,24 @@
-from src.app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
-from src.app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
-from src.app.schemas.order import OrderCreate, OrderUpdate, OrderResponse, OrderItemCreate, OrderItemResponse
+from src.app.schemas.account import AccountOverview
+from src.app.schemas.analytics import SalesTotal
+from src.app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+from src.app.schemas.bulk_import import ImportResult, ImportRowError
+from src.app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse, CustomerSummary
+from src.app.schemas.product import ProductCreate, ProductUpdate, ProductResponse, ProductSuggestion
+from src.app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderItemCreate, OrderItemResponse,
+    OrderItemExpandedResponse, OrderExpandedResponse,
+    OrderBatchCreate, OrderBatchResult, OrderBatchResponse,
+    OrderFilter, OrderStatusBulkUpdate, OrderStatusBulkResult, OrderChanges,
+)
 
 __all__ = [
-    "CustomerCreate", "CustomerUpdate", "CustomerResponse",
-    "ProductCreate", "ProductUpdate", "ProductResponse",
+    "CustomerCreate", "CustomerUpdate", "CustomerResponse", "CustomerSummary",
+    "ProductCreate", "ProductUpdate", "ProductResponse", "ProductSuggestion",
     "OrderCreate", "OrderUpdate", "OrderResponse", "OrderItemCreate", "OrderItemResponse",
+    "OrderItemExpandedResponse", "OrderExpandedResponse",
+    "OrderBatchCreate", "OrderBatchResult", "OrderBatchResponse",
+    "OrderFilter", "OrderStatusBulkUpdate", "OrderStatusBulkResult", "OrderChanges",
+    "ImportResult", "ImportRowError",
+    "SalesTotal", "AccountOverview",
+    "BatchRequest", "BatchSubRequest", "BatchResponse", "BatchSubResponse",
 ]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+from src.app.schemas.customer import CustomerResponse, CustomerSummary
+from src.app.schemas.order import OrderResponse
+from src.app.schemas.product import ProductResponse
+
+
+class AccountOverview(BaseModel):
+    """A customer with their order totals, most recent orders and every product those orders'
+    lines reference, each product listed once. ``next_orders_cursor`` continues the orders with
+    ``GET /api/v1/orders?customer_id=...&cursor=...`` when there are more."""
+
+    customer: CustomerResponse
+    summary: CustomerSummary
+    orders: list[OrderResponse]
+    products: list[ProductResponse]
+    next_orders_cursor: str | None = None
@@ -0,0 +1,13 @@
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class SalesTotal(BaseModel):
+    """Sales of one group: a product or customer ID, family, category, country code or month
+    (YYYY-MM) as ``key``, null for lines without one, and a display name where there is one."""
+
+    key: str | None
+    label: str | None = None
+    quantity: int
+    revenue: Decimal
@@ -0,0 +1,26 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+BATCH_MAX_REQUESTS = 50
+
+
+class BatchSubRequest(BaseModel):
+    method: Literal["GET", "POST", "PUT", "DELETE"] = "GET"
+    path: str = Field(pattern=r"^/api/v1/", description="Path and query string, e.g. /api/v1/products?family=STM32F4")
+    body: Any = None
+    headers: dict[str, str] = {}
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchSubRequest] = Field(min_length=1, max_length=BATCH_MAX_REQUESTS)
+
+
+class BatchSubResponse(BaseModel):
+    status: int
+    headers: dict[str, str] = {}
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    results: list[BatchSubResponse]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    errors: list[ImportRowError] = []
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel
 
@@ -33,7 +34,21 @@ class CustomerResponse(BaseModel):
     address: str | None
     city: str | None
     country: str | None
+    country_code: str | None
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class CustomerSummary(BaseModel):
+    """Order totals of a customer. Counts and values exclude cancelled orders; ``ytd_value`` covers
+    the current calendar year (UTC); open orders are those not yet delivered or cancelled."""
+
+    customer_id: uuid.UUID
+    company_name: str
+    order_count: int
+    open_order_count: int
+    lifetime_value: Decimal
+    ytd_value: Decimal
+    last_ordered_at: datetime | None
@@ -2,14 +2,16 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from src.app.models.order import OrderStatus
+from src.app.schemas.customer import CustomerResponse
+from src.app.schemas.product import ProductResponse
 
 
 class OrderItemCreate(BaseModel):
     product_id: uuid.UUID
-    quantity: int
+    quantity: int = Field(gt=0)
 
 
 class OrderItemResponse(BaseModel):
@@ -52,3 +54,77 @@ class OrderResponse(BaseModel):
     items: list[OrderItemResponse] = []
 
     model_config = {"from_attributes": True}
+
+
+class OrderItemExpandedResponse(OrderItemResponse):
+    product: ProductResponse | None = None
+
+
+class OrderExpandedResponse(OrderResponse):
+    """An order with ``expand=items.product,customer`` applied."""
+
+    customer: CustomerResponse | None = None
+    items: list[OrderItemExpandedResponse] = []
+
+
+class OrderBatchCreate(BaseModel):
+    orders: list[OrderCreate] = Field(min_length=1, max_length=1000)
+
+
+class OrderBatchResult(BaseModel):
+    index: int
+    order: OrderResponse | None = None
+    error: str | None = None
+
+
+class OrderBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[OrderBatchResult]
+
+
+class OrderFilter(BaseModel):
+    """The order list filters (see ``GET /api/v1/orders``); date ranges exclude their end."""
+
+    status: OrderStatus | None = None
+    customer_id: uuid.UUID | None = None
+    ordered_from: datetime | None = None
+    ordered_to: datetime | None = None
+    min_total: Decimal | None = Field(None, ge=0)
+    max_total: Decimal | None = Field(None, ge=0)
+    order_number: str | None = Field(None, max_length=20)
+    shipped_from: datetime | None = None
+    shipped_to: datetime | None = None
+    delivered_from: datetime | None = None
+    delivered_to: datetime | None = None
+
+
+class OrderStatusBulkUpdate(BaseModel):
+    """Move the listed orders, or those matching a non-empty ``filter``, to ``status``."""
+
+    status: OrderStatus
+    order_ids: list[uuid.UUID] | None = Field(None, min_length=1, max_length=10_000)
+    filter: OrderFilter | None = None
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if (self.order_ids is None) == (self.filter is None):
+            raise ValueError("Pass either order_ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter must set at least one condition")
+        return self
+
+
+class OrderStatusBulkResult(BaseModel):
+    status: OrderStatus
+    updated: int
+    order_ids: list[uuid.UUID]
+
+
+class OrderChanges(BaseModel):
+    """A page of the order change feed. Pass ``next_since`` back as ``since`` for the next page
+    (while ``has_more``) or, later, for the changes made since."""
+
+    orders: list[OrderResponse]
+    next_since: str
+    has_more: bool
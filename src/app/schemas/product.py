@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProductCreate(BaseModel):
@@ -13,7 +13,7 @@ class ProductCreate(BaseModel):
     family: str | None = None
     unit_price: Decimal
     currency: str = "USD"
-    stock_quantity: int = 0
+    stock_quantity: int = Field(0, ge=0)
     lead_time_days: int | None = None
     is_active: bool = True
 
@@ -25,7 +25,7 @@ class ProductUpdate(BaseModel):
     family: str | None = None
     unit_price: Decimal | None = None
     currency: str | None = None
-    stock_quantity: int | None = None
+    stock_quantity: int | None = Field(None, ge=0)
     lead_time_days: int | None = None
     is_active: bool | None = None
 
@@ -46,3 +46,9 @@ class ProductResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class ProductSuggestion(BaseModel):
+    id: uuid.UUID
+    part_number: str
+    name: str
@@ -9,6 +9,11 @@ from sqlalchemy import select, func
 
 from src.app.database import engine, async_session, Base
 from src.app.models import Customer, Product, Order, OrderItem, OrderStatus
+from src.app.services.analytics_service import rebuild_sales_rollups
+from src.app.services.customer_service import with_country_code
+from src.app.services.customer_stats_service import rebuild_customer_stats
+from src.app.services.order_change_service import record_all_orders
+from src.app.services.order_service import allocate_order_numbers
 
 
 CUSTOMERS = [
@@ -84,7 +89,7 @@ async def seed_database():
         # Create customers
         customers = []
         for c_data in CUSTOMERS:
-            customer = Customer(id=uuid.uuid4(), **c_data)
+            customer = Customer(id=uuid.uuid4(), **with_country_code(c_data))
             db.add(customer)
             customers.append(customer)
         await db.flush()
@@ -109,15 +114,12 @@ async def seed_database():
         statuses = [s for s, _ in status_weights]
         weights = [w for _, w in status_weights]
 
-        order_count = 0
         for i in range(40):
             status = random.choices(statuses, weights=weights, k=1)[0]
             customer = random.choice(customers)
             days_ago = random.randint(1, 180)
             ordered_at = now - timedelta(days=days_ago)
-            month_str = ordered_at.strftime("%Y%m")
-            order_count += 1
-            order_number = f"ST-ORD-{month_str}-{order_count:04d}"
+            [order_number] = await allocate_order_numbers(db, period=ordered_at.strftime("%Y%m"))
 
             shipped_at = None
             delivered_at = None
@@ -130,6 +132,7 @@ async def seed_database():
                 id=uuid.uuid4(),
                 order_number=order_number,
                 customer_id=customer.id,
+                country_code=customer.country_code,
                 status=status,
                 total_amount=Decimal("0.00"),
                 currency="USD",
@@ -141,12 +144,15 @@ async def seed_database():
             db.add(order)
             await db.flush()
 
-            # Add 1-5 items
+            # Add 1-5 items, from products that still have stock: seeded orders take their stock
+            # like those placed through the API, so no line is for more than is left.
+            in_stock = [product for product in products if product.stock_quantity > 0]
             num_items = random.randint(1, 5)
-            selected_products = random.sample(products, min(num_items, len(products)))
+            selected_products = random.sample(in_stock, min(num_items, len(in_stock)))
             total = Decimal("0.00")
             for product in selected_products:
-                qty = random.randint(50, 5000)
+                qty = min(random.randint(50, 5000), product.stock_quantity)
+                product.stock_quantity -= qty
                 line_total = product.unit_price * qty
                 total += line_total
                 item = OrderItem(
@@ -156,12 +162,17 @@ async def seed_database():
                     quantity=qty,
                     unit_price=product.unit_price,
                     line_total=line_total,
+                    category=product.category,
+                    family=product.family,
                 )
                 db.add(item)
 
             order.total_amount = total
 
         await db.commit()
+        await rebuild_sales_rollups(db)
+        await rebuild_customer_stats(db)
+        await record_all_orders(db)
         print(f"Seeded {len(customers)} customers, {len(products)} products, 40 orders.")
 
 
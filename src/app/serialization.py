@@ -0,0 +1,87 @@
+"""Opt-in fast JSON rendering for the read endpoints (``FAST_JSON=true``).
+
+By default FastAPI validates every returned object against the route's ``response_model``,
+field by field and nested model by nested model, and then encodes the result with the stdlib
+``json`` module. In fast mode the route builds the response itself: a serializer compiled once
+per response schema copies the schema's fields straight off the projected rows (or ORM and
+cached schema objects), and the whole page is encoded by a single ``orjson.dumps`` call. The
+JSON is the same; the rows are trusted to match the schema, which holds for what the services
+load.
+"""
+import functools
+import types
+import typing
+from collections.abc import Callable
+from decimal import Decimal
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from src.app.config import settings
+
+Serializer = Callable[[object], dict]
+
+
+def _converter(annotation) -> Callable | None:
+    """How to turn an attribute of this type into JSON-ready data, or None to copy it as is."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return compile_serializer(annotation)
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is list:
+        convert = _converter(args[0])
+        return (lambda values: [convert(value) for value in values]) if convert else list
+    if origin in (typing.Union, types.UnionType) and type(None) in args:
+        [inner] = [arg for arg in args if arg is not type(None)]
+        convert = _converter(inner)
+        return (lambda value: None if value is None else convert(value)) if convert else None
+    return None
+
+
+@functools.cache
+def compile_serializer(schema: type[BaseModel]) -> Serializer:
+    fields = tuple((name, _converter(field.annotation)) for name, field in schema.model_fields.items())
+
+    def serialize(obj) -> dict:
+        # Projected rows are dicts; loaded ORM rows and schema objects keep their values in
+        # __dict__, and reading it directly skips the attribute instrumentation. Anything not
+        # there goes through getattr.
+        values = obj if type(obj) is dict else obj.__dict__
+        data = {}
+        for name, convert in fields:
+            value = values[name] if name in values else getattr(obj, name)
+            data[name] = value if convert is None else convert(value)
+        return data
+
+    return serialize
+
+
+def _default(value):
+    # Pydantic renders Decimal as a string in JSON; orjson does not handle it natively.
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(data) -> bytes:
+    return orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def render(response: Response, content, schema: type[BaseModel], fields: list[str] | None = None):
+    """Return ``content`` for FastAPI to validate and encode, or in fast mode the finished response.
+
+    ``content`` is one object or, for list routes, a list of them. ``fields`` restricts rows
+    (dicts) to those keys; such rows need not match the route's response model, so they are
+    always encoded here. Headers already set on ``response`` (ETag, pagination cursor) are carried over.
+    """
+    if fields is not None:
+        def serialize(row: dict) -> dict:
+            return {name: row[name] for name in fields}
+    elif not settings.fast_json:
+        return content
+    else:
+        serialize = compile_serializer(schema)
+    data = [serialize(obj) for obj in content] if isinstance(content, list) else serialize(content)
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(dumps(data), media_type="application/json", headers=headers)
@@ -0,0 +1,29 @@
+"""One-call overview of a customer account, for clients that would otherwise chain a customer
+read, an order list and a read per order and per product."""
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.services import customer_service, customer_stats_service, order_service, product_service
+
+
+async def get_account_overview(db: AsyncSession, customer_id: uuid.UUID, order_limit: int = 10) -> dict | None:
+    """The customer, their summary, newest orders with items and the products of those items.
+
+    A fixed number of queries whatever the number of orders or products: the summary, the
+    customer, a page of orders, their items, and the products missing from the catalog cache.
+    """
+    summary = await customer_stats_service.get_customer_summary(db, customer_id)
+    if summary is None:
+        return None
+    customers = await customer_service.get_customers(db, [customer_id])
+    orders = await order_service.list_orders(db, customer_id=customer_id, limit=order_limit)
+    product_ids = {item["product_id"] for order in orders for item in order["items"]}
+    products = await product_service.get_products(db, product_ids)
+    return {
+        "customer": customers[customer_id],
+        "summary": summary,
+        "orders": orders,
+        "products": sorted(products.values(), key=lambda product: product.part_number),
+        "next_orders_cursor": order_service.order_cursor(orders[-1]) if len(orders) == order_limit else None,
+    }
@@ -0,0 +1,146 @@
+"""Sales totals per product, family, category, customer, country and month.
+
+Every order write adds its lines to (or, when cancelled, takes them from) the ``sales_rollups``
+rows of its month in the same transaction, with one INSERT ... SELECT ... ON CONFLICT over the
+affected orders. A report then sums one row per group and month instead of reading orders.
+"""
+import uuid
+from collections.abc import Collection
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, Select, String, cast, delete, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.countries import country_name
+from src.app.database import dialect_insert
+from src.app.models.order import Order, OrderStatus
+from src.app.models.order_item import OrderItem
+from src.app.models.sales_rollup import SalesDimension, SalesRollup
+from src.app.services import customer_service, product_service
+
+
+def _month(dialect_name: str) -> ColumnElement[str]:
+    if dialect_name == "postgresql":
+        return func.to_char(func.timezone("UTC", Order.ordered_at), "YYYY-MM")
+    return func.strftime("%Y-%m", Order.ordered_at)
+
+
+def _sales_rows(dialect_name: str, where: ColumnElement[bool], sign: int) -> Select:
+    """Rollup rows of the order lines matching ``where``, signed, one per dimension, month and key.
+
+    Family, category and country are those stored on the order and its lines when it was placed,
+    so a cancel takes out exactly the keys its creation added, whatever changed since.
+    """
+    lines = (
+        select(
+            _month(dialect_name).label("month"),
+            cast(OrderItem.product_id, String).label("product"),
+            func.coalesce(OrderItem.family, "").label("family"),
+            func.coalesce(OrderItem.category, "").label("category"),
+            cast(Order.customer_id, String).label("customer"),
+            func.coalesce(Order.country_code, "").label("country"),
+            literal("").label("total"),
+            OrderItem.quantity,
+            OrderItem.line_total,
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(where)
+        .cte("lines")
+    )
+    keys = {dimension: lines.c[dimension.value] for dimension in SalesDimension if dimension != SalesDimension.month}
+    keys[SalesDimension.month] = lines.c.total
+    return union_all(
+        *(
+            select(
+                literal(dimension.value).label("dimension"),
+                lines.c.month,
+                key.label("key"),
+                (func.sum(lines.c.quantity) * sign).label("quantity"),
+                (func.sum(lines.c.line_total) * sign).label("revenue"),
+            ).group_by(lines.c.month, key)
+            for dimension, key in keys.items()
+        )
+    ).order_by("dimension", "month", "key")
+
+
+async def record_sales(db: AsyncSession, order_ids: Collection[uuid.UUID], sign: int = 1) -> None:
+    """Add the lines of ``order_ids`` to the rollups, or take them out with ``sign=-1``.
+
+    Call it in the transaction that creates or cancels the orders. Rows are upserted in key
+    order, so concurrent writers touching the same months queue up instead of deadlocking.
+    """
+    rows = _sales_rows(db.bind.dialect.name, OrderItem.order_id.in_(order_ids), sign)
+    stmt = dialect_insert(db, SalesRollup).from_select(["dimension", "month", "key", "quantity", "revenue"], rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SalesRollup.dimension, SalesRollup.month, SalesRollup.key],
+        set_={
+            "quantity": SalesRollup.quantity + stmt.excluded.quantity,
+            "revenue": SalesRollup.revenue + stmt.excluded.revenue,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def rebuild_sales_rollups(db: AsyncSession) -> None:
+    """Recompute every rollup from the orders, e.g. after seeding or a manual data fix."""
+    await db.execute(delete(SalesRollup))
+    rows = _sales_rows(db.bind.dialect.name, Order.status != OrderStatus.cancelled, 1)
+    await db.execute(
+        dialect_insert(db, SalesRollup).from_select(["dimension", "month", "key", "quantity", "revenue"], rows)
+    )
+    await db.commit()
+
+
+async def _labels(db: AsyncSession, dimension: SalesDimension, keys: list[str]) -> dict[str, str | None]:
+    """Display names for the keys of the dimensions keyed by ID or code."""
+    if dimension == SalesDimension.product:
+        products = await product_service.get_products(db, {uuid.UUID(key) for key in keys})
+        return {key: products[uuid.UUID(key)].part_number for key in keys if uuid.UUID(key) in products}
+    if dimension == SalesDimension.customer:
+        customers = await customer_service.get_customers(db, {uuid.UUID(key) for key in keys})
+        return {key: customers[uuid.UUID(key)]["company_name"] for key in keys if uuid.UUID(key) in customers}
+    if dimension == SalesDimension.country:
+        return {key: country_name(key) for key in keys}
+    return {}
+
+
+def _normalize_key(dimension: SalesDimension, key: str) -> str | None:
+    if not key:
+        return None
+    if dimension in (SalesDimension.product, SalesDimension.customer):
+        # SQLite stores UUIDs as 32 hex digits.
+        return str(uuid.UUID(key))
+    return key
+
+
+async def sales_by(
+    db: AsyncSession,
+    dimension: SalesDimension,
+    from_month: str | None = None,
+    to_month: str | None = None,
+    order_by: str = "revenue",
+    limit: int = 100,
+) -> list[dict]:
+    """Quantity and revenue per value of ``dimension`` over the months from ``from_month`` to
+    ``to_month`` (YYYY-MM, both inclusive). Months come in calendar order; other dimensions
+    largest first by ``order_by`` ("revenue" or "quantity")."""
+    quantity = func.sum(SalesRollup.quantity).label("quantity")
+    revenue = func.sum(SalesRollup.revenue).label("revenue")
+    if dimension == SalesDimension.month:
+        query = select(SalesRollup.month.label("key"), quantity, revenue).group_by(SalesRollup.month)
+        query = query.order_by(SalesRollup.month)
+    else:
+        query = select(SalesRollup.key, quantity, revenue).group_by(SalesRollup.key)
+        query = query.order_by((revenue if order_by == "revenue" else quantity).desc(), SalesRollup.key)
+    query = query.where(SalesRollup.dimension == dimension.value).having(quantity != 0)
+    if from_month:
+        query = query.where(SalesRollup.month >= from_month)
+    if to_month:
+        query = query.where(SalesRollup.month <= to_month)
+    rows = [dict(row) for row in (await db.execute(query.limit(limit))).mappings()]
+    labels = await _labels(db, dimension, [row["key"] for row in rows if row["key"]])
+    for row in rows:
+        row["label"] = labels.get(row["key"])
+        row["key"] = _normalize_key(dimension, row["key"])
+        row["revenue"] = Decimal(row["revenue"]).quantize(Decimal("0.01"))
+    return rows
@@ -0,0 +1,97 @@
+"""Runs the sub-requests of ``POST /api/v1/batch`` against the app itself, in process.
+
+Each sub-request goes through the normal routing, validation and dependencies, so it gets its
+own database session. Consecutive reads run concurrently, at most ``concurrency`` at a time so
+a batch cannot take over the connection pool; a write waits for the reads before it and runs
+alone, so results are as if the sub-requests had been sent one after another.
+
+Only the operations in ``BATCH_OPERATIONS`` may run in a batch: single-resource reads, bounded
+lists and single-order writes. Batches themselves, bulk writes, imports and the streaming export
+(which the in-process transport would buffer whole) are refused per sub-request.
+"""
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from httpx import URL, ASGITransport, AsyncClient
+from starlette.routing import Match
+
+from src.app.schemas.batch import BatchSubRequest
+
+# Operation IDs (as in the OpenAPI document and the APIM operations) a sub-request may call.
+BATCH_OPERATIONS = frozenset(
+    {
+        "list_products_api_v1_products_get",
+        "suggest_products_api_v1_products_suggest_get",
+        "get_product_api_v1_products__product_id__get",
+        "list_customers_api_v1_customers_get",
+        "get_customers_by_email_api_v1_customers_by_email_get",
+        "get_customer_api_v1_customers__customer_id__get",
+        "get_customer_summary_api_v1_customers__customer_id__summary_get",
+        "get_account_overview_api_v1_customers__customer_id__overview_get",
+        "list_orders_api_v1_orders_get",
+        "list_order_changes_api_v1_orders_changes_get",
+        "get_order_api_v1_orders__order_id__get",
+        "create_order_api_v1_orders_post",
+        "update_order_api_v1_orders__order_id__put",
+        "cancel_order_api_v1_orders__order_id__delete",
+        "sales_by_api_v1_analytics_sales__dimension__get",
+    }
+)
+
+# Response headers a client may need from a sub-request: its ETag and the next page's cursor.
+FORWARDED_HEADERS = ("etag", "x-next-cursor")
+
+BASE_URL = URL("http://batch")
+
+
+def _refusal(app: FastAPI, sub: BatchSubRequest) -> dict | None:
+    """The error result for a sub-request whose operation may not run in a batch, else None."""
+    # Resolved the way the client and transport will (dot segments, percent-decoding), so the
+    # check sees the path that is actually routed. Paths no route matches get the app's 404/405.
+    path = BASE_URL.join(sub.path).path
+    scope = {"type": "http", "method": sub.method, "path": path, "root_path": ""}
+    for route in app.router.routes:
+        if isinstance(route, APIRoute) and route.matches(scope)[0] == Match.FULL:
+            if route.unique_id in BATCH_OPERATIONS:
+                return None
+            return {"status": 400, "body": {"detail": f"{sub.method} {path} cannot be called in a batch"}}
+    return None
+
+
+async def _send(client: AsyncClient, sub: BatchSubRequest) -> dict:
+    json = sub.body if sub.method in ("POST", "PUT") else None
+    response = await client.request(sub.method, BASE_URL.join(sub.path), json=json, headers=sub.headers)
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+    else:
+        body = response.text or None
+    headers = {name: response.headers[name] for name in FORWARDED_HEADERS if name in response.headers}
+    return {"status": response.status_code, "headers": headers, "body": body}
+
+
+async def run_batch(app: FastAPI, requests: list[BatchSubRequest], concurrency: int) -> list[dict]:
+    results: list[dict | None] = [None] * len(requests)
+    slots = asyncio.Semaphore(concurrency)
+    # Unhandled errors in a sub-request become its 500 instead of failing the whole batch.
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url=BASE_URL) as client:
+
+        async def read(index: int, sub: BatchSubRequest) -> None:
+            async with slots:
+                results[index] = await _send(client, sub)
+
+        reads = []
+        for index, sub in enumerate(requests):
+            refusal = _refusal(app, sub)
+            if refusal is not None:
+                results[index] = refusal
+                continue
+            if sub.method == "GET":
+                reads.append(asyncio.create_task(read(index, sub)))
+                continue
+            await asyncio.gather(*reads)
+            reads = []
+            results[index] = await _send(client, sub)
+        await asyncio.gather(*reads)
+    return results
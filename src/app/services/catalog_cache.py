@@ -0,0 +1,113 @@
+"""In-process cache of product catalog reads.
+
+Entries are bounded in number (least recently used go first) and in age (TTL). Every catalog
+write bumps the stamp in ``catalog_version`` in its own transaction; each process polls that
+stamp at most every ``catalog_cache_version_check_seconds`` and drops its cache when it moved,
+so other workers and replicas serve stale catalog data for at most that long.
+
+Stock levels are not versioned: they change with every order, and bumping the shared stamp
+there would serialize all orders on one row. Order writes evict the affected entries in the
+local process only, so cached ``stock_quantity`` is advisory elsewhere until the TTL expires.
+The stock reservation itself always runs against the database.
+"""
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.config import settings
+from src.app.database import dialect_insert
+from src.app.models.catalog_version import CatalogVersion
+
+
+class CatalogCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, version_check_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self.reset()
+
+    def reset(self) -> None:
+        self._entries.clear()
+        # Changes on every clear; a value read before a clear must not be stored after it.
+        self.generation = 0
+        self.hits = self.misses = self.evictions = 0
+        self._version: int | None = None
+        self._version_checked_at = float("-inf")
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Drop everything if another process changed the catalog since the last check."""
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_seconds:
+            return
+        self._version_checked_at = now
+        version = await db.scalar(select(CatalogVersion.version))
+        if version != self._version:
+            self.clear()
+            self._version = version
+
+    def get(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value, generation: int) -> None:
+        if generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        self.discard([key for key in self._entries if predicate(key)])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "catalog_version": self._version,
+        }
+
+
+catalog_cache = CatalogCache(
+    settings.catalog_cache_max_entries,
+    settings.catalog_cache_ttl_seconds,
+    settings.catalog_cache_version_check_seconds,
+)
+
+
+async def bump_catalog_version(db: AsyncSession) -> int:
+    """Mark the catalog as changed; takes effect for other processes when ``db`` commits.
+
+    Returns the new version stamp.
+    """
+    stmt = dialect_insert(db, CatalogVersion).values(id=1, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CatalogVersion.id], set_={"version": CatalogVersion.version + 1}
+    )
+    return await db.scalar(stmt.returning(CatalogVersion.version))
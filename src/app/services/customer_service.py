@@ -1,29 +1,98 @@
 import uuid
+from collections.abc import Collection, Iterable
 
-from sqlalchemy import select
+from sqlalchemy import Select, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.countries import country_code
+from src.app.etag import RowVersion
 from src.app.models.customer import Customer
-from src.app.schemas.customer import CustomerCreate, CustomerUpdate
+from src.app.pagination import decode_cursor, encode_cursor, keyset_after
+from src.app.projection import fetch_dicts, pick_columns, schema_columns
+from src.app.schemas.customer import CustomerCreate, CustomerResponse, CustomerUpdate
 
 
-async def list_customers(
-    db: AsyncSession,
+def _page_customers(
+    query: Select,
     search: str | None = None,
     country: str | None = None,
     skip: int = 0,
     limit: int = 100,
-) -> list[Customer]:
-    query = select(Customer)
+    cursor: str | None = None,
+) -> Select:
     if search:
         query = query.where(
             Customer.company_name.ilike(f"%{search}%") | Customer.contact_name.ilike(f"%{search}%")
         )
     if country:
-        query = query.where(Customer.country.ilike(f"%{country}%"))
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+        # Names, aliases and ISO codes all resolve to the indexed code; anything else can
+        # only match the stored name exactly (ignoring case), through the lower(country) index.
+        code = country_code(country)
+        if code:
+            query = query.where(Customer.country_code == code)
+        else:
+            query = query.where(func.lower(Customer.country) == country.lower())
+    if cursor:
+        after = decode_cursor(cursor, (str, uuid.UUID))
+        query = query.where(keyset_after((Customer.company_name, Customer.id), after))
+    return query.order_by(Customer.company_name, Customer.id).offset(skip).limit(limit)
+
+
+CUSTOMER_COLUMNS = schema_columns(Customer, CustomerResponse)
+
+
+CUSTOMER_KEYS = ("id", "company_name", "updated_at")
+
+
+async def list_customers(db: AsyncSession, fields: Collection[str] | None = None, **filters) -> list[dict]:
+    """A page of customers as plain dicts, limited to ``fields`` when given; ``filters`` as for
+    ``_page_customers``."""
+    columns = pick_columns(CUSTOMER_COLUMNS, fields, CUSTOMER_KEYS)
+    return await fetch_dicts(db, _page_customers(select(*columns), **filters))
+
+
+async def get_customers(db: AsyncSession, customer_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, dict]:
+    """Customers by ID as plain dicts, read with one query."""
+    query = select(*CUSTOMER_COLUMNS).where(Customer.id.in_(set(customer_ids)))
+    return {customer["id"]: customer for customer in await fetch_dicts(db, query)}
+
+
+async def get_customers_by_email(db: AsyncSession, email: str) -> list[Customer]:
+    """Customers with this contact email, ignoring case; oldest first."""
+    query = (
+        select(Customer)
+        .where(func.lower(Customer.contact_email) == email.strip().lower())
+        .order_by(Customer.created_at, Customer.id)
+    )
+    return list(await db.scalars(query))
+
+
+async def list_customer_versions(db: AsyncSession, **filters) -> list[RowVersion]:
+    result = await db.execute(_page_customers(select(Customer.id, Customer.updated_at), **filters))
+    return [tuple(row) for row in result]
+
+
+def customer_cursor(customer: dict) -> str:
+    return encode_cursor((customer["company_name"], customer["id"]))
+
+
+def with_country_code(values: dict) -> dict:
+    """``values`` plus the ISO code matching its ``country``, if it sets one."""
+    if "country" not in values:
+        return values
+    return {**values, "country_code": country_code(values["country"])}
+
+
+async def _update_returning(db: AsyncSession, customer_id: uuid.UUID, values: dict) -> Customer | None:
+    stmt = update(Customer).where(Customer.id == customer_id).values(**values).returning(Customer)
+    customer = (await db.scalars(stmt)).one_or_none()
+    await db.commit()
+    return customer
+
+
+async def get_customer_version(db: AsyncSession, customer_id: uuid.UUID) -> RowVersion | None:
+    row = (await db.execute(select(Customer.id, Customer.updated_at).where(Customer.id == customer_id))).first()
+    return tuple(row) if row else None
 
 
 async def get_customer(db: AsyncSession, customer_id: uuid.UUID) -> Customer | None:
@@ -31,19 +100,14 @@ async def get_customer(db: AsyncSession, customer_id: uuid.UUID) -> Customer | N
 
 
 async def create_customer(db: AsyncSession, data: CustomerCreate) -> Customer:
-    customer = Customer(**data.model_dump())
+    customer = Customer(**with_country_code(data.model_dump()))
     db.add(customer)
     await db.commit()
-    await db.refresh(customer)
     return customer
 
 
 async def update_customer(db: AsyncSession, customer_id: uuid.UUID, data: CustomerUpdate) -> Customer | None:
-    customer = await db.get(Customer, customer_id)
-    if not customer:
-        return None
-    for key, value in data.model_dump(exclude_unset=True).items():
-        setattr(customer, key, value)
-    await db.commit()
-    await db.refresh(customer)
-    return customer
+    values = data.model_dump(exclude_unset=True)
+    if not values:
+        return await get_customer(db, customer_id)
+    return await _update_returning(db, customer_id, with_country_code(values))
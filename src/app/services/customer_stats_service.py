@@ -0,0 +1,168 @@
+"""Per-customer order totals, maintained by the order service in its write transactions.
+
+New orders are added with one upsert per batch; moves to a terminal status are one UPDATE per
+batch, executed once per affected customer. The summary read is then a primary-key lookup
+however many orders the customer has.
+"""
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import bindparam, case, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.database import dialect_insert
+from src.app.models.customer import Customer
+from src.app.models.customer_stats import CustomerStats
+from src.app.models.order import ORDER_STATUS_TRANSITIONS, Order, OrderStatus
+
+# Orders that can still move on. Every status an order can move from is open, so a move into
+# a terminal status closes one open order and any other move leaves the count unchanged.
+OPEN_STATUSES = frozenset(status for status, allowed in ORDER_STATUS_TRANSITIONS.items() if allowed)
+
+
+async def record_orders(db: AsyncSession, orders: Iterable[Order]) -> None:
+    """Count newly created (so open) orders towards their customers' totals."""
+    rows: dict[uuid.UUID, dict] = {}
+    for order in orders:
+        row = rows.setdefault(
+            order.customer_id,
+            {
+                "customer_id": order.customer_id,
+                "order_count": 0,
+                "open_order_count": 0,
+                "lifetime_value": Decimal("0.00"),
+                "ytd_year": order.ordered_at.year,
+                "ytd_value": Decimal("0.00"),
+                "last_ordered_at": order.ordered_at,
+            },
+        )
+        row["order_count"] += 1
+        row["open_order_count"] += 1
+        row["lifetime_value"] += order.total_amount
+        row["ytd_value"] += order.total_amount
+        row["last_ordered_at"] = max(row["last_ordered_at"], order.ordered_at)
+    if not rows:
+        return
+
+    stmt = dialect_insert(db, CustomerStats).values(sorted(rows.values(), key=lambda row: row["customer_id"]))
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CustomerStats.customer_id],
+        set_={
+            "order_count": CustomerStats.order_count + new.order_count,
+            "open_order_count": CustomerStats.open_order_count + new.open_order_count,
+            "lifetime_value": CustomerStats.lifetime_value + new.lifetime_value,
+            # New orders are from the current year, so an older stored year starts over.
+            "ytd_value": case(
+                (CustomerStats.ytd_year == new.ytd_year, CustomerStats.ytd_value + new.ytd_value),
+                else_=new.ytd_value,
+            ),
+            "ytd_year": new.ytd_year,
+            "last_ordered_at": case(
+                (CustomerStats.last_ordered_at > new.last_ordered_at, CustomerStats.last_ordered_at),
+                else_=new.last_ordered_at,
+            ),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def record_status_changes(db: AsyncSession, status: OrderStatus, orders: Iterable[Order]) -> None:
+    """Account for ``orders`` having just moved to ``status``, with one statement for all of them.
+
+    ``orders`` need ``customer_id``, ``total_amount`` and ``ordered_at``.
+    """
+    if status in OPEN_STATUSES:
+        return
+    cancelled = status == OrderStatus.cancelled
+    # One parameter set per customer and order year, since only the stored year's value changes.
+    changes: dict[tuple, dict] = {}
+    for order in orders:
+        key = (order.customer_id, order.ordered_at.year)
+        change = changes.setdefault(
+            key,
+            {"b_customer_id": key[0], "b_year": key[1], "b_closed": 0, "b_cancelled": 0, "b_value": Decimal("0.00")},
+        )
+        change["b_closed"] += 1
+        if cancelled:
+            change["b_cancelled"] += 1
+            change["b_value"] += order.total_amount
+    if not changes:
+        return
+
+    stats = CustomerStats.__table__
+    value = bindparam("b_value", type_=stats.c.lifetime_value.type)
+    stmt = (
+        update(stats)
+        .where(stats.c.customer_id == bindparam("b_customer_id"))
+        .values(
+            open_order_count=stats.c.open_order_count - bindparam("b_closed"),
+            order_count=stats.c.order_count - bindparam("b_cancelled"),
+            lifetime_value=stats.c.lifetime_value - value,
+            ytd_value=stats.c.ytd_value - case((stats.c.ytd_year == bindparam("b_year"), value), else_=0),
+        )
+    )
+    await db.execute(stmt, sorted(changes.values(), key=lambda change: (change["b_customer_id"], change["b_year"])))
+
+
+async def rebuild_customer_stats(db: AsyncSession) -> None:
+    """Recompute every customer's totals from the orders, e.g. after seeding or a manual data fix."""
+    now = datetime.now(timezone.utc)
+    year_start = datetime(now.year, 1, 1, tzinfo=timezone.utc)
+    placed = Order.status != OrderStatus.cancelled
+    value = case((placed, Order.total_amount), else_=0)
+    rows = select(
+        Order.customer_id,
+        func.count().filter(placed),
+        func.count().filter(Order.status.in_(OPEN_STATUSES)),
+        func.sum(value),
+        literal(now.year),
+        func.coalesce(func.sum(value).filter(Order.ordered_at >= year_start), 0),
+        func.max(Order.ordered_at),
+    ).group_by(Order.customer_id)
+    columns = [
+        "customer_id",
+        "order_count",
+        "open_order_count",
+        "lifetime_value",
+        "ytd_year",
+        "ytd_value",
+        "last_ordered_at",
+    ]
+    await db.execute(delete(CustomerStats))
+    await db.execute(insert(CustomerStats).from_select(columns, rows))
+    await db.commit()
+
+
+async def get_customer_summary(db: AsyncSession, customer_id: uuid.UUID) -> dict | None:
+    """The customer's order totals (zero when they have none), or None if the customer does not exist."""
+    query = (
+        select(Customer.id.label("customer_id"), Customer.company_name, CustomerStats)
+        .outerjoin(CustomerStats, CustomerStats.customer_id == Customer.id)
+        .where(Customer.id == customer_id)
+    )
+    row = (await db.execute(query)).first()
+    if row is None:
+        return None
+    stats = row.CustomerStats
+    summary = {"customer_id": row.customer_id, "company_name": row.company_name}
+    if stats is None:
+        return {
+            **summary,
+            "order_count": 0,
+            "open_order_count": 0,
+            "lifetime_value": Decimal("0.00"),
+            "ytd_value": Decimal("0.00"),
+            "last_ordered_at": None,
+        }
+    current_year = stats.ytd_year == datetime.now(timezone.utc).year
+    return {
+        **summary,
+        "order_count": stats.order_count,
+        "open_order_count": stats.open_order_count,
+        "lifetime_value": stats.lifetime_value,
+        "ytd_value": stats.ytd_value if current_year else Decimal("0.00"),
+        "last_ordered_at": stats.last_ordered_at,
+    }
@@ -0,0 +1,121 @@
+"""Streamed export of orders with their items as NDJSON or CSV.
+
+Orders and items are read as plain rows of one joined query through a server-side cursor and
+grouped per order on the fly, so memory stays flat however many orders match.
+"""
+import csv
+import enum
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.models.order import Order, OrderStatus
+from src.app.models.order_item import OrderItem
+from src.app.services.order_service import filter_orders
+
+YIELD_PER = 1000
+FLUSH_BYTES = 64 * 1024
+
+ORDER_COLUMNS = [
+    Order.id,
+    Order.order_number,
+    Order.customer_id,
+    Order.status,
+    Order.total_amount,
+    Order.currency,
+    Order.shipping_address,
+    Order.notes,
+    Order.ordered_at,
+    Order.shipped_at,
+    Order.delivered_at,
+    Order.created_at,
+    Order.updated_at,
+]
+ITEM_COLUMNS = [
+    OrderItem.id.label("item_id"),
+    OrderItem.product_id,
+    OrderItem.quantity,
+    OrderItem.unit_price,
+    OrderItem.line_total,
+]
+CSV_HEADER = ["order_id", *(c.key for c in ORDER_COLUMNS[1:]), *(c.key for c in ITEM_COLUMNS)]
+
+
+async def _orders(
+    session_factory: async_sessionmaker[AsyncSession],
+    status: OrderStatus | None = None,
+    customer_id: uuid.UUID | None = None,
+    ordered_from: datetime | None = None,
+    ordered_to: datetime | None = None,
+) -> AsyncIterator[tuple[dict, list[dict]]]:
+    query = select(*ORDER_COLUMNS, *ITEM_COLUMNS).outerjoin(OrderItem, OrderItem.order_id == Order.id)
+    query = filter_orders(query, status, customer_id, ordered_from, ordered_to).order_by(Order.ordered_at, Order.id)
+    order_keys = [c.key for c in ORDER_COLUMNS]
+    item_keys = [c.key for c in ITEM_COLUMNS]
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=YIELD_PER))
+        order, items = None, []
+        async for row in result:
+            values = row._tuple()
+            if order is None or order["id"] != values[0]:
+                if order is not None:
+                    yield order, items
+                order, items = dict(zip(order_keys, values)), []
+            item = dict(zip(item_keys, values[len(order_keys):]))
+            if item["item_id"] is not None:
+                items.append(item)
+        if order is not None:
+            yield order, items
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+async def _buffered(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    async for line in lines:
+        buffer.write(line)
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer = io.StringIO()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def _ndjson_lines(orders: AsyncIterator[tuple[dict, list[dict]]]) -> AsyncIterator[str]:
+    async for order, items in orders:
+        order["items"] = [{"id": item.pop("item_id"), **item} for item in items]
+        yield json.dumps(order, default=_json_default, separators=(",", ":")) + "\n"
+
+
+async def _csv_lines(orders: AsyncIterator[tuple[dict, list[dict]]]) -> AsyncIterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+
+    def render(row) -> str:
+        out.seek(0)
+        out.truncate()
+        writer.writerow(["" if v is None else _json_default(v) for v in row])
+        return out.getvalue()
+
+    yield render(CSV_HEADER)
+    async for order, items in orders:
+        order_values = list(order.values())
+        for item in items or [dict.fromkeys(CSV_HEADER[len(order_values):])]:
+            yield render(order_values + list(item.values()))
+
+
+def export_orders(session_factory: async_sessionmaker[AsyncSession], fmt: str, **filters) -> AsyncIterator[str]:
+    """Stream every order matching ``filters`` (see ``filter_orders``), oldest first."""
+    orders = _orders(session_factory, **filters)
+    return _buffered(_csv_lines(orders) if fmt == "csv" else _ndjson_lines(orders))
@@ -0,0 +1,211 @@
+"""Streaming CSV / NDJSON upserts for the product catalog and customer master.
+
+Records are parsed incrementally from any async byte stream (an HTTP request body or a file)
+and written in fixed-size chunks, so memory stays bounded by the chunk size whatever the input
+size. Each chunk costs one lookup of existing keys, one executemany UPDATE and one bulk insert:
+COPY on PostgreSQL, a multi-row INSERT elsewhere.
+"""
+import codecs
+import csv
+import json
+import uuid
+from collections.abc import AsyncIterator, Callable
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.models.customer import Customer
+from src.app.models.product import Product
+from src.app.schemas.bulk_import import ImportResult, ImportRowError
+from src.app.schemas.customer import CustomerCreate
+from src.app.schemas.product import ProductCreate
+from src.app.services import customer_service
+from src.app.services.catalog_cache import bump_catalog_version, catalog_cache
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+Record = tuple[int, dict | None, str | None]
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    header = None
+    pending = None
+    line_no = start = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if pending is None:
+            start, record = line_no, line
+        else:
+            record = f"{pending}\n{line}"
+        # An odd number of quotes means a quoted field continues on the next line.
+        if record.count('"') % 2:
+            pending = record
+            continue
+        pending = None
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield start, None, f"Expected {len(header)} fields, got {len(values)}"
+        else:
+            yield start, {k: v for k, v in zip(header, values) if v != ""}, None
+    if pending is not None:
+        yield start, None, "Unterminated quoted field"
+
+
+async def _ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(record, dict):
+            yield line_no, record, None
+        else:
+            yield line_no, None, "Expected a JSON object"
+
+
+def format_for_content_type(content_type: str | None) -> str | None:
+    return CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+
+
+def parse_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Record]:
+    """Yield ``(line, record, error)`` for each CSV row or NDJSON line in ``chunks``."""
+    if fmt == "csv":
+        return _csv_records(chunks)
+    if fmt == "ndjson":
+        return _ndjson_records(chunks)
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+async def _copy_rows(db: AsyncSession, table, rows: list[dict]) -> None:
+    columns = list(rows[0])
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name, records=[tuple(row[c] for c in columns) for row in rows], columns=columns
+    )
+
+
+def _group_by_columns(rows: list[dict]) -> list[list[dict]]:
+    # Rows are partial when a CSV leaves optional cells empty; each column set is one executemany.
+    groups: dict[frozenset, list[dict]] = {}
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+    return list(groups.values())
+
+
+async def _write_chunk(db: AsyncSession, model, key: Callable, chunk: dict[str, dict], result: ImportResult) -> None:
+    query = select(key(model), model.id).where(key(model).in_(chunk))
+    existing = {k: id_ for k, id_ in (await db.execute(query)).all()}
+
+    updates = [{"id": existing[k], **row} for k, row in chunk.items() if k in existing]
+    inserts = [{"id": uuid.uuid4(), **row} for k, row in chunk.items() if k not in existing]
+    for rows in _group_by_columns(updates):
+        await db.execute(update(model), rows)
+    for rows in _group_by_columns(inserts):
+        if db.bind.dialect.name == "postgresql":
+            await _copy_rows(db, model.__table__, rows)
+        else:
+            await db.execute(insert(model), rows)
+    result.updated += len(updates)
+    result.inserted += len(inserts)
+
+
+async def _import(
+    db: AsyncSession,
+    records: AsyncIterator[Record],
+    schema: type[BaseModel],
+    model,
+    key: Callable,
+    row_key: Callable[[dict], str],
+    chunk_size: int,
+    prepare: Callable[[dict], dict] | None = None,
+) -> ImportResult:
+    result = ImportResult()
+
+    def reject(line: int, error: str) -> None:
+        result.rejected += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(ImportRowError(line=line, error=error))
+
+    chunk: dict[str, dict] = {}
+    async for line, record, error in records:
+        if error:
+            reject(line, error)
+            continue
+        try:
+            row = schema.model_validate(record).model_dump(exclude_unset=True)
+        except ValidationError as e:
+            reject(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            continue
+        if prepare:
+            row = prepare(row)
+        k = row_key(row)
+        if k in chunk:
+            # A later row for the same key replaces the earlier one.
+            result.updated += 1
+        chunk[k] = row
+        if len(chunk) >= chunk_size:
+            await _write_chunk(db, model, key, chunk, result)
+            chunk = {}
+    if chunk:
+        await _write_chunk(db, model, key, chunk, result)
+    await db.commit()
+    return result
+
+
+async def import_products(
+    db: AsyncSession, records: AsyncIterator[Record], chunk_size: int = CHUNK_SIZE
+) -> ImportResult:
+    """Upsert products on ``part_number``."""
+    await bump_catalog_version(db)
+    result = await _import(
+        db, records, ProductCreate, Product, lambda m: m.part_number, lambda row: row["part_number"], chunk_size
+    )
+    catalog_cache.clear()
+    return result
+
+
+async def import_customers(
+    db: AsyncSession, records: AsyncIterator[Record], chunk_size: int = CHUNK_SIZE
+) -> ImportResult:
+    """Upsert customers on their contact email, compared case-insensitively."""
+    return await _import(
+        db,
+        records,
+        CustomerCreate,
+        Customer,
+        lambda m: func.lower(m.contact_email),
+        lambda row: row["contact_email"].lower(),
+        chunk_size,
+        prepare=customer_service.with_country_code,
+    )
@@ -0,0 +1,83 @@
+"""The order change log behind GET /api/v1/orders/changes.
+
+Every order write appends one ``order_changes`` row per order it touched, in its own
+transaction, so the log commits exactly when the change does. A reader keeps the position of
+the last row it saw and asks for the rows after it, which costs an index range scan over the
+new changes however many orders there are.
+
+Log IDs are handed out when a row is inserted, not when it commits, so on PostgreSQL a reader
+cannot just follow ``id``: a transaction that started earlier may still commit a lower one.
+Rows carry their transaction ID instead and are read in ``(txid, id)`` order, but only for
+transactions older than every one still running (the xmin of the reader's snapshot). Those
+are all finished, so nothing can later appear before the returned position. A long-running
+write transaction delays the feed until it ends; it never loses changes. SQLite has a single
+writer at a time, so there ``txid`` is 0 and ``id`` order is commit order.
+"""
+import uuid
+from collections.abc import Collection
+
+from sqlalchemy import BigInteger, ColumnElement, Text, cast, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.models.order import Order
+from src.app.models.order_change import OrderChange
+from src.app.pagination import decode_cursor, encode_cursor, keyset_after
+
+
+def _xid8(value: ColumnElement) -> ColumnElement[int]:
+    # xid8 has no direct cast to bigint; its text form is the decimal number.
+    return cast(cast(value, Text), BigInteger)
+
+
+def _current_txid(db: AsyncSession) -> ColumnElement[int]:
+    if db.bind.dialect.name == "postgresql":
+        return _xid8(func.pg_current_xact_id())
+    return literal(0)
+
+
+def _finished_before(db: AsyncSession) -> ColumnElement[bool] | None:
+    """Rows of transactions that have all ended, as of the reading statement's snapshot."""
+    if db.bind.dialect.name == "postgresql":
+        return OrderChange.txid < _xid8(func.pg_snapshot_xmin(func.pg_current_snapshot()))
+    return None
+
+
+async def record_changes(db: AsyncSession, order_ids: Collection[uuid.UUID]) -> None:
+    """Log that ``order_ids`` were created or updated by the current transaction."""
+    if not order_ids:
+        return
+    stmt = insert(OrderChange.__table__).values(txid=_current_txid(db))
+    await db.execute(stmt, [{"order_id": order_id} for order_id in order_ids])
+
+
+async def record_all_orders(db: AsyncSession) -> None:
+    """Log every existing order, oldest update first, e.g. after seeding, so a feed read from
+    the start returns them all."""
+    rows = select(Order.id, _current_txid(db)).order_by(Order.updated_at, Order.id)
+    await db.execute(insert(OrderChange).from_select(["order_id", "txid"], rows))
+    await db.commit()
+
+
+async def changes_after(
+    db: AsyncSession, since: str | None, limit: int
+) -> tuple[list[uuid.UUID], str, bool]:
+    """Orders changed after the position ``since`` (None for the start of the log).
+
+    Reads at most ``limit`` log rows and returns the distinct orders among them, ordered by
+    their last change, the position after the last row read, and whether more rows follow.
+    Raises InvalidCursorError for a malformed ``since``.
+    """
+    key = (OrderChange.txid, OrderChange.id)
+    position = decode_cursor(since, (int, int)) if since else [0, 0]
+    query = select(*key, OrderChange.order_id).where(keyset_after(key, position)).order_by(*key).limit(limit + 1)
+    finished = _finished_before(db)
+    if finished is not None:
+        query = query.where(finished)
+    rows = (await db.execute(query)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = [rows[-1].txid, rows[-1].id]
+    # Later changes of an order move it back, so the order comes once, where it last changed.
+    order_ids = list(reversed(dict.fromkeys(row.order_id for row in reversed(rows))))
+    return order_ids, encode_cursor(position), has_more
@@ -1,41 +1,229 @@
 import uuid
+from collections import defaultdict
+from collections.abc import Collection, Iterable, Mapping
 from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Literal
 
-from sqlalchemy import select, func
+from sqlalchemy import ColumnElement, Select, bindparam, case, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from src.app.models.order import Order, OrderStatus
+from src.app.database import dialect_insert
+from src.app.etag import RowVersion
+from src.app.models.customer import Customer
+from src.app.models.order import ORDER_STATUS_TRANSITIONS, Order, OrderStatus
 from src.app.models.order_item import OrderItem
+from src.app.models.order_number_counter import OrderNumberCounter
 from src.app.models.product import Product
-from src.app.schemas.order import OrderCreate, OrderUpdate
+from src.app.pagination import InvalidCursorError, decode_cursor, encode_cursor, keyset_after
+from src.app.projection import InvalidFieldsError, attach_children, fetch_dicts, pick_columns, schema_columns
+from src.app.schemas.order import OrderCreate, OrderItemCreate, OrderItemResponse, OrderResponse, OrderUpdate
+from src.app.schemas.product import ProductResponse
+from src.app.services import (
+    analytics_service,
+    customer_service,
+    customer_stats_service,
+    order_change_service,
+    product_service,
+)
 
 
-async def _generate_order_number(db: AsyncSession) -> str:
-    now = datetime.now(timezone.utc)
-    prefix = f"ST-ORD-{now.strftime('%Y%m')}-"
-    result = await db.execute(
-        select(func.count()).where(Order.order_number.like(f"{prefix}%"))
-    )
-    count = result.scalar_one() + 1
-    return f"{prefix}{count:04d}"
+async def allocate_order_numbers(db: AsyncSession, count: int = 1, period: str | None = None) -> list[str]:
+    """Reserve ``count`` consecutive order numbers for ``period`` (YYYYMM, default: current month).
 
+    A single upsert on the per-month counter row; concurrent callers serialize on that row
+    instead of racing a COUNT(*) against the unique constraint.
+    """
+    period = period or datetime.now(timezone.utc).strftime("%Y%m")
+    stmt = dialect_insert(db, OrderNumberCounter).values(period=period, last_value=count)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OrderNumberCounter.period],
+        set_={"last_value": OrderNumberCounter.last_value + count},
+    ).returning(OrderNumberCounter.last_value)
+    last_value = (await db.execute(stmt)).scalar_one()
+    return [f"ST-ORD-{period}-{n:04d}" for n in range(last_value - count + 1, last_value + 1)]
 
-async def list_orders(
-    db: AsyncSession,
+
+def order_number_prefix(prefix: str) -> ColumnElement[bool]:
+    """Order numbers starting with ``prefix``, in any case, as a LIKE the planner can run as an
+    index range: order numbers are upper case, and the pattern is inlined into the statement, as
+    neither database derives a range from a bound pattern."""
+    escaped = prefix.upper().replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return Order.order_number.like(bindparam(None, f"{escaped}%", literal_execute=True), escape="/")
+
+
+def filter_orders(
+    query: Select,
     status: OrderStatus | None = None,
     customer_id: uuid.UUID | None = None,
-    skip: int = 0,
-    limit: int = 100,
-) -> list[Order]:
-    query = select(Order).options(selectinload(Order.items))
+    ordered_from: datetime | None = None,
+    ordered_to: datetime | None = None,
+    min_total: Decimal | None = None,
+    max_total: Decimal | None = None,
+    order_number: str | None = None,
+    shipped_from: datetime | None = None,
+    shipped_to: datetime | None = None,
+    delivered_from: datetime | None = None,
+    delivered_to: datetime | None = None,
+) -> Select:
+    """``query`` narrowed to the matching orders. Date ranges include their start and exclude
+    their end, amount ranges include both bounds, and ``order_number`` matches a prefix."""
     if status:
         query = query.where(Order.status == status)
     if customer_id:
         query = query.where(Order.customer_id == customer_id)
-    query = query.order_by(Order.ordered_at.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    if ordered_from:
+        query = query.where(Order.ordered_at >= ordered_from)
+    if ordered_to:
+        query = query.where(Order.ordered_at < ordered_to)
+    if min_total is not None:
+        query = query.where(Order.total_amount >= min_total)
+    if max_total is not None:
+        query = query.where(Order.total_amount <= max_total)
+    if order_number:
+        query = query.where(order_number_prefix(order_number))
+    if shipped_from:
+        query = query.where(Order.shipped_at >= shipped_from)
+    if shipped_to:
+        query = query.where(Order.shipped_at < shipped_to)
+    if delivered_from:
+        query = query.where(Order.delivered_at >= delivered_from)
+    if delivered_to:
+        query = query.where(Order.delivered_at < delivered_to)
+    return query
+
+
+OrderSort = Literal["-ordered_at", "ordered_at", "-total_amount", "total_amount", "-order_number", "order_number"]
+DEFAULT_ORDER_SORT: OrderSort = "-ordered_at"
+
+# Keyset of each sort (the unique id breaks ties) and the types of its cursor values.
+ORDER_SORT_KEYS = {
+    "ordered_at": ((Order.ordered_at, Order.id), (datetime, uuid.UUID)),
+    "total_amount": ((Order.total_amount, Order.id), (Decimal, uuid.UUID)),
+    "order_number": ((Order.order_number,), (str,)),
+}
+
+
+def _page_orders(
+    query: Select,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    sort: OrderSort = DEFAULT_ORDER_SORT,
+    **filters,
+) -> Select:
+    """A page of ``query`` in ``sort`` order (a column name, prefixed with "-" for descending);
+    ``filters`` as for ``filter_orders``."""
+    query = filter_orders(query, **filters)
+    descending = sort.startswith("-")
+    sort_key, cursor_types = ORDER_SORT_KEYS[sort.lstrip("-")]
+    if cursor:
+        cursor_sort, *after = decode_cursor(cursor, (str, *cursor_types))
+        if cursor_sort != sort:
+            raise InvalidCursorError("Cursor belongs to a different sort")
+        query = query.where(keyset_after(sort_key, after, descending=descending))
+    order_by = [column.desc() for column in sort_key] if descending else sort_key
+    return query.order_by(*order_by).offset(skip).limit(limit)
+
+
+ORDER_COLUMNS = schema_columns(Order, OrderResponse)
+ITEM_COLUMNS = schema_columns(OrderItem, OrderItemResponse)
+
+
+# Always read, for the page cursor (whichever the sort) and the ETag.
+ORDER_KEYS = ("id", "ordered_at", "total_amount", "order_number", "updated_at")
+
+
+EXPANSIONS = ("items.product", "customer")
+
+
+def parse_expand(expand: str | None) -> set[str]:
+    """The related entities named by a comma-separated ``expand`` parameter."""
+    names = {name.strip() for name in (expand or "").split(",") if name.strip()}
+    unknown = names.difference(EXPANSIONS)
+    if unknown:
+        raise InvalidFieldsError(f"Unknown expansions: {', '.join(sorted(unknown))}")
+    return names
+
+
+async def _load_orders(
+    db: AsyncSession, query: Select, fields: Collection[str] | None, expand: Collection[str]
+) -> list[dict]:
+    if fields is not None and "customer" in expand:
+        fields = {*fields, "customer_id"}
+    orders = await fetch_dicts(db, query.with_only_columns(*pick_columns(ORDER_COLUMNS, fields, ORDER_KEYS)))
+    if fields is None or "items" in fields or "items.product" in expand:
+        await attach_children(db, orders, "items", ITEM_COLUMNS, OrderItem.order_id)
+    if "items.product" in expand:
+        # One lookup for the distinct products of the whole page, mostly served by the catalog cache.
+        items = [item for order in orders for item in order["items"]]
+        products = await product_service.get_products(db, {item["product_id"] for item in items})
+        product_dicts = {product_id: product.model_dump() for product_id, product in products.items()}
+        for item in items:
+            item["product"] = product_dicts.get(item["product_id"])
+    if "customer" in expand:
+        customers = await customer_service.get_customers(db, {order["customer_id"] for order in orders})
+        for order in orders:
+            order["customer"] = customers.get(order["customer_id"])
+    return orders
+
+
+async def list_orders(
+    db: AsyncSession, fields: Collection[str] | None = None, expand: Collection[str] = (), **filters
+) -> list[dict]:
+    """A page of orders as plain dicts; ``filters`` as for ``_page_orders``.
+
+    ``fields`` limits the columns read; items are only queried when it is None or names them,
+    or when ``expand`` embeds their products. Each expansion costs one batched query per page.
+    """
+    return await _load_orders(db, _page_orders(select(Order.id), **filters), fields, expand)
+
+
+async def list_order_changes(db: AsyncSession, since: str | None, limit: int) -> tuple[list[dict], str, bool]:
+    """Orders (with items) created or updated after the change-feed position ``since``, the
+    position to continue from, and whether more changes follow; see ``order_change_service``."""
+    order_ids, next_since, has_more = await order_change_service.changes_after(db, since, limit)
+    if not order_ids:
+        return [], next_since, has_more
+    loaded = await _load_orders(db, select(Order.id).where(Order.id.in_(order_ids)), None, ())
+    orders = {order["id"]: order for order in loaded}
+    return [orders[order_id] for order_id in order_ids], next_since, has_more
+
+
+async def get_order_expanded(db: AsyncSession, order_id: uuid.UUID, expand: Collection[str]) -> dict | None:
+    orders = await _load_orders(db, select(Order.id).where(Order.id == order_id), None, expand)
+    return orders[0] if orders else None
+
+
+def expanded_versions(orders: list[dict]) -> list[RowVersion]:
+    """Row versions of the orders and of every entity embedded in them, for the ETag."""
+    versions = []
+    for order in orders:
+        versions.append((order["id"], order["updated_at"]))
+        if order.get("customer"):
+            versions.append((order["customer"]["id"], order["customer"]["updated_at"]))
+        for item in order.get("items", ()):
+            if item.get("product"):
+                versions.append((item["product"]["id"], item["product"]["updated_at"]))
+    return versions
+
+
+async def list_order_versions(db: AsyncSession, **filters) -> list[RowVersion]:
+    """``(id, updated_at)`` of the orders ``list_orders`` would return, for its ETag."""
+    result = await db.execute(_page_orders(select(Order.id, Order.updated_at), **filters))
+    return [tuple(row) for row in result]
+
+
+def order_cursor(order: dict, sort: OrderSort = DEFAULT_ORDER_SORT) -> str:
+    sort_key, _ = ORDER_SORT_KEYS[sort.lstrip("-")]
+    return encode_cursor((sort, *(order[column.key] for column in sort_key)))
+
+
+async def get_order_version(db: AsyncSession, order_id: uuid.UUID) -> RowVersion | None:
+    row = (await db.execute(select(Order.id, Order.updated_at).where(Order.id == order_id))).first()
+    return tuple(row) if row else None
 
 
 async def get_order(db: AsyncSession, order_id: uuid.UUID) -> Order | None:
@@ -44,63 +232,319 @@ async def get_order(db: AsyncSession, order_id: uuid.UUID) -> Order | None:
     return result.scalar_one_or_none()
 
 
+def _merge_line_items(items: list[OrderItemCreate]) -> dict[uuid.UUID, int]:
+    """Collapse repeated product IDs into a single line each, summing their quantities."""
+    quantities: dict[uuid.UUID, int] = {}
+    for item in items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    return quantities
+
+
+CatalogProducts = Mapping[uuid.UUID, Product | ProductResponse]
+
+
+def _unavailable_products(product_ids: Iterable[uuid.UUID], products: CatalogProducts) -> str | None:
+    missing = [str(pid) for pid in product_ids if pid not in products]
+    inactive = [str(pid) for pid in product_ids if pid in products and not products[pid].is_active]
+    problems = []
+    if missing:
+        problems.append(f"Products not found: {', '.join(missing)}")
+    if inactive:
+        problems.append(f"Products inactive: {', '.join(inactive)}")
+    return "; ".join(problems) or None
+
+
+def _locked_products(product_ids) -> Select:
+    # Lock the affected rows in primary-key order so concurrent orders over the same hot parts
+    # queue up behind each other instead of deadlocking.
+    return select(Product.id).where(Product.id.in_(product_ids)).order_by(Product.id).with_for_update()
+
+
+async def _reserve_stock(db: AsyncSession, quantities: dict[uuid.UUID, int]) -> None:
+    """Take stock for every line in one conditional UPDATE, or none of it."""
+    if not quantities:
+        return
+    quantity = case(quantities, value=Product.id)
+    stmt = (
+        update(Product)
+        .where(Product.id.in_(_locked_products(quantities)), Product.stock_quantity >= quantity)
+        .values(stock_quantity=Product.stock_quantity - quantity)
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    reserved = set((await db.execute(stmt)).scalars())
+    if len(reserved) != len(quantities):
+        await db.rollback()
+        short = ", ".join(str(pid) for pid in quantities if pid not in reserved)
+        raise ValueError(f"Insufficient stock for products: {short}")
+
+
+async def _release_stock(db: AsyncSession, order_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+    """Return the stock reserved by ``order_ids`` in one UPDATE; the IDs of the products restocked."""
+    reserved = OrderItem.order_id.in_(select(Order.id).where(Order.id.in_(order_ids), Order.stock_reserved))
+    ordered_product_ids = select(OrderItem.product_id).where(reserved)
+    returned = (
+        select(func.sum(OrderItem.quantity)).where(reserved, OrderItem.product_id == Product.id).scalar_subquery()
+    )
+    stmt = (
+        update(Product)
+        .where(Product.id.in_(_locked_products(ordered_product_ids)))
+        .values(stock_quantity=Product.stock_quantity + returned)
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list((await db.execute(stmt)).scalars())
+
+
+CENTS = Decimal("0.01")
+
+
+def _price_lines(quantities: dict[uuid.UUID, int], products: CatalogProducts) -> tuple[list[dict], Decimal]:
+    lines = []
+    total = Decimal("0.00")
+    for product_id, quantity in quantities.items():
+        product = products[product_id]
+        unit_price = product.unit_price
+        line_total = unit_price * quantity
+        # Rounded here the way the NUMERIC(12, 2) columns store them, since the created order is
+        # returned without being read back.
+        lines.append(
+            {
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "line_total": line_total.quantize(CENTS, ROUND_HALF_UP),
+                "category": product.category,
+                "family": product.family,
+            }
+        )
+        total += line_total
+    return lines, total.quantize(CENTS, ROUND_HALF_UP)
+
+
 async def create_order(db: AsyncSession, data: OrderCreate) -> Order:
-    order_number = await _generate_order_number(db)
+    quantities = _merge_line_items(data.items)
+    # Prices and active flags come from the catalog cache; stock is checked by the reservation.
+    products = await product_service.get_products(db, quantities)
+    problem = _unavailable_products(quantities, products)
+    if problem:
+        raise ValueError(problem)
+    await _reserve_stock(db, quantities)
+    lines, total = _price_lines(quantities, products)
+
+    # Allocated last so the counter row is locked only for the rest of this transaction.
+    [order_number] = await allocate_order_numbers(db)
     order = Order(
         order_number=order_number,
         customer_id=data.customer_id,
+        country_code=select(Customer.country_code).where(Customer.id == data.customer_id).scalar_subquery(),
         shipping_address=data.shipping_address,
         notes=data.notes,
         status=OrderStatus.pending,
+        items=[OrderItem(**line) for line in lines],
+        total_amount=total,
+    )
+    db.add(order)
+    await db.flush()
+    await analytics_service.record_sales(db, [order.id])
+    await customer_stats_service.record_orders(db, [order])
+    await order_change_service.record_changes(db, [order.id])
+    await db.commit()
+    product_service.evict_products(quantities)
+    return order
+
+
+async def create_orders(db: AsyncSession, orders: list[OrderCreate]) -> list[Order | str]:
+    """Create many orders in one transaction, returning each created order or why it was rejected.
+
+    Products and customers are read with one query each, order numbers are allocated in one
+    step, and orders, items and stock are each written with a single multi-row statement.
+    """
+    quantities = [_merge_line_items(data.items) for data in orders]
+    # The product rows stay locked until commit, so the stock read here is what the final
+    # reservation sees and each order can be accepted or rejected up front.
+    result = await db.execute(
+        select(Product).where(Product.id.in_(set().union(*quantities))).order_by(Product.id).with_for_update()
     )
+    products = {product.id: product for product in result.scalars()}
+    customer_ids = {data.customer_id for data in orders}
+    result = await db.execute(select(Customer.id, Customer.country_code).where(Customer.id.in_(customer_ids)))
+    country_codes = dict(result.tuples().all())
 
-    total = 0
-    for item_data in data.items:
-        product = await db.get(Product, item_data.product_id)
-        if not product:
-            raise ValueError(f"Product {item_data.product_id} not found")
-        line_total = product.unit_price * item_data.quantity
-        item = OrderItem(
-            product_id=item_data.product_id,
-            quantity=item_data.quantity,
-            unit_price=product.unit_price,
-            line_total=line_total,
+    available = {product_id: product.stock_quantity for product_id, product in products.items()}
+    outcomes: list[Order | str] = []
+    accepted = []
+    for index, (data, order_quantities) in enumerate(zip(orders, quantities)):
+        problems = []
+        if data.customer_id not in country_codes:
+            problems.append(f"Customer {data.customer_id} not found")
+        unavailable = _unavailable_products(order_quantities, products)
+        if unavailable:
+            problems.append(unavailable)
+        else:
+            short = [str(pid) for pid, quantity in order_quantities.items() if available[pid] < quantity]
+            if short:
+                problems.append(f"Insufficient stock for products: {', '.join(short)}")
+        if problems:
+            outcomes.append("; ".join(problems))
+            continue
+        for product_id, quantity in order_quantities.items():
+            available[product_id] -= quantity
+        outcomes.append(None)
+        accepted.append((index, data, *_price_lines(order_quantities, products)))
+
+    if not accepted:
+        await db.rollback()
+        return outcomes
+
+    reserved: dict[uuid.UUID, int] = {}
+    for _, _, lines, _ in accepted:
+        for line in lines:
+            reserved[line["product_id"]] = reserved.get(line["product_id"], 0) + line["quantity"]
+    await _reserve_stock(db, reserved)
+
+    order_numbers = await allocate_order_numbers(db, count=len(accepted))
+    order_rows = []
+    item_rows = []
+    for (_, data, lines, total), order_number in zip(accepted, order_numbers):
+        order_id = uuid.uuid4()
+        order_rows.append(
+            {
+                "id": order_id,
+                "order_number": order_number,
+                "customer_id": data.customer_id,
+                "country_code": country_codes[data.customer_id],
+                "status": OrderStatus.pending,
+                "total_amount": total,
+                "shipping_address": data.shipping_address,
+                "notes": data.notes,
+            }
         )
-        order.items.append(item)
-        total += line_total
+        item_rows.extend({"id": uuid.uuid4(), "order_id": order_id, **line} for line in lines)
 
-    order.total_amount = total
-    db.add(order)
+    created = (await db.scalars(insert(Order).returning(Order, sort_by_parameter_order=True), order_rows)).all()
+    items = []
+    if item_rows:
+        stmt = insert(OrderItem).returning(OrderItem, sort_by_parameter_order=True)
+        items = (await db.scalars(stmt, item_rows)).all()
+    await analytics_service.record_sales(db, [order.id for order in created])
+    await customer_stats_service.record_orders(db, created)
+    await order_change_service.record_changes(db, [order.id for order in created])
     await db.commit()
-    return await get_order(db, order.id)
+    product_service.evict_products(reserved)
 
+    items_by_order = defaultdict(list)
+    for item in items:
+        items_by_order[item.order_id].append(item)
+    for (index, *_), order in zip(accepted, created):
+        set_committed_value(order, "items", items_by_order[order.id])
+        outcomes[index] = order
+    return outcomes
 
-async def update_order(db: AsyncSession, order_id: uuid.UUID, data: OrderUpdate) -> Order | None:
-    order = await get_order(db, order_id)
-    if not order:
-        return None
 
-    update_data = data.model_dump(exclude_unset=True)
-    now = datetime.now(timezone.utc)
+# Statuses an order may be in for a move to each status, i.e. ORDER_STATUS_TRANSITIONS inverted.
+_PREVIOUS_STATUSES: dict[OrderStatus, frozenset[OrderStatus]] = {
+    status: frozenset(prev for prev, allowed in ORDER_STATUS_TRANSITIONS.items() if status in allowed)
+    for status in OrderStatus
+}
+
 
-    if "status" in update_data:
-        new_status = update_data["status"]
-        if new_status == OrderStatus.shipped and not order.shipped_at:
-            order.shipped_at = now
-        elif new_status == OrderStatus.delivered and not order.delivered_at:
-            order.delivered_at = now
+async def update_order(db: AsyncSession, order_id: uuid.UUID, data: OrderUpdate) -> Order | None:
+    values = data.model_dump(exclude_unset=True)
+    new_status = values.pop("status", None)
+    stmt = update(Order).where(Order.id == order_id)
+    if new_status is not None:
+        # The transition is checked by the UPDATE itself, so a concurrent change (e.g. a second
+        # cancel) matches no row and cannot release the same stock twice.
+        stmt = stmt.where(Order.status.in_(_PREVIOUS_STATUSES[new_status]))
+        values["status"] = new_status
+        if new_status == OrderStatus.shipped:
+            values["shipped_at"] = func.coalesce(Order.shipped_at, func.now())
+        elif new_status == OrderStatus.delivered:
+            values["delivered_at"] = func.coalesce(Order.delivered_at, func.now())
+    if not values:
+        return await get_order(db, order_id)
 
-    for key, value in update_data.items():
-        setattr(order, key, value)
+    order = (await db.scalars(stmt.values(**values).returning(Order))).one_or_none()
+    if order is None:
+        # Only reached when nothing was updated: find out whether the order is missing, already
+        # in the requested status, or not allowed to move there.
+        current_status = await db.scalar(select(Order.status).where(Order.id == order_id))
+        await db.rollback()
+        if current_status is None:
+            return None
+        if current_status == new_status:
+            return await update_order(db, order_id, data.model_copy(update={"status": None}))
+        if new_status not in ORDER_STATUS_TRANSITIONS[current_status]:
+            raise ValueError(f"Cannot change order status from {current_status.value} to {new_status.value}")
+        raise ValueError("Order status changed concurrently, please retry")
 
+    if new_status == OrderStatus.cancelled:
+        await _release_stock(db, [order_id])
+        await analytics_service.record_sales(db, [order_id], sign=-1)
+    if new_status is not None:
+        await customer_stats_service.record_status_changes(db, new_status, [order])
+    await order_change_service.record_changes(db, [order_id])
+    items = list(await db.scalars(select(OrderItem).where(OrderItem.order_id == order_id)))
+    set_committed_value(order, "items", items)
     await db.commit()
-    return await get_order(db, order_id)
+    if new_status == OrderStatus.cancelled:
+        product_service.evict_products(item.product_id for item in items)
+    return order
 
 
 async def cancel_order(db: AsyncSession, order_id: uuid.UUID) -> Order | None:
-    order = await get_order(db, order_id)
-    if not order:
-        return None
-    order.status = OrderStatus.cancelled
+    return await update_order(db, order_id, OrderUpdate(status=OrderStatus.cancelled))
+
+
+# Orders one filtered status change moves at most; repeating the call moves the next ones, as
+# those already moved no longer match the transition.
+BULK_STATUS_LIMIT = 10_000
+
+
+async def update_orders_status(
+    db: AsyncSession,
+    status: OrderStatus,
+    order_ids: Collection[uuid.UUID] | None = None,
+    filters: Mapping | None = None,
+) -> list[uuid.UUID]:
+    """Move the orders in ``order_ids``, or up to BULK_STATUS_LIMIT oldest orders matching
+    ``filters`` (as for ``filter_orders``), to ``status``; returns the IDs of those that moved.
+
+    One UPDATE moves every order whose current status allows it and leaves the rest alone, so
+    orders already in ``status``, missing, or not allowed to move are simply not returned.
+    Stock, sales rollups and customer stats then follow with one statement each.
+    """
+    allowed = Order.status.in_(_PREVIOUS_STATUSES[status])
+    if order_ids is not None:
+        targets = Order.id.in_(order_ids)
+    else:
+        matching = filter_orders(select(Order.id), **(filters or {})).where(allowed)
+        targets = Order.id.in_(matching.order_by(Order.ordered_at, Order.id).limit(BULK_STATUS_LIMIT))
+    values: dict = {"status": status}
+    if status == OrderStatus.shipped:
+        values["shipped_at"] = func.coalesce(Order.shipped_at, func.now())
+    elif status == OrderStatus.delivered:
+        values["delivered_at"] = func.coalesce(Order.delivered_at, func.now())
+    stmt = (
+        update(Order)
+        .where(targets, allowed)
+        .values(**values)
+        .returning(Order.id, Order.customer_id, Order.total_amount, Order.ordered_at)
+        .execution_options(synchronize_session=False)
+    )
+    changed = (await db.execute(stmt)).all()
+    if not changed:
+        await db.rollback()
+        return []
+
+    changed_ids = [row.id for row in changed]
+    restocked = []
+    if status == OrderStatus.cancelled:
+        restocked = await _release_stock(db, changed_ids)
+        await analytics_service.record_sales(db, changed_ids, sign=-1)
+    await customer_stats_service.record_status_changes(db, status, changed)
+    await order_change_service.record_changes(db, changed_ids)
     await db.commit()
-    return await get_order(db, order_id)
+    product_service.evict_products(restocked)
+    return changed_ids
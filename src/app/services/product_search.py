@@ -0,0 +1,68 @@
+"""Relevance-ranked product search.
+
+On PostgreSQL a search term matches through the indexes added in migration 005: every word as
+a prefix against the ``search_vector`` tsvector (part number, name and description), the whole
+term as a substring of the part number, and typo-tolerant trigram similarity on the name. Rows
+are ranked by an exact part-number hit first, then a part-number prefix hit, then text rank
+plus name similarity.
+
+Elsewhere (SQLite in the tests) each word must appear in one of the three columns, and the
+rank only distinguishes exact, prefix and substring hits.
+
+The rank is a number where lower sorts first, so it can lead a keyset cursor like any other
+ascending column.
+"""
+import re
+
+from sqlalchemy import Float, and_, case, cast, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.app.models.product import Product
+
+# Maintained by PostgreSQL as a generated column, so it is not mapped on the model.
+SEARCH_VECTOR = literal_column("products.search_vector", type_=TSVECTOR)
+
+# pg_trgm indexes cannot answer patterns with fewer than three characters.
+_MIN_TRIGRAM_LENGTH = 3
+
+
+def search_words(search: str) -> list[str]:
+    """The words of a search term, lower-cased; tsquery operators and punctuation are dropped."""
+    return re.findall(r"\w+", search.lower())
+
+
+def _like_escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_clauses(dialect_name: str, search: str) -> tuple[ColumnElement, ColumnElement]:
+    """The WHERE clause matching ``search`` and the rank to order matches by (ascending)."""
+    term = search.strip()
+    pattern = _like_escape(term.lower())
+    part_number = func.lower(Product.part_number)
+    exact = case((part_number == term.lower(), 4), else_=0)
+    prefix = case((part_number.like(f"{pattern}%", escape="\\"), 2), else_=0)
+    words = search_words(term)
+
+    if dialect_name == "postgresql":
+        matches = []
+        score = exact + prefix
+        if words:
+            query = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{word}:*" for word in words))
+            matches.append(SEARCH_VECTOR.op("@@")(query))
+            score = score + func.ts_rank(SEARCH_VECTOR, query)
+        if len(term) >= _MIN_TRIGRAM_LENGTH or not words:
+            matches.append(Product.part_number.ilike(f"%{_like_escape(term)}%", escape="\\"))
+        if len(term) >= _MIN_TRIGRAM_LENGTH:
+            matches.append(Product.name.op("%")(term))
+            score = score + func.similarity(Product.name, term)
+        return or_(*matches), -cast(score, Float)
+
+    columns = (Product.name, Product.part_number, Product.description)
+    matches = [
+        or_(*(column.ilike(f"%{_like_escape(word)}%", escape="\\") for column in columns))
+        for word in words or [term.lower()]
+    ]
+    contains = case((part_number.like(f"%{pattern}%", escape="\\"), 1), else_=0)
+    return and_(*matches), -cast(exact + prefix + contains, Float)
@@ -1,10 +1,19 @@
 import uuid
+from collections.abc import Collection, Iterable
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.models.product import Product
-from src.app.schemas.product import ProductCreate, ProductUpdate
+from src.app.pagination import decode_cursor, encode_cursor, keyset_after
+from src.app.projection import fetch_dicts, pick_columns, schema_columns
+from src.app.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from src.app.services.catalog_cache import bump_catalog_version, catalog_cache
+from src.app.services.product_search import search_clauses
+from src.app.services.suggest_index import suggest_index
+
+PRODUCT_COLUMNS = schema_columns(Product, ProductResponse)
+PRODUCT_KEYS = ("id", "part_number", "updated_at")
 
 
 async def list_products(
@@ -14,51 +23,114 @@ async def list_products(
     search: str | None = None,
     skip: int = 0,
     limit: int = 100,
-) -> list[Product]:
-    query = select(Product).where(Product.is_active.is_(True))
+    cursor: str | None = None,
+    fields: Collection[str] | None = None,
+) -> list[dict]:
+    await catalog_cache.sync(db)
+    key = ("list", category, family, search, skip, limit, cursor, None if fields is None else tuple(fields))
+    products = catalog_cache.get(key)
+    if products is not None:
+        return products
+
+    generation = catalog_cache.generation
+    query = select(*pick_columns(PRODUCT_COLUMNS, fields, PRODUCT_KEYS)).where(Product.is_active.is_(True))
     if category:
         query = query.where(Product.category.ilike(f"%{category}%"))
     if family:
         query = query.where(Product.family.ilike(f"%{family}%"))
-    if search:
-        query = query.where(
-            Product.name.ilike(f"%{search}%")
-            | Product.part_number.ilike(f"%{search}%")
-            | Product.description.ilike(f"%{search}%")
-        )
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    # Searches are ordered by relevance, with the part number breaking ties.
+    sort_key: tuple = (Product.part_number,)
+    cursor_types: tuple = (str,)
+    if search and search.strip():
+        match, rank = search_clauses(db.bind.dialect.name, search)
+        query = query.where(match).add_columns(rank.label("search_rank"))
+        sort_key = (rank, Product.part_number)
+        cursor_types = (float, str)
+    if cursor:
+        query = query.where(keyset_after(sort_key, decode_cursor(cursor, cursor_types)))
+    query = query.order_by(*sort_key).offset(skip).limit(limit)
+    # Shared through the cache between requests: callers must not modify the returned dicts.
+    products = await fetch_dicts(db, query)
+    catalog_cache.put(key, products, generation)
+    return products
+
+
+async def suggest_products(db: AsyncSession, prefix: str, limit: int = 10) -> list[dict]:
+    await suggest_index.sync(db)
+    return suggest_index.suggest(prefix, limit)
+
+
+def product_cursor(product: dict) -> str:
+    if "search_rank" in product:
+        return encode_cursor((product["search_rank"], product["part_number"]))
+    return encode_cursor((product["part_number"],))
+
+
+async def get_product(db: AsyncSession, product_id: uuid.UUID) -> ProductResponse | None:
+    return (await get_products(db, [product_id])).get(product_id)
+
+
+async def get_products(db: AsyncSession, product_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, ProductResponse]:
+    """Products by ID from the catalog cache, reading all misses with one query."""
+    await catalog_cache.sync(db)
+    products = {}
+    missing = set()
+    for product_id in set(product_ids):
+        product = catalog_cache.get(("product", product_id))
+        if product is None:
+            missing.add(product_id)
+        else:
+            products[product_id] = product
+    if missing:
+        generation = catalog_cache.generation
+        for row in await fetch_dicts(db, select(*PRODUCT_COLUMNS).where(Product.id.in_(missing))):
+            product = products[row["id"]] = ProductResponse.model_validate(row)
+            catalog_cache.put(("product", product.id), product, generation)
+    return products
+
+
+def evict_products(product_ids: Iterable[uuid.UUID]) -> None:
+    """Forget this process's cached copies of products whose stock changed."""
+    catalog_cache.discard(("product", product_id) for product_id in product_ids)
+    catalog_cache.discard_where(lambda key: key[0] == "list")
 
 
-async def get_product(db: AsyncSession, product_id: uuid.UUID) -> Product | None:
-    return await db.get(Product, product_id)
+async def _commit_catalog_change(db: AsyncSession, product: Product) -> None:
+    version = await bump_catalog_version(db)
+    await db.commit()
+    # Cleared after the commit: a read racing the write either sees the new rows or is
+    # discarded by the generation check when it tries to store the old ones.
+    catalog_cache.clear()
+    suggest_index.apply(product, version)
+
+
+async def _update_returning(db: AsyncSession, product_id: uuid.UUID, values: dict) -> Product | None:
+    # A single UPDATE ... RETURNING, so the caller gets the row (with its new updated_at)
+    # without a read before or a refresh after.
+    stmt = update(Product).where(Product.id == product_id).values(**values).returning(Product)
+    product = (await db.scalars(stmt)).one_or_none()
+    if product is None:
+        await db.rollback()
+        return None
+    await _commit_catalog_change(db, product)
+    return product
 
 
 async def create_product(db: AsyncSession, data: ProductCreate) -> Product:
     product = Product(**data.model_dump())
     db.add(product)
-    await db.commit()
-    await db.refresh(product)
+    await _commit_catalog_change(db, product)
     return product
 
 
-async def update_product(db: AsyncSession, product_id: uuid.UUID, data: ProductUpdate) -> Product | None:
-    product = await db.get(Product, product_id)
-    if not product:
-        return None
-    for key, value in data.model_dump(exclude_unset=True).items():
-        setattr(product, key, value)
-    await db.commit()
-    await db.refresh(product)
-    return product
+async def update_product(
+    db: AsyncSession, product_id: uuid.UUID, data: ProductUpdate
+) -> Product | ProductResponse | None:
+    values = data.model_dump(exclude_unset=True)
+    if not values:
+        return await get_product(db, product_id)
+    return await _update_returning(db, product_id, values)
 
 
 async def soft_delete_product(db: AsyncSession, product_id: uuid.UUID) -> Product | None:
-    product = await db.get(Product, product_id)
-    if not product:
-        return None
-    product.is_active = False
-    await db.commit()
-    await db.refresh(product)
-    return product
+    return await _update_returning(db, product_id, {"is_active": False})
@@ -0,0 +1,159 @@
+"""In-process prefix index for part-number and name autocomplete.
+
+Active products are kept in two sorted arrays of ``(key, product id)`` pairs: one keyed by the
+lower-cased part number, one by each word of the lower-cased name. A lookup is a bisect to the
+first key at or after the prefix followed by a walk while keys still start with it, so the cost
+depends on the number of suggestions returned, not on the size of the catalog.
+
+Product writes in this process apply their row to the index right after they commit. Writes
+from elsewhere (other workers, imports) are noticed through the ``catalog_version`` stamp,
+polled at most every ``catalog_cache_version_check_seconds``, and trigger a rebuild from the
+database. The rebuild sorts in a worker thread and swaps the finished arrays in, so lookups keep
+being served from the previous index meanwhile.
+"""
+import asyncio
+import re
+import time
+import uuid
+from bisect import bisect_left, insort
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.config import settings
+from src.app.models.catalog_version import CatalogVersion
+from src.app.models.product import Product
+
+# Entries carry the product ID as an int: tuples with equal keys then compare in C, where UUID
+# objects would fall back to UUID.__lt__ for every tie (common words appear thousands of times).
+Entry = tuple[str, int]
+
+_WORD = re.compile(r"\w+")
+
+
+def _name_words(name: str) -> set[str]:
+    return set(_WORD.findall(name.lower()))
+
+
+def _walk(entries: list[Entry], prefix: str):
+    i = bisect_left(entries, (prefix,))
+    while i < len(entries) and entries[i][0].startswith(prefix):
+        yield entries[i][1]
+        i += 1
+
+
+def _build(rows) -> tuple[dict, list[Entry], list[Entry]]:
+    products = {}
+    part_numbers = []
+    by_word: dict[str, list[int]] = {}
+    for product_id, part_number, name in rows:
+        key = product_id.int
+        products[key] = (product_id, part_number, name)
+        part_numbers.append((part_number.lower(), key))
+        for word in _name_words(name):
+            by_word.setdefault(word, []).append(key)
+    part_numbers.sort()
+    # Sorting per word compares plain ints, much faster than tuples tied on the same word; the
+    # entries for a word also share one string, so words such as "mcu" are stored once.
+    words = [(word, key) for word in sorted(by_word) for key in sorted(by_word[word])]
+    return products, part_numbers, words
+
+
+class PrefixIndex:
+    def __init__(self, version_check_seconds: float):
+        self.version_check_seconds = version_check_seconds
+        self._lock = asyncio.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._products: dict[int, tuple[uuid.UUID, str, str]] = {}
+        self._part_numbers: list[Entry] = []
+        self._words: list[Entry] = []
+        self._version: int | None = None
+        self._loaded = False
+        self._version_checked_at = float("-inf")
+        self.rebuilds = 0
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Rebuild from the database if the catalog changed other than through :meth:`apply`."""
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_seconds:
+            return
+        if self._lock.locked() and self._loaded:
+            # Another request is rebuilding; answer from the current index rather than wait.
+            return
+        async with self._lock:
+            if now - self._version_checked_at < self.version_check_seconds:
+                return
+            version = await db.scalar(select(CatalogVersion.version))
+            if not self._loaded or version != self._version:
+                query = select(Product.id, Product.part_number, Product.name).where(Product.is_active.is_(True))
+                await self.load((await db.execute(query)).all(), version)
+            self._version_checked_at = time.monotonic()
+
+    async def load(self, rows, version: int | None) -> None:
+        """Replace the index with ``(id, part_number, name)`` rows of active products, as of
+        catalog stamp ``version``."""
+        # Built in a worker thread so a large catalog does not stall the event loop; the finished
+        # arrays are swapped in here, between lookups.
+        self._products, self._part_numbers, self._words = await asyncio.to_thread(_build, rows)
+        self._version = version
+        self._loaded = True
+        self.rebuilds += 1
+
+    def apply(self, product: Product, version: int) -> None:
+        """Bring one product written by this process up to date; ``version`` is its catalog stamp."""
+        key = product.id.int
+        self._remove(key)
+        if product.is_active:
+            self._products[key] = (product.id, product.part_number, product.name)
+            insort(self._part_numbers, (product.part_number.lower(), key))
+            for word in _name_words(product.name):
+                insort(self._words, (word, key))
+        # If only our own bump moved the stamp since the last sync, the index is still current;
+        # otherwise another process wrote too, and the next sync rebuilds. A missing stamp row is 0.
+        if self._loaded and version == (self._version or 0) + 1:
+            self._version = version
+
+    def _remove(self, key: int) -> None:
+        previous = self._products.pop(key, None)
+        if previous is None:
+            return
+        _, part_number, name = previous
+        for entries, words in ((self._part_numbers, [part_number.lower()]), (self._words, _name_words(name))):
+            for word in words:
+                i = bisect_left(entries, (word, key))
+                if i < len(entries) and entries[i] == (word, key):
+                    del entries[i]
+
+    def suggest(self, prefix: str, limit: int) -> list[dict]:
+        """Up to ``limit`` products whose part number starts with ``prefix`` (in part-number order),
+        then ones with a name word starting with it."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        first_word, _, rest = prefix.partition(" ")
+        found: dict[int, None] = {}
+        for key in _walk(self._part_numbers, prefix):
+            if len(found) == limit:
+                break
+            found[key] = None
+        for key in _walk(self._words, first_word):
+            if len(found) == limit:
+                break
+            # A prefix of several words matches names containing them in that order.
+            if rest and f" {prefix}" not in f" {self._products[key][2].lower()}":
+                continue
+            found[key] = None
+        return [dict(zip(("id", "part_number", "name"), self._products[key])) for key in found]
+
+    def stats(self) -> dict:
+        return {
+            "products": len(self._products),
+            "entries": len(self._part_numbers) + len(self._words),
+            "rebuilds": self.rebuilds,
+            "catalog_version": self._version,
+        }
+
+
+suggest_index = PrefixIndex(settings.catalog_cache_version_check_seconds)
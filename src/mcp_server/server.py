@@ -1,6 +1,8 @@
 """Standalone MCP server wrapping the Microelectronics Orders REST API."""
 
+import json
 import os
+from collections import OrderedDict
 
 import httpx
 from mcp.server.fastmcp import FastMCP
@@ -12,77 +14,196 @@ mcp = FastMCP(
 )
 
 
+# Embed related entities in order reads so an agent does not need a follow-up call per line.
+ORDER_EXPAND = "items.product,customer"
+
+
 def _api_url(path: str) -> str:
     return f"{API_BASE_URL}{path}"
 
 
+# Last response per GET URL, revalidated with If-None-Match so unchanged data is not re-sent.
+_ETAG_CACHE_SIZE = 256
+_etag_cache: OrderedDict[str, httpx.Response] = OrderedDict()
+
+
+async def _get(path: str, params: dict | None = None) -> httpx.Response:
+    async with httpx.AsyncClient() as client:
+        request = client.build_request("GET", _api_url(path), params=params)
+        key = str(request.url)
+        cached = _etag_cache.get(key)
+        if cached is not None:
+            request.headers["If-None-Match"] = cached.headers["ETag"]
+        resp = await client.send(request)
+    if resp.status_code == 304 and cached is not None:
+        _etag_cache.move_to_end(key)
+        return cached
+    resp.raise_for_status()
+    if "ETag" in resp.headers:
+        _etag_cache[key] = resp
+        _etag_cache.move_to_end(key)
+        if len(_etag_cache) > _ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    return resp
+
+
+def _page(resp: httpx.Response) -> str:
+    """Wrap a list response with the cursor for its next page (null on the last page)."""
+    return json.dumps({"items": resp.json(), "next_cursor": resp.headers.get("X-Next-Cursor")})
+
+
 @mcp.tool()
-async def list_products(category: str | None = None, family: str | None = None, search: str | None = None) -> str:
-    """List semiconductor products. Filter by category, product family, or search term."""
+async def list_products(
+    category: str | None = None, family: str | None = None, search: str | None = None, cursor: str | None = None
+) -> str:
+    """List semiconductor products. Filter by category, product family, or search term.
+
+    Pass the returned next_cursor back as cursor to fetch the next page.
+    """
     params = {}
+    if cursor:
+        params["cursor"] = cursor
     if category:
         params["category"] = category
     if family:
         params["family"] = family
     if search:
         params["search"] = search
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(_api_url("/api/v1/products"), params=params)
-        resp.raise_for_status()
-        return resp.text
+    return _page(await _get("/api/v1/products", params))
+
+
+@mcp.tool()
+async def suggest_products(prefix: str, limit: int = 10) -> str:
+    """Complete a partial part number or product name (e.g. "STM32G0", "LSM6").
+
+    Returns id, part_number and name of matching active products, part-number matches first.
+    """
+    return (await _get("/api/v1/products/suggest", {"prefix": prefix, "limit": limit})).text
 
 
 @mcp.tool()
 async def get_product(product_id: str) -> str:
     """Get details of a specific product by its ID."""
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(_api_url(f"/api/v1/products/{product_id}"))
-        resp.raise_for_status()
-        return resp.text
+    return (await _get(f"/api/v1/products/{product_id}")).text
 
 
 @mcp.tool()
-async def list_customers(search: str | None = None, country: str | None = None) -> str:
-    """List customers. Filter by search term or country."""
+async def list_customers(search: str | None = None, country: str | None = None, cursor: str | None = None) -> str:
+    """List customers. Filter by search term or country (a name such as "Germany" or an ISO code such as "DE").
+
+    Pass the returned next_cursor back as cursor to fetch the next page.
+    """
     params = {}
+    if cursor:
+        params["cursor"] = cursor
     if search:
         params["search"] = search
     if country:
         params["country"] = country
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(_api_url("/api/v1/customers"), params=params)
-        resp.raise_for_status()
-        return resp.text
+    return _page(await _get("/api/v1/customers", params))
 
 
 @mcp.tool()
 async def get_customer(customer_id: str) -> str:
     """Get details of a specific customer by their ID."""
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(_api_url(f"/api/v1/customers/{customer_id}"))
-        resp.raise_for_status()
-        return resp.text
+    return (await _get(f"/api/v1/customers/{customer_id}")).text
+
+
+@mcp.tool()
+async def get_account_overview(customer_id: str, orders: int = 10) -> str:
+    """Get everything about one customer account in a single call.
+
+    Returns the customer, their order totals, their most recent orders (up to `orders`, max 50)
+    with line items, and every product those lines reference, each listed once. Prefer this over
+    chaining get_customer, list_orders, get_order and get_product. If next_orders_cursor is set,
+    pass it to list_orders with the same customer_id to page further back.
+    """
+    return (await _get(f"/api/v1/customers/{customer_id}/overview", {"orders": orders})).text
+
+
+@mcp.tool()
+async def get_customer_summary(customer_id: str) -> str:
+    """Get a customer's order totals: order count, lifetime and year-to-date value, last order time and open orders.
+
+    Use this instead of listing the customer's orders to answer "how much has X ordered".
+    """
+    return (await _get(f"/api/v1/customers/{customer_id}/summary")).text
+
+
+@mcp.tool()
+async def find_customers_by_email(email: str) -> str:
+    """Find customers by contact email address (case-insensitive exact match)."""
+    return (await _get("/api/v1/customers/by-email", {"email": email})).text
 
 
 @mcp.tool()
-async def list_orders(status: str | None = None, customer_id: str | None = None) -> str:
-    """List orders. Filter by status (pending/confirmed/processing/shipped/delivered/cancelled) or customer_id."""
+async def list_orders(
+    status: str | None = None,
+    customer_id: str | None = None,
+    ordered_from: str | None = None,
+    ordered_to: str | None = None,
+    min_total: float | None = None,
+    max_total: float | None = None,
+    order_number: str | None = None,
+    shipped_from: str | None = None,
+    shipped_to: str | None = None,
+    delivered_from: str | None = None,
+    delivered_to: str | None = None,
+    sort: str | None = None,
+    cursor: str | None = None,
+    expand: str = ORDER_EXPAND,
+) -> str:
+    """List orders. Filter by status (pending/confirmed/processing/shipped/delivered/cancelled) or customer_id.
+
+    Date ranges (ordered_, shipped_, delivered_ from/to) take ISO 8601 timestamps; "to" is exclusive.
+    min_total/max_total bound the order total, order_number matches a prefix (e.g. "ST-ORD-202503").
+    sort is ordered_at, total_amount or order_number, prefixed with "-" for descending (default "-ordered_at").
+    Each order embeds its customer and each line its product; pass expand="" to leave them out.
+    Pass the returned next_cursor back as cursor, with the same filters and sort, to fetch the next page.
+    """
     params = {}
-    if status:
-        params["status"] = status
-    if customer_id:
-        params["customer_id"] = customer_id
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(_api_url("/api/v1/orders"), params=params)
-        resp.raise_for_status()
-        return resp.text
+    if expand:
+        params["expand"] = expand
+    if cursor:
+        params["cursor"] = cursor
+    filters = {
+        "status": status,
+        "customer_id": customer_id,
+        "ordered_from": ordered_from,
+        "ordered_to": ordered_to,
+        "min_total": min_total,
+        "max_total": max_total,
+        "order_number": order_number,
+        "shipped_from": shipped_from,
+        "shipped_to": shipped_to,
+        "delivered_from": delivered_from,
+        "delivered_to": delivered_to,
+        "sort": sort,
+    }
+    params.update((name, value) for name, value in filters.items() if value is not None)
+    return _page(await _get("/api/v1/orders", params))
+
+
+@mcp.tool()
+async def get_order(order_id: str, expand: str = ORDER_EXPAND) -> str:
+    """Get details of a specific order by its ID, including line items with their products and the customer.
+
+    Pass expand="" to get only the IDs of the products and customer.
+    """
+    return (await _get(f"/api/v1/orders/{order_id}", {"expand": expand} if expand else None)).text
 
 
 @mcp.tool()
-async def get_order(order_id: str) -> str:
-    """Get details of a specific order by its ID, including line items."""
+async def batch_get(paths: list[str]) -> str:
+    """Fetch up to 50 API resources in one call, e.g. ["/api/v1/products/<id>", "/api/v1/orders/<id>"].
+
+    Each path is a product, customer, order or sales analytics GET path under /api/v1/ with an
+    optional query string (not the order export). Returns one result per path,
+    in order, with its HTTP status and body, so independent lookups need a single tool call.
+    """
+    payload = {"requests": [{"method": "GET", "path": path} for path in paths]}
     async with httpx.AsyncClient() as client:
-        resp = await client.get(_api_url(f"/api/v1/orders/{order_id}"))
+        resp = await client.post(_api_url("/api/v1/batch"), json=payload)
         resp.raise_for_status()
         return resp.text
 
@@ -115,5 +236,67 @@ async def update_order_status(order_id: str, status: str) -> str:
         return resp.text
 
 
+@mcp.tool()
+async def update_orders_status(
+    status: str,
+    order_ids: list[str] | None = None,
+    from_status: str | None = None,
+    customer_id: str | None = None,
+    ordered_to: str | None = None,
+) -> str:
+    """Move many orders to one status in a single call, e.g. ship every confirmed order of a customer.
+
+    Pass either order_ids or at least one filter (from_status, customer_id, ordered_to as ISO 8601).
+    Orders that cannot make the move are skipped; the response lists the ids that changed. A filter
+    moves at most 10000 orders per call, so repeat it until "updated" is 0.
+    """
+    payload: dict = {"status": status}
+    if order_ids:
+        payload["order_ids"] = order_ids
+    else:
+        filters = {"status": from_status, "customer_id": customer_id, "ordered_to": ordered_to}
+        payload["filter"] = {key: value for key, value in filters.items() if value}
+    async with httpx.AsyncClient() as client:
+        resp = await client.post(_api_url("/api/v1/orders/status"), json=payload)
+        resp.raise_for_status()
+        return resp.text
+
+
+@mcp.tool()
+async def order_changes(since: str | None = None, limit: int = 100) -> str:
+    """Orders created, updated or cancelled since a previous call, each in its current state.
+
+    Omit since to start from the first order. Keep the returned next_since and pass it back as
+    since: while has_more is true to fetch the rest, and later to get only what changed since.
+    Use this instead of re-listing all orders to see what is new.
+    """
+    params: dict = {"limit": limit}
+    if since:
+        params["since"] = since
+    return (await _get("/api/v1/orders/changes", params)).text
+
+
+@mcp.tool()
+async def sales_analytics(
+    group_by: str,
+    from_month: str | None = None,
+    to_month: str | None = None,
+    order_by: str = "revenue",
+    limit: int = 20,
+) -> str:
+    """Revenue and quantity of non-cancelled orders, grouped by product, family, category, customer, country or month.
+
+    from_month/to_month are YYYY-MM and inclusive (e.g. "2025-01" to "2025-03" for Q1). Groups come
+    largest first by order_by ("revenue" or "quantity"); months come in calendar order. Use this
+    instead of paging through orders to answer totals such as "top customers this month".
+    """
+    params = {"order_by": order_by, "limit": limit}
+    if from_month:
+        params["from_month"] = from_month
+    if to_month:
+        params["to_month"] = to_month
+    return (await _get(f"/api/v1/analytics/sales/{group_by}", params)).text
+
+
 if __name__ == "__main__":
     mcp.run()
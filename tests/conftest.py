@@ -1,9 +1,14 @@
+import re
+
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
-from src.app.database import Base, get_db
+from src.app.database import Base, get_db, get_session_factory
 from src.app.main import app
+from src.app.services.catalog_cache import catalog_cache
+from src.app.services.suggest_index import suggest_index
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -17,10 +22,13 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
 
 @pytest.fixture(autouse=True)
 async def setup_db():
+    catalog_cache.reset()
+    suggest_index.reset()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -33,3 +41,54 @@ async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
+
+
+@pytest.fixture
+async def db():
+    async with TestingSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def statements():
+    """SQL statements sent to the database while the test runs; clear it before the part under test."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+# Tables expected to grow large in production; small lookup tables may be scanned.
+LARGE_TABLES = {"customers", "products", "orders", "order_items"}
+
+
+@pytest.fixture
+def table_scans():
+    """Scans of large tables in the plans of statements run while the test runs.
+
+    Each SELECT, UPDATE and DELETE is also sent through EXPLAIN QUERY PLAN. SQLite assumes large
+    tables when it has no statistics, so its plans show what an index can serve: a SEARCH reads
+    a range, while ``SCAN <table>`` reads every row and ``SCAN <table> USING INDEX ...`` reads
+    every row in index order (acceptable only for an unfiltered, LIMITed page). Entries are
+    (table, plan detail, statement).
+    """
+    found = []
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            return
+        plan = conn.connection.cursor()
+        plan.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        for *_, detail in plan.fetchall():
+            match = re.match(r"SCAN (\w+)", detail)
+            if match and match[1] in LARGE_TABLES:
+                found.append((match[1], detail, statement))
+        plan.close()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", explain)
+    yield found
+    event.remove(engine.sync_engine, "before_cursor_execute", explain)
@@ -0,0 +1,130 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from src.app.services.analytics_service import rebuild_sales_rollups
+
+CUSTOMERS = [
+    {
+        "company_name": "TechFusion GmbH",
+        "contact_name": "Klaus Weber",
+        "contact_email": "k.weber@techfusion.de",
+        "country": "Germany",
+    },
+    {
+        "company_name": "Sakura Electronics Co.",
+        "contact_name": "Yuki Tanaka",
+        "contact_email": "y.tanaka@sakuraelec.jp",
+        "country": "Japan",
+    },
+]
+
+PRODUCTS = [
+    {
+        "part_number": "STM32F407VGT6",
+        "name": "STM32F407 MCU",
+        "category": "Microcontrollers",
+        "family": "STM32F4",
+        "unit_price": "8.00",
+        "stock_quantity": 15000,
+    },
+    {
+        "part_number": "LIS3DHTR",
+        "name": "LIS3DH Accelerometer",
+        "category": "Sensors",
+        "unit_price": "1.50",
+        "stock_quantity": 15000,
+    },
+]
+
+
+async def _seed_orders(client) -> list[dict]:
+    customers = [(await client.post("/api/v1/customers", json=data)).json() for data in CUSTOMERS]
+    products = [(await client.post("/api/v1/products", json=data)).json() for data in PRODUCTS]
+    mcu, accelerometer = products[0]["id"], products[1]["id"]
+    orders = [
+        {"customer_id": customers[0]["id"], "items": [{"product_id": mcu, "quantity": 10}]},
+        {
+            "customer_id": customers[1]["id"],
+            "items": [{"product_id": mcu, "quantity": 5}, {"product_id": accelerometer, "quantity": 100}],
+        },
+    ]
+    created = [(await client.post("/api/v1/orders", json=orders[0])).json()]
+    response = await client.post("/api/v1/orders:batch", json={"orders": orders[1:] + orders[:1]})
+    created.extend(result["order"] for result in response.json()["results"])
+    return created
+
+
+async def _sales(client, dimension: str, **params) -> list[dict]:
+    response = await client.get(f"/api/v1/analytics/sales/{dimension}", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_sales_rollups_follow_order_writes(client):
+    orders = await _seed_orders(client)
+
+    assert [(row["label"], row["quantity"], row["revenue"]) for row in await _sales(client, "product")] == [
+        ("STM32F407VGT6", 25, "200.00"),
+        ("LIS3DHTR", 100, "150.00"),
+    ]
+    assert [(row["key"], row["revenue"]) for row in await _sales(client, "family")] == [
+        ("STM32F4", "200.00"),
+        (None, "150.00"),
+    ]
+    assert [row["key"] for row in await _sales(client, "category", order_by="quantity")] == [
+        "Sensors",
+        "Microcontrollers",
+    ]
+    assert [(row["key"], row["label"], row["revenue"]) for row in await _sales(client, "country")] == [
+        ("JP", "Japan", "190.00"),
+        ("DE", "Germany", "160.00"),
+    ]
+    month = datetime.now(timezone.utc).strftime("%Y-%m")
+    assert await _sales(client, "month") == [{"key": month, "label": None, "quantity": 125, "revenue": "350.00"}]
+
+    # Cancelling takes the order back out; other status changes do not count.
+    await client.put(f"/api/v1/orders/{orders[0]['id']}", json={"status": "shipped"})
+    await client.delete(f"/api/v1/orders/{orders[1]['id']}")
+    customers = await _sales(client, "customer", limit=1)
+    assert [(row["label"], row["revenue"]) for row in customers] == [("TechFusion GmbH", "160.00")]
+    assert [row["revenue"] for row in await _sales(client, "month")] == ["160.00"]
+    assert await _sales(client, "country", from_month="2000-01", to_month="2000-12") == []
+
+
+@pytest.mark.asyncio
+async def test_rebuild_sales_rollups_matches_incremental_totals(client, db):
+    orders = await _seed_orders(client)
+    await client.delete(f"/api/v1/orders/{orders[0]['id']}")
+    incremental = {dimension: await _sales(client, dimension) for dimension in ("product", "customer", "month")}
+
+    await rebuild_sales_rollups(db)
+    assert {dimension: await _sales(client, dimension) for dimension in incremental} == incremental
+
+
+@pytest.mark.asyncio
+async def test_cancel_takes_out_the_keys_recorded_at_order_time(client, db):
+    orders = await _seed_orders(client)
+    mcu = orders[0]["items"][0]["product_id"]
+    await client.put(f"/api/v1/products/{mcu}", json={"family": "STM32F4X", "category": "MCUs"})
+    await client.put(f"/api/v1/customers/{orders[0]['customer_id']}", json={"country": "France"})
+
+    await client.delete(f"/api/v1/orders/{orders[0]['id']}")
+    assert [(row["key"], row["revenue"]) for row in await _sales(client, "family")] == [
+        (None, "150.00"),
+        ("STM32F4", "120.00"),
+    ]
+    assert [row["key"] for row in await _sales(client, "category")] == ["Sensors", "Microcontrollers"]
+    assert [row["key"] for row in await _sales(client, "country")] == ["JP", "DE"]
+
+    incremental = {dimension: await _sales(client, dimension) for dimension in ("family", "category", "country")}
+    await rebuild_sales_rollups(db)
+    assert {dimension: await _sales(client, dimension) for dimension in incremental} == incremental
+
+
+@pytest.mark.asyncio
+async def test_sales_rejects_unknown_dimension_and_bad_month(client):
+    assert (await client.get("/api/v1/analytics/sales/warehouse")).status_code == 422
+    response = await client.get("/api/v1/analytics/sales/month", params={"from_month": "2025-13"})
+    assert response.status_code == 422
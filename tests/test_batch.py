@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from src.app.config import settings
+from src.app.services import batch_service
+
+CUSTOMER_DATA = {
+    "company_name": "TechFusion GmbH",
+    "contact_name": "Klaus Weber",
+    "contact_email": "k.weber@techfusion.de",
+    "country": "Germany",
+}
+
+PRODUCT_DATA = {
+    "part_number": "STM32F407VGT6",
+    "name": "STM32F407 MCU",
+    "category": "Microcontrollers",
+    "unit_price": "8.52",
+    "stock_quantity": 15000,
+}
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_sub_requests_in_order(client):
+    customer_id = (await client.post("/api/v1/customers", json=CUSTOMER_DATA)).json()["id"]
+    product_id = (await client.post("/api/v1/products", json=PRODUCT_DATA)).json()["id"]
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 10}]}
+
+    response = await client.post(
+        "/api/v1/batch",
+        json={
+            "requests": [
+                {"path": f"/api/v1/products/{product_id}"},
+                {"path": f"/api/v1/customers/{customer_id}"},
+                {"path": "/api/v1/products/00000000-0000-0000-0000-000000000000"},
+                {"method": "POST", "path": "/api/v1/orders", "body": order_data},
+                {"path": f"/api/v1/orders?customer_id={customer_id}&limit=1"},
+                {"method": "POST", "path": "/api/v1/orders", "body": {"customer_id": customer_id}},
+                {"method": "POST", "path": "/api/v1/batch", "body": {"requests": []}},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 200, 404, 201, 200, 422, 400]
+    assert results[0]["body"]["part_number"] == "STM32F407VGT6"
+    assert results[0]["headers"]["etag"]
+    # The read after the write sees the order it created.
+    assert [order["id"] for order in results[4]["body"]] == [results[3]["body"]["id"]]
+    assert results[4]["headers"]["x-next-cursor"]
+
+
+@pytest.mark.asyncio
+async def test_batch_refuses_operations_outside_the_allow_list(client):
+    paths = [
+        ("POST", "/api/v1/%62atch"),
+        ("POST", "/api/v1/./batch"),
+        ("POST", "/api/v1/orders/../batch"),
+        ("GET", "/api/v1/orders/export?format=csv"),
+        ("POST", "/api/v1/products/import"),
+        ("POST", "/api/v1/customers/im%70ort"),
+        ("POST", "/api/v1/orders/status"),
+        ("DELETE", "/api/v1/products/00000000-0000-0000-0000-000000000000"),
+        ("GET", "/api/v1/../../health"),
+    ]
+    body = {"requests": [{"method": method, "path": path, "body": {"requests": []}} for method, path in paths]}
+    results = (await client.post("/api/v1/batch", json=body)).json()["results"]
+    assert [result["status"] for result in results] == [400] * len(paths)
+    assert results[0]["body"]["detail"] == "POST /api/v1/batch cannot be called in a batch"
+
+    # Unknown paths are not refused but answered by the app.
+    body = {"requests": [{"path": "/api/v1/warehouses"}, {"method": "PUT", "path": "/api/v1/products"}]}
+    results = (await client.post("/api/v1/batch", json=body)).json()["results"]
+    assert [result["status"] for result in results] == [404, 405]
+
+
+@pytest.mark.asyncio
+async def test_batch_bounds_concurrent_reads(client, monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_concurrency", 3)
+    running = peak = 0
+
+    async def send(client, sub):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"status": 200}
+
+    monkeypatch.setattr(batch_service, "_send", send)
+    response = await client.post("/api/v1/batch", json={"requests": [{"path": "/api/v1/products"}] * 10})
+    assert len(response.json()["results"]) == 10
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_bad_requests(client):
+    too_many = {"requests": [{"path": "/api/v1/products"}] * 51}
+    assert (await client.post("/api/v1/batch", json=too_many)).status_code == 422
+    outside = {"requests": [{"path": "/health"}]}
+    assert (await client.post("/api/v1/batch", json=outside)).status_code == 422
@@ -0,0 +1,27 @@
+from src.app.services.catalog_cache import CatalogCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = CatalogCache(max_entries=2, ttl_seconds=60, version_check_seconds=1)
+    cache.put("a", 1, cache.generation)
+    cache.put("b", 2, cache.generation)
+    assert cache.get("a") == 1
+    cache.put("c", 3, cache.generation)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_miss():
+    cache = CatalogCache(max_entries=10, ttl_seconds=0, version_check_seconds=1)
+    cache.put("a", 1, cache.generation)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_value_read_before_clear_is_not_stored():
+    cache = CatalogCache(max_entries=10, ttl_seconds=60, version_check_seconds=1)
+    generation = cache.generation
+    cache.clear()
+    cache.put("a", "stale", generation)
+    assert cache.get("a") is None
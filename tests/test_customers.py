@@ -1,5 +1,10 @@
+import json
+
 import pytest
 
+from src.app.services import customer_stats_service
+from src.app.services.catalog_cache import catalog_cache
+
 
 CUSTOMER_DATA = {
     "company_name": "TechFusion GmbH",
@@ -55,6 +60,38 @@ async def test_filter_customers_by_country(client):
     assert len(response.json()) == 1
 
 
+@pytest.mark.asyncio
+async def test_customer_country_codes(client):
+    customer = (await client.post("/api/v1/customers", json=CUSTOMER_DATA)).json()
+    assert customer["country_code"] == "DE"
+    await client.post("/api/v1/customers", json={**CUSTOMER_DATA, "company_name": "Sierra", "country": "USA"})
+    await client.post("/api/v1/customers", json={**CUSTOMER_DATA, "company_name": "Atlantis", "country": "Atlantis"})
+
+    for country in ["de", "Germany", "deutschland"]:
+        response = await client.get("/api/v1/customers", params={"country": country})
+        assert [c["company_name"] for c in response.json()] == ["TechFusion GmbH"]
+    response = await client.get("/api/v1/customers", params={"country": "United States"})
+    assert [c["country"] for c in response.json()] == ["USA"]
+    response = await client.get("/api/v1/customers", params={"country": "atlantis"})
+    assert [c["country_code"] for c in response.json()] == [None]
+    # The unrecognised name is compared as is, not as a LIKE pattern.
+    for pattern in ["atlant%", "atlanti_"]:
+        assert (await client.get("/api/v1/customers", params={"country": pattern})).json() == []
+
+    response = await client.put(f"/api/v1/customers/{customer['id']}", json={"country": "Austria"})
+    assert response.json()["country_code"] == "AT"
+
+
+@pytest.mark.asyncio
+async def test_get_customers_by_email(client):
+    customer = (await client.post("/api/v1/customers", json=CUSTOMER_DATA)).json()
+    await client.post("/api/v1/customers", json={**CUSTOMER_DATA, "contact_email": "other@techfusion.de"})
+    response = await client.get("/api/v1/customers/by-email", params={"email": " K.Weber@TechFusion.DE "})
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == [customer["id"]]
+    assert (await client.get("/api/v1/customers/by-email", params={"email": "nobody@x.de"})).json() == []
+
+
 @pytest.mark.asyncio
 async def test_search_customers(client):
     await client.post("/api/v1/customers", json=CUSTOMER_DATA)
@@ -67,3 +104,167 @@ async def test_search_customers(client):
 async def test_get_customer_not_found(client):
     response = await client.get("/api/v1/customers/00000000-0000-0000-0000-000000000000")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_customers_cursor_pagination(client):
+    for name in ["Cambridge Embedded", "Nordic Sensor", "Sakura Electronics", "TechFusion GmbH"]:
+        await client.post("/api/v1/customers", json={**CUSTOMER_DATA, "company_name": name})
+
+    names = []
+    params = {"limit": 3}
+    while True:
+        response = await client.get("/api/v1/customers", params=params)
+        names.extend(c["company_name"] for c in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 3, "cursor": response.headers["X-Next-Cursor"]}
+
+    assert names == ["Cambridge Embedded", "Nordic Sensor", "Sakura Electronics", "TechFusion GmbH"]
+
+
+@pytest.mark.asyncio
+async def test_import_customers_ndjson_matches_email_case_insensitively(client):
+    await client.post("/api/v1/customers", json=CUSTOMER_DATA)
+    body = "\n".join(
+        [
+            json.dumps({**CUSTOMER_DATA, "contact_email": "K.Weber@TechFusion.de", "city": "Berlin"}),
+            json.dumps(
+                {"company_name": "Nordic Sensor AB", "contact_name": "Erik", "contact_email": "e@ns.se",
+                 "country": "SE"}
+            ),
+            "not json",
+            json.dumps({"company_name": "Missing contact"}),
+        ]
+    )
+    response = await client.post(
+        "/api/v1/customers/import", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["inserted"], result["updated"], result["rejected"]) == (1, 1, 2)
+    assert [e["line"] for e in result["errors"]] == [3, 4]
+
+    customers = (await client.get("/api/v1/customers")).json()
+    assert len(customers) == 2
+    assert next(c for c in customers if c["company_name"] == "TechFusion GmbH")["city"] == "Berlin"
+    assert next(c for c in customers if c["company_name"] == "Nordic Sensor AB")["country_code"] == "SE"
+
+
+@pytest.mark.asyncio
+async def test_customer_writes_use_one_statement(client, statements):
+    response = await client.post("/api/v1/customers", json=CUSTOMER_DATA)
+    assert len(statements) == 1
+    assert response.json()["updated_at"] is not None
+    customer_id = response.json()["id"]
+
+    statements.clear()
+    response = await client.put(f"/api/v1/customers/{customer_id}", json={"city": "Berlin"})
+    assert response.json()["city"] == "Berlin"
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_customer_etags(client):
+    customer_id = (await client.post("/api/v1/customers", json=CUSTOMER_DATA)).json()["id"]
+    etag = (await client.get(f"/api/v1/customers/{customer_id}")).headers["ETag"]
+    response = await client.get(f"/api/v1/customers/{customer_id}", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+
+    page_etag = (await client.get("/api/v1/customers")).headers["ETag"]
+    assert (await client.get("/api/v1/customers", headers={"If-None-Match": page_etag})).status_code == 304
+    await client.post("/api/v1/customers", json={**CUSTOMER_DATA, "contact_email": "other@techfusion.de"})
+    assert (await client.get("/api/v1/customers", headers={"If-None-Match": page_etag})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_customers_sparse_fields(client):
+    await client.post("/api/v1/customers", json=CUSTOMER_DATA)
+    response = await client.get("/api/v1/customers", params={"fields": "company_name,country"})
+    assert response.json() == [{"company_name": "TechFusion GmbH", "country": "Germany"}]
+    assert response.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_customer_summary_follows_order_writes(client, db, statements):
+    customer_id = (await client.post("/api/v1/customers", json=CUSTOMER_DATA)).json()["id"]
+    product = {
+        "part_number": "STM32F407VGT6",
+        "name": "STM32F407 MCU",
+        "category": "Microcontrollers",
+        "unit_price": "8.00",
+        "stock_quantity": 1000,
+    }
+    product_id = (await client.post("/api/v1/products", json=product)).json()["id"]
+    summary = (await client.get(f"/api/v1/customers/{customer_id}/summary")).json()
+    assert (summary["order_count"], summary["lifetime_value"], summary["last_ordered_at"]) == (0, "0.00", None)
+
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 10}]}
+    orders = [(await client.post("/api/v1/orders", json=order_data)).json()]
+    batch = await client.post("/api/v1/orders:batch", json={"orders": [order_data, order_data]})
+    orders.extend(result["order"] for result in batch.json()["results"])
+    await client.put(f"/api/v1/orders/{orders[0]['id']}", json={"status": "shipped"})
+    await client.put(f"/api/v1/orders/{orders[0]['id']}", json={"status": "delivered"})
+    await client.delete(f"/api/v1/orders/{orders[1]['id']}")
+
+    statements.clear()
+    response = await client.get(f"/api/v1/customers/{customer_id}/summary")
+    assert len(statements) == 1
+    summary = response.json()
+    assert summary["company_name"] == "TechFusion GmbH"
+    assert summary["order_count"] == 2
+    assert summary["open_order_count"] == 1
+    assert summary["lifetime_value"] == summary["ytd_value"] == "160.00"
+    assert summary["last_ordered_at"] == orders[2]["ordered_at"]
+
+    await customer_stats_service.rebuild_customer_stats(db)
+    assert (await client.get(f"/api/v1/customers/{customer_id}/summary")).json() == summary
+
+    response = await client.get("/api/v1/customers/00000000-0000-0000-0000-000000000000/summary")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_account_overview_query_count_is_fixed(client, statements, monkeypatch):
+    monkeypatch.setattr(catalog_cache, "version_check_seconds", 3600)
+    customer_id = (await client.post("/api/v1/customers", json=CUSTOMER_DATA)).json()["id"]
+    product_ids = []
+    for n in range(3):
+        product = {
+            "part_number": f"STM32F40{n}VGT6",
+            "name": "STM32F4 MCU",
+            "category": "Microcontrollers",
+            "unit_price": "8.00",
+            "stock_quantity": 1000,
+        }
+        product_ids.append((await client.post("/api/v1/products", json=product)).json()["id"])
+
+    async def overview(**params):
+        catalog_cache.reset()
+        statements.clear()
+        response = await client.get(f"/api/v1/customers/{customer_id}/overview", params=params)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    items = [{"product_id": product_ids[0], "quantity": 1}]
+    await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items})
+    _, few = await overview()
+
+    for product_id in product_ids:
+        items = [{"product_id": product_id, "quantity": 2}, {"product_id": product_ids[0], "quantity": 1}]
+        await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items})
+    data, many = await overview(orders=3)
+    assert many == few
+    assert data["customer"]["company_name"] == "TechFusion GmbH"
+    assert data["summary"]["order_count"] == 4
+    assert len(data["orders"]) == 3
+    assert sorted(product["id"] for product in data["products"]) == sorted(product_ids)
+    assert data["next_orders_cursor"]
+
+    rest = await client.get(
+        "/api/v1/orders", params={"customer_id": customer_id, "cursor": data["next_orders_cursor"]}
+    )
+    assert len(rest.json()) == 1
+
+    response = await client.get("/api/v1/customers/00000000-0000-0000-0000-000000000000/overview")
+    assert response.status_code == 404
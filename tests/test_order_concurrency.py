@@ -0,0 +1,83 @@
+"""Stress tests for stock reservation with many sessions hitting the same product at once.
+
+These use a file-backed SQLite database so each session gets its own connection and real
+locking, unlike the shared in-memory connection used by the API tests.
+"""
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.database import Base
+from src.app.models import Customer, Order, OrderItem, Product
+from src.app.schemas.order import OrderCreate, OrderItemCreate
+from src.app.services import order_service
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stress.db'}", connect_args={"timeout": 60})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _seed(session_factory, stock: int):
+    async with session_factory() as db:
+        customer = Customer(company_name="TechFusion GmbH", contact_name="Klaus Weber", contact_email="k@tf.de")
+        product = Product(
+            part_number="STM32F407VGT6", name="STM32F407", category="Microcontrollers",
+            unit_price=Decimal("8.52"), stock_quantity=stock,
+        )
+        db.add_all([customer, product])
+        await db.commit()
+        return customer.id, product.id
+
+
+async def _try_create(session_factory, data: OrderCreate):
+    async with session_factory() as db:
+        try:
+            return await order_service.create_order(db, data)
+        except ValueError:
+            return None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_orders_never_oversell(session_factory):
+    customer_id, product_id = await _seed(session_factory, stock=1000)
+    data = OrderCreate(customer_id=customer_id, items=[OrderItemCreate(product_id=product_id, quantity=30)])
+
+    results = await asyncio.gather(*(_try_create(session_factory, data) for _ in range(50)))
+    created = [order for order in results if order is not None]
+
+    assert len(created) == 1000 // 30
+    assert len({order.order_number for order in created}) == len(created)
+    async with session_factory() as db:
+        product = await db.get(Product, product_id)
+        reserved = (await db.execute(select(func.sum(OrderItem.quantity)))).scalar_one()
+        assert product.stock_quantity == 1000 - 30 * len(created)
+        assert reserved == 30 * len(created)
+        assert (await db.execute(select(func.count()).select_from(Order))).scalar_one() == len(created)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cancels_release_stock_once(session_factory):
+    customer_id, product_id = await _seed(session_factory, stock=100)
+    data = OrderCreate(customer_id=customer_id, items=[OrderItemCreate(product_id=product_id, quantity=40)])
+    order = await _try_create(session_factory, data)
+
+    async def cancel():
+        async with session_factory() as db:
+            try:
+                return await order_service.cancel_order(db, order.id)
+            except ValueError:
+                return None
+
+    await asyncio.gather(*(cancel() for _ in range(20)))
+
+    async with session_factory() as db:
+        product = await db.get(Product, product_id)
+        assert product.stock_quantity == 100
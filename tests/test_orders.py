@@ -1,4 +1,16 @@
+import csv
+import io
+import json
+import uuid
+
 import pytest
+from sqlalchemy import update
+
+from src.app.config import settings
+from src.app.models import Order
+from src.app.services.catalog_cache import catalog_cache
+from src.app.services import order_service
+from src.app.services.order_service import allocate_order_numbers
 
 
 CUSTOMER_DATA = {
@@ -40,6 +52,17 @@ async def test_create_order(client):
     assert float(data["total_amount"]) == pytest.approx(852.0, rel=0.01)
 
 
+@pytest.mark.asyncio
+async def test_create_order_without_items(client):
+    customer_id, _ = await _create_customer_and_product(client)
+    response = await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": []})
+    assert response.status_code == 201
+    assert response.json()["total_amount"] == "0.00"
+
+    response = await client.post("/api/v1/orders:batch", json={"orders": [{"customer_id": customer_id, "items": []}]})
+    assert response.json()["created"] == 1
+
+
 @pytest.mark.asyncio
 async def test_list_orders(client):
     customer_id, product_id = await _create_customer_and_product(client)
@@ -128,3 +151,621 @@ async def test_create_order_invalid_product(client):
     }
     response = await client.post("/api/v1/orders", json=order_data)
     assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_orders_cursor_pagination(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {
+        "customer_id": customer_id,
+        "items": [{"product_id": product_id, "quantity": 10}],
+    }
+    created = set()
+    for _ in range(5):
+        resp = await client.post("/api/v1/orders", json=order_data)
+        created.add(resp.json()["id"])
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/api/v1/orders", params=params)
+        assert response.status_code == 200
+        seen.extend(o["id"] for o in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    assert len(seen) == len(created)
+    assert set(seen) == created
+
+
+@pytest.mark.asyncio
+async def test_list_orders_invalid_cursor(client):
+    response = await client.get("/api/v1/orders", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    response = await client.get("/api/v1/orders", params={"cursor": "W10", "skip": 5})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_orders_filters_and_sorts(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    orders = []
+    for quantity in (30, 10, 50, 20, 40):
+        order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": quantity}]}
+        orders.append((await client.post("/api/v1/orders", json=order_data)).json())
+    await client.put(f"/api/v1/orders/{orders[0]['id']}", json={"status": "shipped"})
+
+    async def fetch_all(params):
+        seen, page = [], {"limit": 2, **params}
+        while True:
+            response = await client.get("/api/v1/orders", params=page)
+            assert response.status_code == 200
+            seen.extend(response.json())
+            if not response.headers.get("X-Next-Cursor"):
+                return seen
+            page = {**page, "cursor": response.headers["X-Next-Cursor"]}
+
+    by_total = sorted(orders, key=lambda o: float(o["total_amount"]))
+    assert [o["id"] for o in await fetch_all({"sort": "total_amount"})] == [o["id"] for o in by_total]
+    assert [o["id"] for o in await fetch_all({"sort": "-total_amount"})] == [o["id"] for o in by_total[::-1]]
+    by_number = sorted(orders, key=lambda o: o["order_number"])
+    assert [o["id"] for o in await fetch_all({"sort": "order_number"})] == [o["id"] for o in by_number]
+
+    in_range = await fetch_all({"min_total": "170.40", "max_total": "340.80", "sort": "total_amount"})
+    assert [o["total_amount"] for o in in_range] == ["170.40", "255.60", "340.80"]
+    prefix = orders[2]["order_number"].lower()
+    assert [o["id"] for o in await fetch_all({"order_number": prefix})] == [orders[2]["id"]]
+    assert len(await fetch_all({"order_number": prefix[:-4]})) == 5
+    assert await fetch_all({"order_number": "ST-ORD-1999"}) == []
+    assert await fetch_all({"order_number": "ST-ORD'_%"}) == []
+
+    shipped = await fetch_all({"shipped_from": "2000-01-01T00:00:00Z", "ordered_to": "2999-01-01T00:00:00Z"})
+    assert [o["id"] for o in shipped] == [orders[0]["id"]]
+    assert await fetch_all({"delivered_from": "2000-01-01T00:00:00Z"}) == []
+    assert await fetch_all({"ordered_from": "2999-01-01T00:00:00Z"}) == []
+
+    # A cursor only continues the sort it was issued for.
+    response = await client.get("/api/v1/orders", params={"limit": 2, "sort": "total_amount"})
+    other = await client.get("/api/v1/orders", params={"cursor": response.headers["X-Next-Cursor"]})
+    assert other.status_code == 400
+    assert (await client.get("/api/v1/orders", params={"sort": "customer_id"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_order_numbers_are_sequential_per_month(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {
+        "customer_id": customer_id,
+        "items": [{"product_id": product_id, "quantity": 10}],
+    }
+    numbers = []
+    for _ in range(3):
+        resp = await client.post("/api/v1/orders", json=order_data)
+        numbers.append(resp.json()["order_number"])
+
+    prefix = numbers[0][:-4]
+    assert numbers == [f"{prefix}0001", f"{prefix}0002", f"{prefix}0003"]
+
+
+@pytest.mark.asyncio
+async def test_allocate_order_numbers_block(db):
+    assert await allocate_order_numbers(db, period="202501") == ["ST-ORD-202501-0001"]
+    assert await allocate_order_numbers(db, count=3, period="202501") == [
+        "ST-ORD-202501-0002",
+        "ST-ORD-202501-0003",
+        "ST-ORD-202501-0004",
+    ]
+    assert await allocate_order_numbers(db, period="202502") == ["ST-ORD-202502-0001"]
+
+
+@pytest.mark.asyncio
+async def test_create_order_merges_duplicate_products(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {
+        "customer_id": customer_id,
+        "items": [{"product_id": product_id, "quantity": 40}, {"product_id": product_id, "quantity": 60}],
+    }
+    response = await client.post("/api/v1/orders", json=order_data)
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["items"][0]["quantity"] == 100
+    assert float(data["total_amount"]) == pytest.approx(852.0, rel=0.01)
+
+
+@pytest.mark.asyncio
+async def test_create_order_reports_all_unavailable_products(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    inactive_resp = await client.post("/api/v1/products", json={**PRODUCT_DATA, "part_number": "L7805CV"})
+    inactive_id = inactive_resp.json()["id"]
+    await client.delete(f"/api/v1/products/{inactive_id}")
+    missing_ids = ["00000000-0000-0000-0000-000000000001", "00000000-0000-0000-0000-000000000002"]
+
+    order_data = {
+        "customer_id": customer_id,
+        "items": [
+            {"product_id": product_id, "quantity": 10},
+            {"product_id": missing_ids[0], "quantity": 10},
+            {"product_id": inactive_id, "quantity": 10},
+            {"product_id": missing_ids[1], "quantity": 10},
+        ],
+    }
+    response = await client.post("/api/v1/orders", json=order_data)
+    assert response.status_code == 400
+    detail = response.json()["detail"]
+    for pid in [*missing_ids, inactive_id]:
+        assert pid in detail
+    assert product_id not in detail
+
+
+async def _stock(client, product_id):
+    response = await client.get(f"/api/v1/products/{product_id}")
+    return response.json()["stock_quantity"]
+
+
+@pytest.mark.asyncio
+async def test_order_reserves_and_cancel_releases_stock(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {
+        "customer_id": customer_id,
+        "items": [{"product_id": product_id, "quantity": 100}],
+    }
+    create_resp = await client.post("/api/v1/orders", json=order_data)
+    assert await _stock(client, product_id) == 14900
+
+    order_id = create_resp.json()["id"]
+    await client.delete(f"/api/v1/orders/{order_id}")
+    assert await _stock(client, product_id) == 15000
+
+    # Cancelling again is a no-op and must not return the stock a second time.
+    response = await client.delete(f"/api/v1/orders/{order_id}")
+    assert response.status_code == 200
+    assert await _stock(client, product_id) == 15000
+
+
+@pytest.mark.asyncio
+async def test_cancelling_orders_that_reserved_no_stock_returns_none(client, db):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 100}]}
+    legacy, current = [(await client.post("/api/v1/orders", json=order_data)).json()["id"] for _ in range(2)]
+    # As migrated: placed before stock was reserved on create.
+    await db.execute(update(Order).where(Order.id == uuid.UUID(legacy)).values(stock_reserved=False))
+    await db.commit()
+    assert await _stock(client, product_id) == 14800
+
+    await client.delete(f"/api/v1/orders/{legacy}")
+    assert await _stock(client, product_id) == 14800
+    await client.post("/api/v1/orders/status", json={"status": "cancelled", "order_ids": [current]})
+    assert await _stock(client, product_id) == 14900
+
+
+@pytest.mark.asyncio
+async def test_insufficient_stock_fails_whole_order(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    scarce_resp = await client.post(
+        "/api/v1/products", json={**PRODUCT_DATA, "part_number": "LSM6DSOTR", "stock_quantity": 5}
+    )
+    scarce_id = scarce_resp.json()["id"]
+    order_data = {
+        "customer_id": customer_id,
+        "items": [{"product_id": product_id, "quantity": 10}, {"product_id": scarce_id, "quantity": 10}],
+    }
+    response = await client.post("/api/v1/orders", json=order_data)
+    assert response.status_code == 400
+    assert scarce_id in response.json()["detail"]
+    assert product_id not in response.json()["detail"]
+
+    assert await _stock(client, product_id) == 15000
+    assert await _stock(client, scarce_id) == 5
+    assert (await client.get("/api/v1/orders")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_invalid_status_transitions_rejected(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {
+        "customer_id": customer_id,
+        "items": [{"product_id": product_id, "quantity": 50}],
+    }
+    order_id = (await client.post("/api/v1/orders", json=order_data)).json()["id"]
+    await client.put(f"/api/v1/orders/{order_id}", json={"status": "shipped"})
+
+    response = await client.delete(f"/api/v1/orders/{order_id}")
+    assert response.status_code == 400
+    response = await client.put(f"/api/v1/orders/{order_id}", json={"status": "pending"})
+    assert response.status_code == 400
+
+    response = await client.put(f"/api/v1/orders/{order_id}", json={"status": "delivered"})
+    assert response.status_code == 200
+    assert response.json()["delivered_at"] is not None
+    assert await _stock(client, product_id) == 14950
+
+
+@pytest.mark.asyncio
+async def test_update_orders_status_in_bulk(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 10}]}
+    orders = [(await client.post("/api/v1/orders", json=order_data)).json()["id"] for _ in range(4)]
+    await client.delete(f"/api/v1/orders/{orders[3]}")
+
+    # The cancelled order cannot ship and the unknown one does not exist: only the others move.
+    unknown = "00000000-0000-0000-0000-000000000000"
+    response = await client.post("/api/v1/orders/status", json={"status": "shipped", "order_ids": orders + [unknown]})
+    assert response.status_code == 200
+    assert sorted(response.json()["order_ids"]) == sorted(orders[:3])
+    shipped = (await client.get(f"/api/v1/orders/{orders[0]}")).json()
+    assert shipped["status"] == "shipped" and shipped["shipped_at"] is not None
+
+    # Moving again changes nothing, and shipped_at is kept.
+    response = await client.post("/api/v1/orders/status", json={"status": "shipped", "order_ids": orders})
+    assert response.json() == {"status": "shipped", "updated": 0, "order_ids": []}
+    assert (await client.get(f"/api/v1/orders/{orders[0]}")).json()["shipped_at"] == shipped["shipped_at"]
+
+    body = {"status": "delivered", "filter": {"customer_id": customer_id, "status": "shipped"}}
+    response = await client.post("/api/v1/orders/status", json=body)
+    assert response.json()["updated"] == 3
+    summary = (await client.get(f"/api/v1/customers/{customer_id}/summary")).json()
+    assert (summary["order_count"], summary["open_order_count"]) == (3, 0)
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_in_bulk_releases_stock(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 10}]}
+    orders = [(await client.post("/api/v1/orders", json=order_data)).json() for _ in range(3)]
+    assert await _stock(client, product_id) == 15000 - 30
+
+    body = {"status": "cancelled", "filter": {"order_number": orders[0]["order_number"][:-4]}}
+    response = await client.post("/api/v1/orders/status", json=body)
+    assert response.json()["updated"] == 3
+    assert await _stock(client, product_id) == 15000
+    summary = (await client.get(f"/api/v1/customers/{customer_id}/summary")).json()
+    assert (summary["order_count"], summary["lifetime_value"]) == (0, "0.00")
+    assert (await client.get("/api/v1/analytics/sales/product")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_update_orders_status_requires_one_selector(client):
+    for body in [
+        {"status": "shipped"},
+        {"status": "shipped", "order_ids": [], "filter": {"status": "pending"}},
+        {"status": "shipped", "filter": {}},
+        {"status": "shipped", "order_ids": []},
+    ]:
+        assert (await client.post("/api/v1/orders/status", json=body)).status_code == 422
+
+
+async def _changes(client, since=None, limit=100) -> dict:
+    params = {"limit": limit} if since is None else {"since": since, "limit": limit}
+    response = await client.get("/api/v1/orders/changes", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_order_changes_feed(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 10}]}
+    first = (await client.post("/api/v1/orders", json=order_data)).json()["id"]
+    batch = await client.post("/api/v1/orders:batch", json={"orders": [order_data, order_data]})
+    second, third = [result["order"]["id"] for result in batch.json()["results"]]
+
+    page = await _changes(client)
+    assert [order["id"] for order in page["orders"]] == [first, second, third]
+    assert page["orders"][0]["items"][0]["quantity"] == 10
+    assert not page["has_more"]
+
+    # Nothing new: same position. Each order comes once, where it last changed.
+    since = page["next_since"]
+    assert await _changes(client, since) == {"orders": [], "next_since": since, "has_more": False}
+    await client.put(f"/api/v1/orders/{first}", json={"notes": "expedite"})
+    await client.delete(f"/api/v1/orders/{second}")
+    await client.put(f"/api/v1/orders/{first}", json={"status": "confirmed"})
+    await client.post("/api/v1/orders/status", json={"status": "shipped", "order_ids": [third]})
+    page = await _changes(client, since)
+    assert [(order["id"], order["status"]) for order in page["orders"]] == [
+        (second, "cancelled"),
+        (first, "confirmed"),
+        (third, "shipped"),
+    ]
+
+    # Pages follow the log, so a small limit walks it without skipping.
+    seen, position, has_more = [], since, True
+    while has_more:
+        page = await _changes(client, position, limit=1)
+        seen.extend(order["id"] for order in page["orders"])
+        position, has_more = page["next_since"], page["has_more"]
+    assert seen == [first, second, first, third]
+    assert position == (await _changes(client, since))["next_since"]
+
+
+@pytest.mark.asyncio
+async def test_order_changes_rejects_bad_token(client):
+    response = await client.get("/api/v1/orders/changes", params={"since": "not-a-token"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_orders_batch_with_partial_failures(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    batch = {
+        "orders": [
+            {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 10000}]},
+            {"customer_id": missing_id, "items": [{"product_id": product_id, "quantity": 10}]},
+            {"customer_id": customer_id, "items": [{"product_id": missing_id, "quantity": 10}]},
+            # Only 5000 left after the first order.
+            {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 6000}]},
+            {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 5000}]},
+        ]
+    }
+    response = await client.post("/api/v1/orders:batch", json=batch)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 3
+
+    results = data["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert results[0]["order"]["items"][0]["quantity"] == 10000
+    assert float(results[0]["order"]["total_amount"]) == pytest.approx(85200.0)
+    assert "Customer" in results[1]["error"]
+    assert missing_id in results[2]["error"]
+    assert "Insufficient stock" in results[3]["error"]
+    assert results[4]["order"]["status"] == "pending"
+
+    first, last = results[0]["order"]["order_number"], results[4]["order"]["order_number"]
+    assert int(last[-4:]) == int(first[-4:]) + 1
+    assert await _stock(client, product_id) == 0
+
+    listed = (await client.get("/api/v1/orders")).json()
+    assert {o["id"] for o in listed} == {results[0]["order"]["id"], results[4]["order"]["id"]}
+
+
+@pytest.mark.asyncio
+async def test_create_orders_batch_all_rejected(client):
+    customer_id, _ = await _create_customer_and_product(client)
+    batch = {"orders": [{"customer_id": customer_id, "items": [{"product_id": customer_id, "quantity": 1}]}]}
+    response = await client.post("/api/v1/orders:batch", json=batch)
+    assert response.status_code == 200
+    assert response.json()["created"] == 0
+    assert (await client.get("/api/v1/orders")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_export_orders_ndjson(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    second = (await client.post("/api/v1/products", json={**PRODUCT_DATA, "part_number": "STM32G071RBT6"})).json()
+    items = [{"product_id": product_id, "quantity": 2}, {"product_id": second["id"], "quantity": 3}]
+    first = (await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items})).json()
+    shipped = (await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items[:1]})).json()
+    await client.put(f"/api/v1/orders/{shipped['id']}", json={"status": "shipped"})
+
+    response = await client.get("/api/v1/orders/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    orders = {o["id"]: o for o in map(json.loads, response.text.splitlines())}
+    assert orders.keys() == {first["id"], shipped["id"]}
+    assert orders[first["id"]]["status"] == "pending"
+    assert {item["product_id"] for item in orders[first["id"]]["items"]} == {product_id, second["id"]}
+    assert len(orders[shipped["id"]]["items"]) == 1
+
+    response = await client.get("/api/v1/orders/export", params={"status": "shipped"})
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [shipped["id"]]
+
+
+@pytest.mark.asyncio
+async def test_export_orders_csv(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    items = [{"product_id": product_id, "quantity": 2}]
+    order = (await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items})).json()
+
+    response = await client.get("/api/v1/orders/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["order_number"] == order["order_number"]
+    assert rows[0]["status"] == "pending"
+    assert rows[0]["product_id"] == product_id
+    assert rows[0]["quantity"] == "2"
+
+    response = await client.get("/api/v1/orders/export", params={"format": "csv", "ordered_to": "2000-01-01T00:00:00"})
+    assert response.text.splitlines()[1:] == []
+
+
+@pytest.mark.asyncio
+async def test_order_writes_statement_counts(client, statements, monkeypatch):
+    monkeypatch.setattr(catalog_cache, "version_check_seconds", 3600)
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 3}]}
+    await client.get(f"/api/v1/products/{product_id}")
+
+    # Stock reserved, number allocated, order and items inserted, sales rolled up, customer stats
+    # updated, change logged; prices come from the catalog cache.
+    statements.clear()
+    response = await client.post("/api/v1/orders", json=order_data)
+    assert response.json()["total_amount"] == "25.56"
+    assert response.json()["ordered_at"] is not None
+    assert len(statements) == 7
+    order_id = response.json()["id"]
+
+    # Order updated, change logged, items read.
+    statements.clear()
+    response = await client.put(f"/api/v1/orders/{order_id}", json={"status": "confirmed", "notes": "expedite"})
+    assert response.json()["status"] == "confirmed"
+    assert len(response.json()["items"]) == 1
+    assert len(statements) == 3
+
+    # Order updated, stock released, sales taken out of the rollups and customer stats, change
+    # logged, items read.
+    statements.clear()
+    response = await client.delete(f"/api/v1/orders/{order_id}")
+    assert response.json()["status"] == "cancelled"
+    assert len(statements) == 6
+
+    # Products and customers read, stock reserved, numbers allocated, orders and items inserted,
+    # sales rolled up, customer stats updated, changes logged.
+    statements.clear()
+    response = await client.post("/api/v1/orders:batch", json={"orders": [order_data, order_data]})
+    assert response.json()["created"] == 2
+    assert len(statements) == 9
+
+
+@pytest.mark.asyncio
+async def test_repeating_current_status_is_a_no_op(client):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 50}]}
+    order_id = (await client.post("/api/v1/orders", json=order_data)).json()["id"]
+    await client.delete(f"/api/v1/orders/{order_id}")
+
+    response = await client.put(f"/api/v1/orders/{order_id}", json={"status": "cancelled", "notes": "dup"})
+    assert response.status_code == 200
+    assert response.json()["notes"] == "dup"
+    assert await _stock(client, product_id) == 15000
+    response = await client.put(f"/api/v1/orders/{uuid.uuid4()}", json={"status": "cancelled"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_order_etags(client, statements):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 5}]}
+    order_id = (await client.post("/api/v1/orders", json=order_data)).json()["id"]
+
+    response = await client.get(f"/api/v1/orders/{order_id}")
+    etag = response.headers["ETag"]
+    statements.clear()
+    response = await client.get(f"/api/v1/orders/{order_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert len(statements) == 1
+
+    page_etag = (await client.get("/api/v1/orders")).headers["ETag"]
+    assert (await client.get("/api/v1/orders", headers={"If-None-Match": page_etag})).status_code == 304
+
+    await client.put(f"/api/v1/orders/{order_id}", json={"status": "confirmed"})
+    response = await client.get(f"/api/v1/orders/{order_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert (await client.get("/api/v1/orders", headers={"If-None-Match": page_etag})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_fast_json_matches_default_rendering(client, monkeypatch):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 5}]}
+    order_id = (await client.post("/api/v1/orders", json=order_data)).json()["id"]
+    await client.put(f"/api/v1/orders/{order_id}", json={"status": "shipped"})
+    paths = ["/api/v1/orders?limit=1", f"/api/v1/orders/{order_id}", "/api/v1/products", "/api/v1/customers"]
+
+    default = [await client.get(path) for path in paths]
+    monkeypatch.setattr(settings, "fast_json", True)
+    fast = [await client.get(path) for path in paths]
+    for expected, response in zip(default, fast):
+        assert response.status_code == 200
+        assert response.json() == expected.json()
+        assert response.headers["ETag"] == expected.headers["ETag"]
+    assert fast[0].headers["X-Next-Cursor"] == default[0].headers["X-Next-Cursor"]
+
+
+@pytest.mark.asyncio
+async def test_list_orders_projects_rows_without_orm_instances(client, db, statements):
+    customer_id, product_id = await _create_customer_and_product(client)
+    for quantity in (1, 2, 3):
+        items = [{"product_id": product_id, "quantity": quantity}]
+        await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items})
+
+    statements.clear()
+    orders = await order_service.list_orders(db)
+    assert len(statements) == 2
+    assert len(db.identity_map) == 0
+    assert sorted(order["items"][0]["quantity"] for order in orders) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_list_orders_sparse_fields(client, statements):
+    customer_id, product_id = await _create_customer_and_product(client)
+    order_data = {"customer_id": customer_id, "items": [{"product_id": product_id, "quantity": 5}]}
+    order = (await client.post("/api/v1/orders", json=order_data)).json()
+
+    statements.clear()
+    response = await client.get("/api/v1/orders", params={"fields": "order_number,status", "include": ""})
+    assert response.json() == [{"order_number": order["order_number"], "status": "pending"}]
+    assert len(statements) == 1
+    assert "order_items" not in statements[0]
+    assert "shipping_address" not in statements[0]
+
+    response = await client.get("/api/v1/orders", params={"fields": "order_number", "include": "items"})
+    [row] = response.json()
+    assert set(row) == {"order_number", "items"}
+    assert row["items"][0]["quantity"] == 5
+
+    response = await client.get("/api/v1/orders", params={"include": ""})
+    assert "items" not in response.json()[0]
+    assert response.json()[0]["total_amount"] == order["total_amount"]
+
+    response = await client.get("/api/v1/orders", params={"fields": "order_number,bogus"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_order_expanded(client, statements):
+    customer_id, product_id = await _create_customer_and_product(client)
+    products = [product_id] + [
+        (await client.post("/api/v1/products", json={**PRODUCT_DATA, "part_number": f"PN-{i}"})).json()["id"]
+        for i in range(4)
+    ]
+    items = [{"product_id": pid, "quantity": 1} for pid in products]
+    order_id = (await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items})).json()["id"]
+
+    statements.clear()
+    response = await client.get(f"/api/v1/orders/{order_id}", params={"expand": "items.product,customer"})
+    assert response.status_code == 200
+    order = response.json()
+    assert order["customer"]["company_name"] == "TechFusion GmbH"
+    assert {item["product"]["id"] for item in order["items"]} == set(products)
+    assert order["items"][0]["product"]["unit_price"] == "8.5200"
+    # Order, items, customer; the products come from the catalog cache filled by order creation.
+    assert len(statements) <= 5
+    etag = response.headers["ETag"]
+    assert etag != (await client.get(f"/api/v1/orders/{order_id}")).headers["ETag"]
+
+    headers = {"If-None-Match": etag}
+    params = {"expand": "items.product,customer"}
+    assert (await client.get(f"/api/v1/orders/{order_id}", params=params, headers=headers)).status_code == 304
+    await client.put(f"/api/v1/customers/{customer_id}", json={"city": "Berlin"})
+    response = await client.get(f"/api/v1/orders/{order_id}", params=params, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["customer"]["city"] == "Berlin"
+
+    assert (await client.get(f"/api/v1/orders/{order_id}", params={"expand": "supplier"})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_orders_expanded_query_count_is_fixed(client, statements, monkeypatch):
+    monkeypatch.setattr(catalog_cache, "version_check_seconds", 3600)
+    customer_id, product_id = await _create_customer_and_product(client)
+    for lines in (1, 3):
+        items = []
+        for i in range(lines):
+            product = {**PRODUCT_DATA, "part_number": f"PN-{lines}-{i}"}
+            product_id = (await client.post("/api/v1/products", json=product)).json()["id"]
+            items.append({"product_id": product_id, "quantity": 1})
+        await client.post("/api/v1/orders", json={"customer_id": customer_id, "items": items})
+        catalog_cache.clear()
+
+        statements.clear()
+        response = await client.get("/api/v1/orders", params={"expand": "items.product,customer"})
+        # Orders, items, products, customers.
+        assert len(statements) == 4
+    orders = response.json()
+    assert sorted(len(order["items"]) for order in orders) == [1, 3]
+    assert all(item["product"]["category"] == "Microcontrollers" for order in orders for item in order["items"])
+    assert all(order["customer"]["id"] == customer_id for order in orders)
+
+    response = await client.get("/api/v1/orders", params={"expand": "customer", "fields": "order_number"})
+    assert all(set(order) == {"order_number", "items", "customer"} for order in response.json())
@@ -1,5 +1,12 @@
+import uuid
+
 import pytest
+from sqlalchemy import update
 
+from src.app.models.product import Product
+from src.app.services import import_service, product_service
+from src.app.services.catalog_cache import bump_catalog_version, catalog_cache
+from src.app.services.suggest_index import suggest_index
 
 PRODUCT_DATA = {
     "part_number": "STM32F407VGT6",
@@ -70,6 +77,10 @@ async def test_filter_products_by_category(client):
     assert response.status_code == 200
     assert len(response.json()) == 0
 
+    # Both filters match part of the value, ignoring case.
+    for params in [{"category": "controller"}, {"family": "stm32"}, {"category": "micro", "family": "F4"}]:
+        assert len((await client.get("/api/v1/products", params=params)).json()) == 1
+
 
 @pytest.mark.asyncio
 async def test_search_products(client):
@@ -79,7 +90,218 @@ async def test_search_products(client):
     assert len(response.json()) == 1
 
 
+@pytest.mark.asyncio
+async def test_search_products_ranks_part_number_hits_first(client):
+    for part_number, name in [
+        ("XSTM32F4-EVAL", "Eval board"),
+        ("STM32F407VGT6", "STM32F407 MCU"),
+        ("ABC-1", "STM32F4 companion chip"),
+        ("STM32F4", "STM32F4 series sample"),
+        ("STM32F401RET6", "STM32F401 MCU"),
+    ]:
+        await client.post("/api/v1/products", json={**PRODUCT_DATA, "part_number": part_number, "name": name})
+
+    # Exact part number, then prefix hits, then substring hits, then name-only hits.
+    expected = ["STM32F4", "STM32F401RET6", "STM32F407VGT6", "XSTM32F4-EVAL", "ABC-1"]
+    response = await client.get("/api/v1/products", params={"search": "stm32f4"})
+    assert [p["part_number"] for p in response.json()] == expected
+
+    response = await client.get("/api/v1/products", params={"search": "stm32f4", "limit": 2})
+    pages = [p["part_number"] for p in response.json()]
+    while "X-Next-Cursor" in response.headers:
+        params = {"search": "stm32f4", "limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+        response = await client.get("/api/v1/products", params=params)
+        pages += [p["part_number"] for p in response.json()]
+    assert pages == expected
+
+    response = await client.get("/api/v1/products", params={"search": "f401 mcu"})
+    assert [p["part_number"] for p in response.json()] == ["STM32F401RET6"]
+
+
 @pytest.mark.asyncio
 async def test_get_product_not_found(client):
     response = await client.get("/api/v1/products/00000000-0000-0000-0000-000000000000")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_products_cursor_pagination(client):
+    for i in range(5):
+        await client.post("/api/v1/products", json={**PRODUCT_DATA, "part_number": f"STM32F4{i:02d}"})
+
+    response = await client.get("/api/v1/products", params={"limit": 3})
+    first_page = [p["part_number"] for p in response.json()]
+    assert first_page == ["STM32F400", "STM32F401", "STM32F402"]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get("/api/v1/products", params={"limit": 3, "cursor": cursor})
+    assert [p["part_number"] for p in response.json()] == ["STM32F403", "STM32F404"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_import_products_csv_upserts_on_part_number(client):
+    await client.post("/api/v1/products", json=PRODUCT_DATA)
+    body = (
+        "part_number,name,category,unit_price,stock_quantity,description\n"
+        "STM32F407VGT6,STM32F407 MCU rev B,Microcontrollers,8.10,12000,\n"
+        'LIS3DHTR,LIS3DH Accelerometer,MEMS Sensors,1.15,50000,"3-axis, ultra-low-power"\n'
+        "L7805CV,L7805 Regulator,Power Management,not-a-price,100,\n"
+        "L298N,L298N Driver,Motor Drivers,3.45,25000,\n"
+    )
+    response = await client.post("/api/v1/products/import", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["inserted"], result["updated"], result["rejected"]) == (2, 1, 1)
+    assert result["errors"][0]["line"] == 4
+
+    products = {p["part_number"]: p for p in (await client.get("/api/v1/products")).json()}
+    assert set(products) == {"STM32F407VGT6", "LIS3DHTR", "L298N"}
+    assert products["STM32F407VGT6"]["name"] == "STM32F407 MCU rev B"
+    assert products["STM32F407VGT6"]["description"] == "ARM Cortex-M4 MCU"
+    assert products["LIS3DHTR"]["description"] == "3-axis, ultra-low-power"
+
+
+@pytest.mark.asyncio
+async def test_import_products_requires_known_format(client):
+    response = await client.post("/api/v1/products/import", content="{}", headers={"Content-Type": "text/plain"})
+    assert response.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_import_products_in_small_chunks(db):
+    lines = ["part_number,name,category,unit_price"]
+    lines += [f"PN-{i:03d},Part {i},Analog,0.5{i % 10}" for i in range(25)]
+    lines.append("PN-003,Part 3 updated,Analog,0.99")
+
+    async def body():
+        data = "\n".join(lines).encode()
+        for i in range(0, len(data), 7):
+            yield data[i:i + 7]
+
+    result = await import_service.import_products(db, import_service.parse_records(body(), "csv"), chunk_size=4)
+    assert (result.inserted, result.updated, result.rejected) == (25, 1, 0)
+    products = await product_service.list_products(db, search="Part 3 updated")
+    assert [p["part_number"] for p in products] == ["PN-003"]
+
+
+@pytest.mark.asyncio
+async def test_product_writes_statement_counts(client, statements):
+    # Each write is one statement on products plus the catalog version bump.
+    response = await client.post("/api/v1/products", json=PRODUCT_DATA)
+    assert len(statements) == 2
+    assert response.json()["created_at"] is not None
+    product_id = response.json()["id"]
+
+    statements.clear()
+    response = await client.put(f"/api/v1/products/{product_id}", json={"unit_price": "9.10"})
+    assert response.json()["unit_price"] == "9.1000"
+    assert len(statements) == 2
+
+    statements.clear()
+    response = await client.delete(f"/api/v1/products/{product_id}")
+    assert response.json()["is_active"] is False
+    assert len(statements) == 2
+
+    statements.clear()
+    response = await client.put(f"/api/v1/products/{uuid.uuid4()}", json={"name": "x"})
+    assert response.status_code == 404
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_product_reads_are_cached_until_a_write(client, statements):
+    product_id = (await client.post("/api/v1/products", json=PRODUCT_DATA)).json()["id"]
+    await client.get(f"/api/v1/products/{product_id}")
+    statements.clear()
+    response = await client.get(f"/api/v1/products/{product_id}")
+    assert response.json()["name"] == "STM32F407 MCU"
+    assert statements == []
+
+    await client.put(f"/api/v1/products/{product_id}", json={"name": "Renamed"})
+    assert (await client.get(f"/api/v1/products/{product_id}")).json()["name"] == "Renamed"
+    stats = (await client.get("/health/cache")).json()["catalog"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_catalog_change_by_another_process_invalidates_cache(client, db, monkeypatch):
+    monkeypatch.setattr(catalog_cache, "version_check_seconds", 0)
+    await client.post("/api/v1/products", json=PRODUCT_DATA)
+    assert len((await client.get("/api/v1/products")).json()) == 1
+
+    # Another worker writes the catalog directly and bumps the shared version stamp.
+    await db.execute(update(Product).values(is_active=False))
+    await bump_catalog_version(db)
+    await db.commit()
+    assert (await client.get("/api/v1/products")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_product_etags(client):
+    product_id = (await client.post("/api/v1/products", json=PRODUCT_DATA)).json()["id"]
+    etag = (await client.get(f"/api/v1/products/{product_id}")).headers["ETag"]
+    assert (await client.get(f"/api/v1/products/{product_id}", headers={"If-None-Match": etag})).status_code == 304
+
+    page_etag = (await client.get("/api/v1/products")).headers["ETag"]
+    assert (await client.get("/api/v1/products", headers={"If-None-Match": page_etag})).status_code == 304
+    await client.put(f"/api/v1/products/{product_id}", json={"unit_price": "9.99"})
+    assert (await client.get("/api/v1/products", headers={"If-None-Match": page_etag})).status_code == 200
+    assert (await client.get(f"/api/v1/products/{product_id}", headers={"If-None-Match": etag})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_products_sparse_fields(client, statements):
+    await client.post("/api/v1/products", json=PRODUCT_DATA)
+    statements.clear()
+    response = await client.get("/api/v1/products", params={"fields": "part_number,unit_price", "limit": 1})
+    assert response.json() == [{"part_number": "STM32F407VGT6", "unit_price": "8.5200"}]
+    assert response.headers["X-Next-Cursor"]
+    assert "description" not in statements[-1]
+    assert (await client.get("/api/v1/products", params={"fields": "price"})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_suggest_products(client, statements):
+    for part_number, name in [
+        ("STM32G071RBT6", "STM32G0 MCU"),
+        ("STM32G030F6P6", "STM32G0 value line MCU"),
+        ("LSM6DSOX", "6-axis IMU with machine learning core"),
+        ("STM32F407VGT6", "STM32F4 MCU"),
+    ]:
+        await client.post("/api/v1/products", json={**PRODUCT_DATA, "part_number": part_number, "name": name})
+
+    response = await client.get("/api/v1/products/suggest", params={"prefix": "stm32g0"})
+    assert [p["part_number"] for p in response.json()] == ["STM32G030F6P6", "STM32G071RBT6"]
+    response = await client.get("/api/v1/products/suggest", params={"prefix": "machine learn"})
+    assert [p["part_number"] for p in response.json()] == ["LSM6DSOX"]
+    response = await client.get("/api/v1/products/suggest", params={"prefix": "mcu", "limit": 2})
+    assert len(response.json()) == 2
+
+    # Served from memory: at most the periodic version check reaches the database.
+    statements.clear()
+    await client.get("/api/v1/products/suggest", params={"prefix": "lsm"})
+    assert len(statements) <= 1
+
+
+@pytest.mark.asyncio
+async def test_suggest_index_follows_writes(client, db, monkeypatch):
+    product = (await client.post("/api/v1/products", json=PRODUCT_DATA)).json()
+    assert len((await client.get("/api/v1/products/suggest", params={"prefix": "STM32F4"})).json()) == 1
+
+    # Writes through the API update the index in place.
+    await client.put(f"/api/v1/products/{product['id']}", json={"name": "Renamed part"})
+    response = await client.get("/api/v1/products/suggest", params={"prefix": "renamed"})
+    assert [p["id"] for p in response.json()] == [product["id"]]
+    await client.delete(f"/api/v1/products/{product['id']}")
+    assert (await client.get("/api/v1/products/suggest", params={"prefix": "STM32F4"})).json() == []
+    assert suggest_index.rebuilds == 1
+
+    # A write by another process is picked up by a rebuild at the next version check.
+    monkeypatch.setattr(suggest_index, "version_check_seconds", 0)
+    await db.execute(update(Product).values(is_active=True))
+    await bump_catalog_version(db)
+    await db.commit()
+    assert len((await client.get("/api/v1/products/suggest", params={"prefix": "STM32F4"})).json()) == 1
+    assert suggest_index.rebuilds == 2
@@ -0,0 +1,118 @@
+"""Plan regression tests: the queries behind each endpoint must be served by an index.
+
+Each test seeds a little data, then calls endpoints under the ``table_scans`` fixture, which
+explains every statement. Filtered reads and writes must not scan a large table at all;
+unfiltered pages may only walk an index in sort order (the LIMIT stops them early).
+"""
+import pytest
+
+from src.app.services.suggest_index import suggest_index
+
+CUSTOMER_DATA = {
+    "company_name": "TechFusion GmbH",
+    "contact_name": "Klaus Weber",
+    "contact_email": "k.weber@techfusion.de",
+    "country": "Germany",
+}
+
+PRODUCT_DATA = {
+    "part_number": "STM32F407VGT6",
+    "name": "STM32F407 MCU",
+    "category": "Microcontrollers",
+    "family": "STM32F4",
+    "unit_price": "8.52",
+    "stock_quantity": 15000,
+}
+
+
+async def _seed(client) -> dict:
+    customer = (await client.post("/api/v1/customers", json=CUSTOMER_DATA)).json()
+    product = (await client.post("/api/v1/products", json=PRODUCT_DATA)).json()
+    order = (
+        await client.post(
+            "/api/v1/orders",
+            json={"customer_id": customer["id"], "items": [{"product_id": product["id"], "quantity": 10}]},
+        )
+    ).json()
+    return {"customer": customer, "product": product, "order": order}
+
+
+def _assert_no_scans(table_scans, ordered_ok: bool = False):
+    scans = [scan for scan in table_scans if not (ordered_ok and " USING " in scan[1])]
+    assert not scans, "table scans:\n" + "\n\n".join(f"{detail}: {sql}" for _, detail, sql in scans)
+    table_scans.clear()
+
+
+@pytest.mark.asyncio
+async def test_order_queries_use_indexes(client, table_scans):
+    seeded = await _seed(client)
+    customer_id, order_id = seeded["customer"]["id"], seeded["order"]["id"]
+    table_scans.clear()
+
+    first_page = await client.get("/api/v1/orders", params={"limit": 1})
+    await client.get("/api/v1/orders", params={"expand": "items.product,customer"})
+    await client.get("/api/v1/orders", params={"include": "", "fields": "id,status"})
+    await client.get("/api/v1/orders", headers={"If-None-Match": first_page.headers["ETag"]})
+    for sort in ["ordered_at", "total_amount", "-total_amount", "order_number", "-order_number"]:
+        page = await client.get("/api/v1/orders", params={"sort": sort, "limit": 1})
+        await client.get("/api/v1/orders", params={"sort": sort, "cursor": page.headers["X-Next-Cursor"]})
+    # Without statistics SQLite takes a one-sided date range as unselective and walks the sort
+    # index instead, stopping at the LIMIT, which is also what a large real table would do.
+    await client.get("/api/v1/orders", params={"shipped_from": "2020-01-01T00:00:00Z", "sort": "order_number"})
+    await client.get("/api/v1/orders", params={"delivered_to": "2030-01-01T00:00:00Z"})
+    _assert_no_scans(table_scans, ordered_ok=True)
+
+    for params in [
+        {"customer_id": customer_id},
+        {"status": "pending"},
+        {"status": "pending", "customer_id": customer_id},
+        {"cursor": first_page.headers["X-Next-Cursor"]},
+        {"ordered_from": "2020-01-01T00:00:00Z", "ordered_to": "2030-01-01T00:00:00Z"},
+        {"min_total": "10", "max_total": "100", "sort": "-ordered_at"},
+        {"order_number": "st-ord-20", "sort": "total_amount"},
+        {"shipped_from": "2020-01-01T00:00:00Z", "shipped_to": "2030-01-01T00:00:00Z", "sort": "order_number"},
+        {"delivered_from": "2020-01-01T00:00:00Z", "delivered_to": "2030-01-01T00:00:00Z"},
+        {"status": "shipped", "min_total": "10", "sort": "-total_amount"},
+        {"customer_id": customer_id, "order_number": "ST-ORD", "sort": "order_number"},
+    ]:
+        assert (await client.get("/api/v1/orders", params=params)).status_code == 200
+    await client.get(f"/api/v1/orders/{order_id}")
+    await client.get(f"/api/v1/orders/{order_id}", params={"expand": "customer"})
+    await client.get("/api/v1/orders/export", params={"customer_id": customer_id})
+    await client.get("/api/v1/orders/export", params={"ordered_from": "2020-01-01T00:00:00Z"})
+    await client.put(f"/api/v1/orders/{order_id}", json={"status": "confirmed"})
+    await client.delete(f"/api/v1/orders/{order_id}")
+    changes = (await client.get("/api/v1/orders/changes", params={"limit": 1})).json()
+    await client.get("/api/v1/orders/changes", params={"since": changes["next_since"]})
+    _assert_no_scans(table_scans)
+
+
+@pytest.mark.asyncio
+async def test_catalog_and_customer_queries_use_indexes(client, table_scans):
+    seeded = await _seed(client)
+    customer_id, product_id = seeded["customer"]["id"], seeded["product"]["id"]
+    # The suggest index reads the whole active catalog by design when it (re)builds.
+    await client.get("/api/v1/products/suggest", params={"prefix": "stm"})
+    table_scans.clear()
+
+    await client.get("/api/v1/products")
+    await client.get("/api/v1/customers")
+    # category= and family= match substrings, served by pg_trgm indexes on PostgreSQL; SQLite
+    # filters while walking the part-number order instead.
+    for params in [{"category": "microcontrollers"}, {"family": "stm32"}, {"category": "x", "family": "y"}]:
+        assert (await client.get("/api/v1/products", params=params)).status_code == 200
+    _assert_no_scans(table_scans, ordered_ok=True)
+
+    await client.get(f"/api/v1/products/{product_id}")
+    await client.put(f"/api/v1/products/{product_id}", json={"unit_price": "9.10"})
+    await client.get("/api/v1/products/suggest", params={"prefix": "stm"})
+    assert suggest_index.rebuilds == 1
+
+    await client.get("/api/v1/customers", params={"country": "DE"})
+    await client.get("/api/v1/customers", params={"country": "Atlantis"})
+    await client.get(f"/api/v1/customers/{customer_id}")
+    await client.get("/api/v1/customers/by-email", params={"email": "K.Weber@techfusion.de"})
+    await client.put(f"/api/v1/customers/{customer_id}", json={"city": "Berlin"})
+    # search= on products and customers relies on PostgreSQL tsvector / pg_trgm indexes, which
+    # SQLite lacks, so it is not covered here.
+    _assert_no_scans(table_scans)